@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+A/B 테스트 그룹별 누적 집계
+
+그룹별, (그룹, 작업 유형)별로 GroupAccumulator (세션 수, 완료 시간 Welford
+평균/분산, 성공·일관성·중복 작업 수) 를 유지한다. 세션이 바뀔 때 이전
+기여분을 빼고 새 기여분을 더하므로 갱신은 O(1) 이고, 통계 조회도 세션 수와
+무관하게 O(1) 이다. 빼기를 거듭하며 쌓이는 오차는 스냅샷이 바뀔 때 (압축)
+SessionStore 가 전체를 다시 집계하며 없어진다.
+"""
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    from .metrics_stats import GroupAccumulator
+except ImportError:
+    from metrics_stats import GroupAccumulator
+
+
+class SessionAggregates:
+    """그룹별·작업 유형별 누적 집계"""
+
+    def __init__(self, sessions: Iterable[Dict] = ()):
+        self.groups: Dict[str, GroupAccumulator] = {}
+        self.task_types: Dict[Tuple[str, str], GroupAccumulator] = {}
+        for session in sessions:
+            self.add(session)
+
+    def add(self, session: Dict, sign: int = 1):
+        """세션 기여분 반영 (sign=-1 이면 제거)"""
+        group = session.get("group", "unknown")
+        for key, table in ((group, self.groups), ((group, session.get("task_type", "unknown")), self.task_types)):
+            accumulator = table.get(key)
+            if accumulator is None:
+                accumulator = table[key] = GroupAccumulator()
+            accumulator.add(session, sign)
+
+    def remove(self, session: Dict):
+        self.add(session, sign=-1)
+
+    def accumulator(self, group: str, task_type: Optional[str] = None) -> GroupAccumulator:
+        """그룹 (task_type 을 주면 그룹·작업 유형) 의 누적값, 없으면 빈 누적값"""
+        accumulator = self.groups.get(group) if task_type is None else self.task_types.get((group, task_type))
+        return accumulator if accumulator is not None else GroupAccumulator()
+
+    def stats(self, group: str, task_type: Optional[str] = None) -> Dict:
+        """metrics_stats.format_group_stats 형식의 그룹 통계"""
+        return self.accumulator(group, task_type).stats()
+
+    def by_task_type(self) -> Dict[str, Dict[str, Dict]]:
+        """작업 유형 -> 그룹 -> 통계"""
+        result: Dict[str, Dict[str, Dict]] = {}
+        for (group, task_type) in sorted(self.task_types):
+            if self.task_types[group, task_type].total:
+                result.setdefault(task_type, {})[group] = self.stats(group, task_type)
+        return result
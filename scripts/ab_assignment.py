@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+A/B 실험 그룹 할당 엔진
+
+실험마다 가중치가 있는 N 개의 arm 을 두고, 실험은 레이어에 속한다. 같은
+레이어의 실험은 트래픽 구간을 나눠 가져 서로 배타적이고, 레이어가 다르면
+솔트가 달라 독립적으로 겹친다.
+
+해시는 crc32 (C 구현, 비암호) 에 murmur3 finalizer 를 더한 32비트 값이다.
+crc32 는 XOR 에 대해 선형이라 솔트만 다른 두 해시가 상수 XOR 만큼만 달라
+레이어끼리 상관이 생기므로 finalizer 로 섞는다. 대량 할당은 numpy 로 한 번에
+구간을 찾는다 (numpy 가 없으면 bisect).
+
+해시 방식은 실험마다 정한다 (hash_scheme). 방식을 바꾸면 기존 사용자가 다른
+arm 으로 옮겨지므로, 이 엔진 이전에 시작한 실험은 처음 방식(md5 짝홀 50:50)
+을 계속 쓰고 새 실험만 crc32 를 쓴다.
+"""
+import bisect
+import hashlib
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+HASH_SPACE = 1 << 32
+
+DEFAULT_LAYER = "default"
+
+# 할당 해시 방식
+# md5: 초기 방식, md5 앞 8자리가 짝수면 treatment, 홀수면 control (50:50 두 arm 만)
+# crc32: crc32 + murmur3 fmix32, 가중치·레이어·트래픽 구간 지원
+HASH_SCHEME_MD5 = "md5"
+HASH_SCHEME_CRC32 = "crc32"
+HASH_SCHEMES = (HASH_SCHEME_MD5, HASH_SCHEME_CRC32)
+MD5_ARMS = ("control", "treatment")
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    return np
+
+
+def _mix32(h: int) -> int:
+    """murmur3 fmix32"""
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & 0xFFFFFFFF
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & 0xFFFFFFFF
+    return h ^ (h >> 16)
+
+
+def _mix32_array(np, h):
+    h = h.astype(np.uint64)
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & 0xFFFFFFFF
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & 0xFFFFFFFF
+    return h ^ (h >> 16)
+
+
+def unit_hash(salt: str, unit: str) -> int:
+    """솔트별 단위(사용자) 해시, [0, 2**32)"""
+    return _mix32(zlib.crc32(unit.encode("utf-8"), zlib.crc32(f"{salt}:".encode("utf-8"))))
+
+
+def md5_arm(unit: str) -> str:
+    """초기 방식의 arm (md5 앞 8자리 짝홀)"""
+    return "treatment" if int(hashlib.md5(unit.encode()).hexdigest()[:8], 16) % 2 == 0 else "control"
+
+
+@dataclass
+class Experiment:
+    """실험: arm 이름 -> 가중치, traffic 은 레이어에서 차지하는 비율"""
+    name: str
+    arms: Dict[str, float]
+    layer: str = DEFAULT_LAYER
+    traffic: float = 1.0
+    salt: Optional[str] = None
+    hash_scheme: str = HASH_SCHEME_CRC32
+    # 레이어 안에서 배정된 해시 구간과 arm 경계 (AssignmentEngine.add 가 채움)
+    traffic_range: Tuple[int, int] = field(default=(0, HASH_SPACE), init=False)
+    thresholds: List[int] = field(default_factory=list, init=False)
+
+    def __post_init__(self):
+        if not self.arms:
+            raise ValueError(f"{self.name}: no arms")
+        if any(weight <= 0 for weight in self.arms.values()):
+            raise ValueError(f"{self.name}: arm weights must be positive")
+        if not 0 < self.traffic <= 1:
+            raise ValueError(f"{self.name}: traffic must be in (0, 1]")
+        if self.hash_scheme not in HASH_SCHEMES:
+            raise ValueError(f"{self.name}: unknown hash scheme: {self.hash_scheme}")
+        if self.hash_scheme == HASH_SCHEME_MD5 and (
+            sorted(self.arms) != list(MD5_ARMS) or len(set(self.arms.values())) != 1 or self.traffic != 1
+        ):
+            raise ValueError(f"{self.name}: md5 scheme supports only equal control/treatment arms on full traffic")
+        self.salt = self.salt or f"{self.layer}.{self.name}"
+        total = sum(self.arms.values())
+        cumulative = 0.0
+        for weight in self.arms.values():
+            cumulative += weight
+            self.thresholds.append(round(cumulative / total * HASH_SPACE))
+        self.thresholds[-1] = HASH_SPACE
+
+    @property
+    def arm_names(self) -> List[str]:
+        return list(self.arms)
+
+
+class AssignmentEngine:
+    """레이어별 실험 등록과 결정적 할당"""
+
+    def __init__(self, experiments: Iterable[Experiment] = ()):
+        self.experiments: Dict[str, Experiment] = {}
+        self._layer_used: Dict[str, int] = {}
+        for experiment in experiments:
+            self.add(experiment)
+
+    def add(self, experiment: Experiment) -> Experiment:
+        """실험 등록: 레이어의 남은 트래픽 구간을 이어서 배정"""
+        if experiment.name in self.experiments:
+            raise ValueError(f"duplicate experiment: {experiment.name}")
+        start = self._layer_used.get(experiment.layer, 0)
+        end = start + round(experiment.traffic * HASH_SPACE)
+        if end > HASH_SPACE:
+            raise ValueError(f"layer {experiment.layer}: traffic exceeds 100%")
+        experiment.traffic_range = (start, end)
+        self._layer_used[experiment.layer] = end
+        self.experiments[experiment.name] = experiment
+        return experiment
+
+    def assign(self, experiment_name: str, unit: str) -> Optional[str]:
+        """단위 하나의 arm (레이어에서 이 실험 구간 밖이면 None)"""
+        experiment = self.experiments[experiment_name]
+        if experiment.hash_scheme == HASH_SCHEME_MD5:
+            return md5_arm(unit)
+        start, end = experiment.traffic_range
+        if (start, end) != (0, HASH_SPACE) and not start <= unit_hash(experiment.layer, unit) < end:
+            return None
+        index = bisect.bisect_right(experiment.thresholds, unit_hash(experiment.salt, unit))
+        return experiment.arm_names[index]
+
+    def assign_many(self, experiment_name: str, units: Iterable[str]) -> List[Optional[str]]:
+        """여러 단위를 한 번에 할당 (assign 과 같은 결과)"""
+        experiment = self.experiments[experiment_name]
+        if experiment.hash_scheme == HASH_SCHEME_MD5:
+            return [md5_arm(unit) for unit in units]
+        units = [unit.encode("utf-8") for unit in units]
+        np = _numpy()
+        if np is None:
+            return [self.assign(experiment_name, unit.decode("utf-8")) for unit in units]
+
+        arm_hashes = self._hash_array(np, experiment.salt, units)
+        # 마지막 칸은 구간 밖(None)
+        names = np.array(experiment.arm_names + [None], dtype=object)
+        indices = np.searchsorted(np.array(experiment.thresholds, dtype=np.uint64), arm_hashes, side="right")
+        start, end = experiment.traffic_range
+        if (start, end) != (0, HASH_SPACE):
+            layer_hashes = self._hash_array(np, experiment.layer, units)
+            indices[(layer_hashes < start) | (layer_hashes >= end)] = len(experiment.arms)
+        return names[indices].tolist()
+
+    @staticmethod
+    def _hash_array(np, salt: str, units: List[bytes]):
+        seed = zlib.crc32(f"{salt}:".encode("utf-8"))
+        crc32 = zlib.crc32
+        hashes = np.fromiter((crc32(unit, seed) for unit in units), dtype=np.uint32, count=len(units))
+        return _mix32_array(np, hashes)
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+A/B 테스트 프레임워크 부하 벤치마크
+
+효과 크기, 그룹 불균형, 완료율을 지정해 합성 세션을 만들고 ABTestFramework 로
+시작/완료/분석을 실행한다. 저장 방식(bulk: start_many/complete_many, single:
+세션마다 호출하고 바로 기록, buffered: 세션마다 호출하고 모아서 기록)과 분석
+방식(aggregates, bootstrap, recompute, dashboard)별로 처리량, 지연 분위수,
+최대 메모리(tracemalloc)를 기록한다.
+
+    python scripts/ab_benchmark.py --sessions 1000 100000 --storage bulk single \\
+        --analysis aggregates dashboard --output benchmark.json
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Sequence
+
+try:
+    from .ab_test_framework import ABTestFramework
+    from .performance_dashboard import PerformanceDashboard
+except ImportError:
+    from ab_test_framework import ABTestFramework
+    from performance_dashboard import PerformanceDashboard
+
+STORAGE_BACKENDS = ("bulk", "single", "buffered")
+ANALYSIS_BACKENDS = ("aggregates", "bootstrap", "recompute", "dashboard")
+
+# bulk 저장 시 한 번에 기록하는 세션 수
+BATCH_SIZE = 10000
+
+TASK_TYPES = ("strategic", "tactical", "operational")
+
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class SyntheticConfig:
+    """합성 세션 분포
+
+    effect_size 는 treatment 의 평균 완료 시간 감소율, success_lift 는 성공률
+    증가분(절대값), treatment_share 는 treatment 에 배정할 비율이다.
+    """
+    sessions: int = 1000
+    effect_size: float = 0.1
+    success_lift: float = 0.05
+    treatment_share: float = 0.5
+    completion_rate: float = 0.9
+    base_completion_minutes: float = 30.0
+    base_success_rate: float = 0.7
+    seed: int = 0
+
+
+def generate_starts(config: SyntheticConfig) -> Iterator[Dict]:
+    """시작 행 (start_many 입력)"""
+    rng = random.Random(config.seed)
+    for i in range(config.sessions):
+        yield {
+            "session_id": f"bench_{i:08d}",
+            "user_id": f"user{rng.randrange(max(1, config.sessions // 4)):07d}",
+            "task_description": f"synthetic task {i}",
+            "task_type": rng.choice(TASK_TYPES),
+        }
+
+
+def completion_for(session: Dict, config: SyntheticConfig, rng: random.Random):
+    """배정된 그룹에 따른 완료 행 (완료하지 않는 세션이면 None)"""
+    if rng.random() >= config.completion_rate:
+        return None
+    treatment = session["group"] == "treatment"
+    mean = config.base_completion_minutes * (1 - config.effect_size if treatment else 1)
+    success_rate = config.base_success_rate + (config.success_lift if treatment else 0)
+    return {
+        "session_id": session["session_id"],
+        "completion_time_minutes": rng.lognormvariate(0, 0.5) * mean,
+        "success_achieved": rng.random() < success_rate,
+        "consistency_maintained": rng.random() < 0.9,
+        "duplicate_work_detected": rng.random() < 0.05,
+    }
+
+
+def _batches(rows: Iterator[Dict], size: int) -> Iterator[List[Dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _percentile(sorted_values: Sequence[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+
+class PhaseTimer:
+    """단계 하나의 연산별 지연, 처리량, 최대 메모리"""
+
+    def __init__(self, name: str, trace_memory: bool = True):
+        self.name = name
+        self.trace_memory = trace_memory
+        self.latencies: List[float] = []
+        self.items = 0
+
+    def __enter__(self):
+        if self.trace_memory:
+            tracemalloc.start()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed = time.perf_counter() - self.started
+        self.peak_memory = tracemalloc.get_traced_memory()[1] if self.trace_memory else None
+        if self.trace_memory:
+            tracemalloc.stop()
+
+    def time(self, operation: Callable, items: int = 1):
+        """operation 하나를 실행하며 지연 기록 (items: 처리한 세션 수)"""
+        started = time.perf_counter()
+        result = operation()
+        self.latencies.append(time.perf_counter() - started)
+        self.items += items
+        return result
+
+    def result(self) -> Dict:
+        latencies = sorted(self.latencies)
+        result = {
+            "phase": self.name,
+            "operations": len(latencies),
+            "items": self.items,
+            "seconds": self.elapsed,
+            "items_per_second": self.items / self.elapsed if self.elapsed else 0.0,
+            "peak_memory_bytes": self.peak_memory,
+        }
+        for p in PERCENTILES:
+            result[f"p{p}_latency_ms"] = _percentile(latencies, p) * 1000
+        return result
+
+
+def run_benchmark(config: SyntheticConfig, storage: str = "bulk",
+                  analyses: Sequence[str] = ("aggregates",), trace_memory: bool = True) -> Dict:
+    """세션 시작 -> 완료 -> 분석 단계를 실행하고 단계별 측정값 반환"""
+    if storage not in STORAGE_BACKENDS:
+        raise ValueError(f"unknown storage backend: {storage}")
+    unknown = set(analyses) - set(ANALYSIS_BACKENDS)
+    if unknown:
+        raise ValueError(f"unknown analysis backend: {', '.join(sorted(unknown))}")
+
+    rng = random.Random(config.seed + 1)
+    phases = []
+    with tempfile.TemporaryDirectory() as tmp:
+        test_file = str(Path(tmp) / "ab_test_results.json")
+        framework = ABTestFramework(test_file, arms={
+            "control": 1 - config.treatment_share, "treatment": config.treatment_share,
+        }, durability="buffered" if storage == "buffered" else "sync")
+
+        started = []
+        with PhaseTimer("start", trace_memory) as timer:
+            if storage == "bulk":
+                for batch in _batches(generate_starts(config), BATCH_SIZE):
+                    started.extend(timer.time(lambda: framework.start_many(batch)["sessions"], len(batch)))
+            else:
+                for row in generate_starts(config):
+                    result = timer.time(lambda: framework.start_test_session(
+                        row["user_id"], row["task_description"], row["task_type"]
+                    ))
+                    started.append(result)
+        phases.append(timer.result())
+
+        completions = (completion_for(session, config, rng) for session in started)
+        completions = (row for row in completions if row is not None)
+        with PhaseTimer("complete", trace_memory) as timer:
+            if storage == "bulk":
+                for batch in _batches(completions, BATCH_SIZE):
+                    timer.time(lambda: framework.complete_many(batch), len(batch))
+            else:
+                for row in completions:
+                    timer.time(lambda: framework.complete_test_session(
+                        row.pop("session_id"), row.pop("completion_time_minutes"), row.pop("success_achieved"),
+                        **row
+                    ))
+        phases.append(timer.result())
+
+        for analysis in analyses:
+            with PhaseTimer(f"analyze:{analysis}", trace_memory) as timer:
+                if analysis == "aggregates":
+                    timer.time(framework.analyze_results, config.sessions)
+                elif analysis == "bootstrap":
+                    timer.time(lambda: framework.analyze_results(bootstrap=True), config.sessions)
+                elif analysis == "recompute":
+                    timer.time(framework.verify_aggregates, config.sessions)
+                else:
+                    dashboard = PerformanceDashboard(
+                        metrics_file=str(Path(tmp) / "context_metrics.json"), ab_test_file=test_file
+                    )
+                    timer.time(lambda: dashboard._analyze_ab_test(dashboard._load_ab_test_data()), config.sessions)
+            phases.append(timer.result())
+        framework.store.close()
+
+    return {"config": asdict(config), "storage": storage, "phases": phases}
+
+
+def format_results(results: List[Dict]) -> str:
+    lines = [
+        f"{'sessions':>10} {'storage':>8} {'phase':>20} {'items/s':>12} {'p50 ms':>9} {'p95 ms':>9} "
+        f"{'p99 ms':>9} {'peak MB':>9}"
+    ]
+    for result in results:
+        for phase in result["phases"]:
+            peak = phase["peak_memory_bytes"]
+            lines.append(
+                f"{result['config']['sessions']:>10} {result['storage']:>8} {phase['phase']:>20} "
+                f"{phase['items_per_second']:>12.0f} {phase['p50_latency_ms']:>9.2f} "
+                f"{phase['p95_latency_ms']:>9.2f} {phase['p99_latency_ms']:>9.2f} "
+                f"{(peak / 1024 / 1024 if peak is not None else float('nan')):>9.1f}"
+            )
+    return "\n".join(lines)
+
+
+def main():
+    """CLI 인터페이스"""
+    parser = argparse.ArgumentParser(description="A/B test framework load benchmark")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--storage", nargs="+", choices=STORAGE_BACKENDS, default=["bulk"])
+    parser.add_argument("--analysis", nargs="+", choices=ANALYSIS_BACKENDS, default=["aggregates", "dashboard"])
+    parser.add_argument("--effect-size", type=float, default=SyntheticConfig.effect_size)
+    parser.add_argument("--success-lift", type=float, default=SyntheticConfig.success_lift)
+    parser.add_argument("--treatment-share", type=float, default=SyntheticConfig.treatment_share)
+    parser.add_argument("--completion-rate", type=float, default=SyntheticConfig.completion_rate)
+    parser.add_argument("--seed", type=int, default=SyntheticConfig.seed)
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc (it slows allocation-heavy phases)")
+    parser.add_argument("--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for sessions in args.sessions:
+        config = SyntheticConfig(
+            sessions=sessions, effect_size=args.effect_size, success_lift=args.success_lift,
+            treatment_share=args.treatment_share, completion_rate=args.completion_rate, seed=args.seed,
+        )
+        for storage in args.storage:
+            results.append(run_benchmark(config, storage, args.analysis, trace_memory=not args.no_memory))
+            print(format_results(results[-1:]), flush=True)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Results written: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
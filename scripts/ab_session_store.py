@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+A/B 테스트 세션 저장소 (이벤트 로그 + 스냅샷)
+
+세션 시작/완료는 ab_test_results.events.ndjson 끝에 이벤트 한 줄로 추가하고,
+현재 상태는 마지막 스냅샷(ab_test_results.json, 기존 형식)에 이벤트를 재생해
+만든다. 이벤트 로그가 커지면 스냅샷으로 압축한다.
+
+재생은 멱등이다: start 는 없는 세션만 만들고 complete 는 필드를 덮어쓰므로,
+압축 도중 중단되어 이벤트가 한 번 더 재생되어도 결과가 같다.
+
+이벤트를 재생할 때 그룹별 누적 집계(ab_aggregates)와 순차 검정
+(sequential_test)도 함께 갱신하므로 분석은 세션 수와 무관하게 O(1) 이다.
+스냅샷에서 다시 만들 때는 완료 시각(시작 시각 + 완료 시간) 순서로 재생한다.
+
+durability="buffered" 이면 이벤트를 메모리에 모았다가 개수(flush_events)나
+시간(flush_interval) 기준으로 백그라운드 스레드가 한 번에 기록하고, 프로세스
+종료 시(atexit) 남은 이벤트를 기록한다. 기록 전 이벤트도 이 프로세스의 상태에는
+바로 반영되며, 다른 프로세스의 기록은 flush_interval 안에 반영된다. fork 한
+자식 프로세스는 atexit 가 실행되지 않으므로 끝나기 전에 close() 를 호출해야
+한다. durability="sync" (기본값) 는 append 할 때마다 바로 기록한다.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: 잠금 없이 동작
+    fcntl = None
+
+try:
+    from .ab_aggregates import SessionAggregates
+    from .sequential_test import SequentialMonitor
+except ImportError:
+    from ab_aggregates import SessionAggregates
+    from sequential_test import SequentialMonitor
+
+# 이벤트 로그가 이보다 커지면 기록 후 스냅샷으로 압축
+COMPACT_THRESHOLD_BYTES = 4 * 1024 * 1024
+
+DURABILITY_MODES = ("sync", "buffered")
+
+# buffered 모드: 이만큼 모이거나 첫 이벤트 후 이 시간(초)이 지나면 기록
+FLUSH_EVENTS = 1000
+FLUSH_INTERVAL = 1.0
+
+# 종료 시 남은 이벤트를 기록할 buffered 저장소들
+_BUFFERED_STORES = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_buffered_stores():
+    for store in list(_BUFFERED_STORES):
+        store.close()
+
+
+def start_event(session: Dict) -> Dict:
+    return {"type": "start", "session": session}
+
+
+def complete_event(session_id: str, fields: Dict) -> Dict:
+    return {"type": "complete", "session_id": session_id, "fields": fields}
+
+
+def apply_event(sessions: Dict[str, Dict], event: Dict) -> Optional[str]:
+    """이벤트 하나를 세션 dict 에 반영, 바뀐 세션 id 반환 (반영할 게 없으면 None)"""
+    if event.get("type") == "start":
+        session = event["session"]
+        if session["session_id"] in sessions:
+            return None
+        sessions[session["session_id"]] = dict(session)
+        return session["session_id"]
+    if event.get("type") == "complete":
+        session = sessions.get(event["session_id"])
+        if session is None:
+            return None
+        session.update(event["fields"])
+        return event["session_id"]
+    return None
+
+
+def _completed_at(session: Dict) -> float:
+    """완료 시각 (epoch 초), 시작 시각을 알 수 없으면 완료 시간만"""
+    try:
+        started = datetime.fromisoformat(session.get("start_time") or "").timestamp()
+    except ValueError:
+        started = 0.0
+    return started + session["completion_time_minutes"] * 60
+
+
+class SessionStore:
+    """이벤트 로그와 스냅샷으로 세션 상태를 관리
+
+    읽은 상태와 로그 위치를 메모리에 두고, 다음 조회 때는 그 뒤에 추가된
+    이벤트만 재생한다. 다른 프로세스가 압축해 스냅샷이 바뀌면 다시 읽는다.
+    """
+
+    def __init__(self, snapshot_file: str = "docs/CURRENT/ab_test_results.json",
+                 compact_threshold: int = COMPACT_THRESHOLD_BYTES, durability: str = "sync",
+                 flush_events: int = FLUSH_EVENTS, flush_interval: float = FLUSH_INTERVAL):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"unknown durability mode: {durability}")
+        self.snapshot_file = Path(snapshot_file)
+        self.events_file = self.snapshot_file.with_suffix(".events.ndjson")
+        self.lock_file = self.snapshot_file.with_suffix(".lock")
+        self.compact_threshold = compact_threshold
+        self._sessions: Dict[str, Dict] = {}
+        self._offset = 0
+        self._snapshot_signature = None
+        self._aggregates = SessionAggregates()
+        self._sequential = SequentialMonitor()
+        self.durability = durability
+        self.flush_events = flush_events
+        self.flush_interval = flush_interval
+        # 메모리 상태와 아직 기록하지 않은 이벤트를 지키는 잠금. 디스크 I/O 중에는
+        # 잡지 않으며 (append 가 기록을 기다리지 않도록), 잠금 순서는 항상
+        # _write_lock -> 파일 잠금 -> _mutex 이다.
+        self._mutex = threading.RLock()
+        self._flush_wanted = threading.Condition(self._mutex)
+        # 기록(flush)과 압축을 한 번에 하나씩, 꺼낸 순서대로 하기 위한 잠금
+        self._write_lock = threading.RLock()
+        self._pending: List[Dict] = []
+        # 버퍼에서 꺼내 기록 중인 이벤트 (그 사이 전체를 다시 읽어도 보이도록)
+        self._writing: List[Dict] = []
+        self._pending_since = 0.0
+        self._flusher_pid: Optional[int] = None
+        self._refreshed_at: Optional[float] = None
+        if durability == "buffered":
+            _BUFFERED_STORES.add(self)
+
+    @contextmanager
+    def _locked(self, exclusive: bool):
+        # 기록은 공유 잠금 (서로 O_APPEND 로 안전), 압축은 배타 잠금
+        self.lock_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_file, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _signature(self):
+        try:
+            stat = self.snapshot_file.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def _read_snapshot(self) -> Dict[str, Dict]:
+        try:
+            with open(self.snapshot_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return {}
+
+    def _read_events(self, offset: int):
+        """offset 이후의 완성된 이벤트 줄과 다음 offset"""
+        try:
+            with open(self.events_file, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], 0
+        complete = data[:data.rfind(b"\n") + 1]
+        events = []
+        for line in complete.splitlines():
+            if line.strip():
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return events, offset + len(complete)
+
+    def refresh(self, force: bool = False) -> List[str]:
+        """새 이벤트 반영, 바뀐 세션 id 목록 반환 (스냅샷이 바뀌었으면 전체)
+
+        buffered 모드는 다른 프로세스의 기록을 flush_interval 마다만 확인한다
+        (자기 이벤트는 이미 반영됨). force=True 면 바로 확인한다.
+        """
+        with self._mutex:
+            now = time.monotonic()
+            if (not force and self.durability == "buffered" and self._refreshed_at is not None
+                    and now - self._refreshed_at < self.flush_interval):
+                return []
+            self._refreshed_at = now
+        # 공유 잠금: 읽는 도중 다른 프로세스가 압축해 이벤트 로그를 비우면 offset 이 어긋남
+        with self._locked(exclusive=False):
+            with self._mutex:
+                return self._refresh()
+
+    def _refresh(self) -> List[str]:
+        signature = self._signature()
+        try:
+            size = self.events_file.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if signature != self._snapshot_signature or size < self._offset:
+            self._snapshot_signature = signature
+            self._sessions = self._read_snapshot()
+            self._offset = 0
+            events, self._offset = self._read_events(0)
+            # 아직 기록하지 않은 자기 이벤트도 다시 반영
+            for event in events + self._writing + self._pending:
+                apply_event(self._sessions, event)
+            self._rebuild()
+            return list(self._sessions)
+
+        events, self._offset = self._read_events(self._offset)
+        changed = [self._apply(event) for event in events]
+        return list(dict.fromkeys(session_id for session_id in changed if session_id))
+
+    def _apply(self, event: Dict) -> Optional[str]:
+        """이벤트 반영 + 바뀐 세션의 이전 기여분을 빼고 새 기여분을 집계에 더함"""
+        session_id = event.get("session_id") or event.get("session", {}).get("session_id")
+        previous = self._sessions.get(session_id)
+        previous = dict(previous) if previous is not None else None
+        changed = apply_event(self._sessions, event)
+        if changed and previous == self._sessions[changed]:
+            # 먼저 반영해 둔 자기 이벤트를 로그에서 다시 읽은 경우
+            return None
+        if changed:
+            if previous is not None:
+                self._aggregates.remove(previous)
+            self._aggregates.add(self._sessions[changed])
+            if event.get("type") == "complete":
+                self._update_sequential()
+        return changed
+
+    def _update_sequential(self):
+        self._sequential.update(self._aggregates.accumulator("control"), self._aggregates.accumulator("treatment"))
+
+    def _rebuild(self):
+        """세션 전체로 집계와 순차 검정을 다시 만듦 (완료된 세션은 완료 시각 순서로)"""
+        self._aggregates = SessionAggregates()
+        self._sequential = SequentialMonitor()
+        completed = []
+        for session in self._sessions.values():
+            if session.get("completion_time_minutes") is None:
+                self._aggregates.add(session)
+            else:
+                completed.append(session)
+        for session in sorted(completed, key=_completed_at):
+            self._aggregates.add(session)
+            self._update_sequential()
+
+    def sessions(self, force: bool = False) -> Dict[str, Dict]:
+        """현재 세션 상태 (session_id -> 세션 dict), force 는 refresh 와 같음"""
+        self.refresh(force)
+        return self._sessions
+
+    def aggregates(self) -> SessionAggregates:
+        """현재 상태의 그룹별·작업 유형별 누적 집계"""
+        self.refresh()
+        return self._aggregates
+
+    def sequential(self) -> SequentialMonitor:
+        """완료마다 갱신된 순차 검정 (mSPRT) 상태"""
+        self.refresh()
+        return self._sequential
+
+    def append(self, events: Iterable[Dict]) -> int:
+        """이벤트 추가, 추가한 개수 반환 (sync: 한 번의 write, buffered: 버퍼에 쌓음)"""
+        events = list(events)
+        if not events:
+            return 0
+        if self.durability == "sync":
+            self._write_events(events)
+            return len(events)
+        with self._mutex:
+            for event in events:
+                self._apply(event)
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending.extend(events)
+            self._ensure_flusher()
+            if len(self._pending) >= self.flush_events:
+                self._flush_wanted.notify()
+        return len(events)
+
+    def flush(self):
+        """버퍼에 남은 이벤트를 기록 (버퍼는 _mutex 안에서 꺼내고 기록은 밖에서)"""
+        with self._write_lock:
+            with self._mutex:
+                events, self._pending = self._pending, []
+                self._writing = events
+            if not events:
+                return
+            try:
+                self._write_events(events)
+            finally:
+                with self._mutex:
+                    self._writing = []
+
+    def close(self):
+        """남은 이벤트를 기록하고 백그라운드 기록을 멈춤"""
+        self.flush()
+        with self._mutex:
+            self._flusher_pid = None
+            self._flush_wanted.notify_all()
+
+    def _ensure_flusher(self):
+        # fork 한 자식에는 부모의 기록 스레드가 없으므로 pid 로 확인
+        if self._flusher_pid == os.getpid():
+            return
+        self._flusher_pid = os.getpid()
+        threading.Thread(target=self._flush_loop, name="ab-session-flush", daemon=True).start()
+
+    def _flush_loop(self):
+        # 버퍼가 비면 끝나고, 다음 append 가 새로 시작함. 기다리는 동안만 _mutex 를 잡음
+        pid = os.getpid()
+        while True:
+            with self._mutex:
+                while True:
+                    if not self._pending or self._flusher_pid != pid:
+                        if self._flusher_pid == pid:
+                            self._flusher_pid = None
+                        return
+                    remaining = self._pending_since + self.flush_interval - time.monotonic()
+                    if len(self._pending) >= self.flush_events or remaining <= 0:
+                        break
+                    self._flush_wanted.wait(remaining)
+            self.flush()
+
+    def _write_events(self, events: List[Dict]):
+        """이벤트들을 한 번의 write 로 기록"""
+        lines = [json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n" for event in events]
+        with self._locked(exclusive=False):
+            fd = os.open(self.events_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, "".join(lines).encode("utf-8"))
+                size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+        if size >= self.compact_threshold:
+            self.compact()
+
+    def compact(self):
+        """스냅샷 + 이벤트를 새 스냅샷으로 합치고 이벤트 로그를 비움
+
+        _mutex 는 상태를 다시 읽고 복사하는 동안만 잡고, 스냅샷 기록은 밖에서
+        한다 (그동안 다른 기록/조회는 파일 잠금에서 기다림).
+        """
+        with self._write_lock:
+            self.flush()
+            with self._locked(exclusive=True):
+                with self._mutex:
+                    self._snapshot_signature = None
+                    self._refresh()
+                    sessions = {session_id: dict(session) for session_id, session in self._sessions.items()}
+                self._write_snapshot(sessions)
+                with self._mutex:
+                    self._offset = 0
+                    self._snapshot_signature = self._signature()
+
+    def replace(self, sessions: Dict[str, Dict]):
+        """전체 세션을 주어진 상태로 교체 (기존 _save_all_sessions 호환, 버퍼는 버림)"""
+        with self._write_lock:
+            with self._mutex:
+                self._pending = []
+            with self._locked(exclusive=True):
+                self._write_snapshot(sessions)
+                with self._mutex:
+                    self._sessions = sessions
+                    self._rebuild()
+                    self._offset = 0
+                    self._snapshot_signature = self._signature()
+
+    def _write_snapshot(self, sessions: Dict[str, Dict]):
+        """스냅샷 파일 교체 후 이벤트 로그 비우기 (배타 파일 잠금 안에서 호출)"""
+        self.snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.snapshot_file.with_name(f".{self.snapshot_file.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(sessions, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.snapshot_file)
+        # 스냅샷 교체 후 이벤트를 비움: 그 사이에 중단되면 이벤트가 다시 재생되지만 멱등
+        with open(self.events_file, "w", encoding="utf-8"):
+            pass
@@ -2,16 +2,98 @@
 """
 컨텍스트 관리 A/B 테스트 프레임워크
 """
+import csv
 import json
+import math
 import random
-import hashlib
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Literal, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, Iterator, List, Literal, Optional, Union
+from dataclasses import dataclass
+
+try:
+    from .ab_assignment import HASH_SCHEME_CRC32, HASH_SCHEME_MD5, AssignmentEngine, Experiment
+    from .ab_session_store import SessionStore, complete_event, start_event
+    from .metrics_stats import (
+        GroupAccumulator, bootstrap_mean_difference, two_proportion_z_test, welch_t_test_from_stats,
+    )
+except ImportError:
+    from ab_assignment import HASH_SCHEME_CRC32, HASH_SCHEME_MD5, AssignmentEngine, Experiment
+    from ab_session_store import SessionStore, complete_event, start_event
+    from metrics_stats import (
+        GroupAccumulator, bootstrap_mean_difference, two_proportion_z_test, welch_t_test_from_stats,
+    )
 
 TestGroup = Literal["control", "treatment"]
 
+# 유의수준
+SIGNIFICANCE_LEVEL = 0.05
+
+# 컨텍스트 관리 실험 이름과 기본 arm 가중치
+EXPERIMENT_NAME = "context_management"
+DEFAULT_ARMS = {"control": 0.5, "treatment": 0.5}
+
+# 기본 arm 의 이 실험은 md5 할당으로 시작했으므로 그 방식을 유지 (바꾸면 진행 중인
+# 사용자가 다른 그룹으로 옮겨짐). arm 을 지정하면 새 실험으로 보고 crc32 를 씀.
+EXPERIMENT_HASH_SCHEME = HASH_SCHEME_MD5
+
+# 세션 이벤트 기록 방식 (테스트처럼 바로 디스크에 있어야 하면 "sync")
+DEFAULT_DURABILITY = "buffered"
+
+# 완료 시 기록하는 필드의 타입 (CSV 문자열 변환과 입력 검증용)
+FLOAT_FIELDS = {"completion_time_minutes"}
+INT_FIELDS = {"user_satisfaction"}
+BOOL_FIELDS = {"success_achieved", "context_management_used", "duplicate_work_detected", "consistency_maintained"}
+TRUE_VALUES = {"true", "1", "yes", "y"}
+FALSE_VALUES = {"false", "0", "no", "n"}
+
+# 가져오기 오류 중 출력할 최대 개수
+MAX_REPORTED_ERRORS = 20
+
+# 누적 집계와 전체 재계산 비교 시 허용 오차 (세션을 빼고 더하며 생기는 부동소수점 오차)
+AGGREGATE_TOLERANCE = 1e-6
+
+
+def _coerce(field: str, value):
+    """CSV/JSON 값을 필드 타입으로 변환 (빈 값은 None), 잘못된 값이면 ValueError"""
+    if value is None or value == "":
+        return None
+    if field in FLOAT_FIELDS:
+        number = float(value)
+        if not math.isfinite(number) or number < 0:
+            raise ValueError(f"{field}: not a finite non-negative number: {value!r}")
+        return number
+    if field in INT_FIELDS:
+        return int(value)
+    if field in BOOL_FIELDS:
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in TRUE_VALUES:
+            return True
+        if text in FALSE_VALUES:
+            return False
+        raise ValueError(f"{field}: not a boolean: {value!r}")
+    return value
+
+
+def read_import_rows(path: str, file_format: Optional[str] = None) -> Iterator[Union[Dict, ValueError]]:
+    """CSV 또는 NDJSON 파일을 한 행씩 읽음 (읽을 수 없는 행은 ValueError 로 전달)"""
+    file_format = file_format or ("csv" if Path(path).suffix.lower() == ".csv" else "ndjson")
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if file_format == "csv":
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield ValueError(f"invalid JSON: {e.msg}")
+                continue
+            yield row if isinstance(row, dict) else ValueError("row is not a JSON object")
+
 @dataclass
 class TestSession:
     """테스트 세션 데이터"""
@@ -28,22 +110,39 @@ class TestSession:
     duplicate_work_detected: bool = False
     consistency_maintained: bool = True
     user_satisfaction: Optional[int] = None  # 1-5 scale
+    
+    def to_dict(self) -> Dict:
+        # 필드가 모두 스칼라라 asdict 의 재귀 복사가 필요 없음 (시작 경로에서 가장 비쌌음)
+        return dict(vars(self))
 
 class ABTestFramework:
     """A/B 테스트 관리 클래스"""
     
-    def __init__(self, test_file: str = "docs/CURRENT/ab_test_results.json"):
+    def __init__(self, test_file: str = "docs/CURRENT/ab_test_results.json",
+                 arms: Optional[Dict[str, float]] = None, durability: str = DEFAULT_DURABILITY):
         self.test_file = Path(test_file)
         self.test_file.parent.mkdir(parents=True, exist_ok=True)
+        # 시작/완료는 이벤트 로그에 추가, test_file 은 압축된 스냅샷.
+        # buffered: 훅에서 부르는 start/complete 가 디스크 I/O 를 기다리지 않음 (종료 시 기록)
+        self.store = SessionStore(str(self.test_file), durability=durability)
+        # 다른 실험은 같은 엔진에 다른 레이어로 추가하면 이 실험과 독립적으로 겹침
+        self.assignment = AssignmentEngine([Experiment(
+            EXPERIMENT_NAME, arms or DEFAULT_ARMS,
+            hash_scheme=EXPERIMENT_HASH_SCHEME if arms is None else HASH_SCHEME_CRC32,
+        )])
+        # 자동 session_id 의 기준값별 다음 번호 (현재 초의 기준값만 유지)
+        self._id_second: Optional[str] = None
+        self._id_suffixes: Dict[str, int] = {}
         
     def assign_test_group(self, user_id: str, task_description: str) -> TestGroup:
-        """사용자를 테스트 그룹에 할당"""
-        # 일관된 그룹 할당을 위한 해시 기반 분배
-        hash_input = f"{user_id}_{task_description}"
-        hash_value = int(hashlib.md5(hash_input.encode()).hexdigest()[:8], 16)
-        
-        # 50-50 분배
-        return "treatment" if hash_value % 2 == 0 else "control"
+        """사용자를 테스트 그룹에 할당 (같은 사용자·작업은 항상 같은 그룹)"""
+        return self.assignment.assign(EXPERIMENT_NAME, f"{user_id}_{task_description}")
+    
+    def assign_test_groups(self, rows: Iterable[Dict]) -> List[TestGroup]:
+        """여러 (user_id, task_description) 를 한 번에 할당 (검정력 분석·재현용)"""
+        return self.assignment.assign_many(
+            EXPERIMENT_NAME, (f"{row['user_id']}_{row['task_description']}" for row in rows)
+        )
     
     def start_test_session(
         self,
@@ -52,25 +151,123 @@ class ABTestFramework:
         task_type: str
     ) -> Dict[str, str]:
         """테스트 세션 시작"""
+        session = self._new_session(user_id, task_description, task_type, self._load_sessions())
+        
+        self._save_session(session)
+        
+        return self._start_result(session)
+    
+    def _new_session(self, user_id: str, task_description: str, task_type: str, existing: Dict,
+                     start_time: Optional[str] = None, session_id: Optional[str] = None) -> TestSession:
+        """새 세션 (같은 초에 같은 사용자가 시작해도 session_id 가 겹치지 않게 번호를 붙임)"""
         group = self.assign_test_group(user_id, task_description)
-        session_id = f"{group}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{user_id[:8]}"
+        if session_id is None:
+            second = datetime.now().strftime('%Y%m%d_%H%M%S')
+            if second != self._id_second:
+                self._id_second, self._id_suffixes = second, {}
+            base = f"{group}_{second}_{user_id[:8]}"
+            # 지난번 번호부터 이어서 찾으므로 같은 초에 k 개를 만들어도 O(k)
+            # (다른 프로세스가 만든 id 만 existing 으로 건너뜀)
+            suffix = self._id_suffixes.get(base, 1)
+            session_id = base if suffix == 1 else f"{base}_{suffix}"
+            while session_id in existing:
+                suffix += 1
+                session_id = f"{base}_{suffix}"
+            self._id_suffixes[base] = suffix + 1
+        elif session_id in existing:
+            raise ValueError(f"duplicate session_id: {session_id}")
         
-        session = TestSession(
+        return TestSession(
             session_id=session_id,
             group=group,
-            start_time=datetime.now().isoformat(),
+            start_time=start_time or datetime.now().isoformat(),
             task_description=task_description,
             task_type=task_type
         )
-        
-        self._save_session(session)
-        
+    
+    def _start_result(self, session: TestSession) -> Dict[str, str]:
         return {
-            "session_id": session_id,
-            "group": group,
-            "recommendation": self._get_group_recommendation(group, task_type)
+            "session_id": session.session_id,
+            "group": session.group,
+            "recommendation": self._get_group_recommendation(session.group, session.task_type)
         }
     
+    def _session_from_row(self, row: Dict, existing: Dict) -> TestSession:
+        for key in ("user_id", "task_description", "task_type"):
+            if not row.get(key):
+                raise ValueError(f"missing {key}")
+        return self._new_session(
+            str(row["user_id"]), row["task_description"], row["task_type"], existing,
+            start_time=row.get("start_time") or None, session_id=row.get("session_id") or None,
+        )
+    
+    def _completion_from_row(self, row: Dict) -> Dict:
+        """행에서 완료 필드 추출 (세션 필드가 아닌 열은 무시)"""
+        completion = {}
+        for field in sorted(FLOAT_FIELDS | INT_FIELDS | BOOL_FIELDS):
+            value = _coerce(field, row.get(field))
+            if value is not None:
+                completion[field] = value
+        for key in ("completion_time_minutes", "success_achieved"):
+            if key not in completion:
+                raise ValueError(f"missing {key}")
+        return completion
+    
+    def start_many(self, rows: Iterable[Dict]) -> Dict:
+        """여러 세션 시작 (이벤트를 한 번에 기록), 행별 오류는 건너뛰고 보고"""
+        existing = dict.fromkeys(self._load_sessions())
+        sessions, errors, events = [], [], []
+        for index, row in enumerate(rows, 1):
+            try:
+                session = self._session_from_row(row, existing)
+            except ValueError as e:
+                errors.append({"row": index, "error": str(e)})
+                continue
+            existing[session.session_id] = None
+            events.append(start_event(session.to_dict()))
+            sessions.append(self._start_result(session))
+        self.store.append(events)
+        return {"sessions": sessions, "errors": errors}
+    
+    def complete_many(self, rows: Iterable[Dict]) -> Dict:
+        """여러 세션 완료 (이벤트를 한 번에 기록), 행별 오류는 건너뛰고 보고"""
+        completed, errors, events = 0, [], []
+        for index, row in enumerate(rows, 1):
+            try:
+                if not self._has_session(row.get("session_id")):
+                    raise ValueError(f"unknown session_id: {row.get('session_id')}")
+                events.append(complete_event(row["session_id"], self._completion_from_row(row)))
+            except ValueError as e:
+                errors.append({"row": index, "error": str(e)})
+                continue
+            completed += 1
+        self.store.append(events)
+        return {"completed": completed, "errors": errors}
+    
+    def import_sessions(self, path: str, file_format: Optional[str] = None) -> Dict:
+        """CSV/NDJSON 의 과거 세션 가져오기 (완료 열이 있으면 완료까지), 한 번에 기록"""
+        existing = dict.fromkeys(self._load_sessions())
+        started, completed, errors, events = 0, 0, [], []
+        for index, row in enumerate(read_import_rows(path, file_format), 1):
+            try:
+                if isinstance(row, ValueError):
+                    raise row
+                session = self._session_from_row(row, existing)
+                completion = None
+                if row.get("completion_time_minutes") not in (None, ""):
+                    completion = self._completion_from_row(row)
+            except ValueError as e:
+                errors.append({"row": index, "error": str(e)})
+                continue
+            existing[session.session_id] = None
+            events.append(start_event(session.to_dict()))
+            started += 1
+            if completion is not None:
+                events.append(complete_event(session.session_id, completion))
+                completed += 1
+        self.store.append(events)
+        return {"started": started, "completed": completed, "errors": errors}
+    
     def _get_group_recommendation(self, group: TestGroup, task_type: str) -> str:
         """그룹별 권장사항"""
         if group == "control":
@@ -90,39 +287,40 @@ class ABTestFramework:
         completion_time_minutes: float,
         success_achieved: bool,
         **kwargs
-    ) -> None:
-        """테스트 세션 완료"""
-        sessions = self._load_sessions()
-        
-        if session_id in sessions:
-            session_data = sessions[session_id]
-            session_data.update({
-                "completion_time_minutes": completion_time_minutes,
-                "success_achieved": success_achieved,
-                **kwargs
-            })
-            sessions[session_id] = session_data
-            self._save_all_sessions(sessions)
-    
-    def analyze_results(self) -> Dict:
-        """결과 분석"""
-        sessions = self._load_sessions()
+    ) -> Dict:
+        """테스트 세션 완료 (완료 이벤트 한 줄 추가), 순차 검정의 조기 종료 권고 반환
+
+        모르는 session_id 면 ValueError.
+        """
+        if not self._has_session(session_id):
+            raise ValueError(f"unknown session_id: {session_id}")
+        self.store.append([complete_event(session_id, {
+            "completion_time_minutes": completion_time_minutes,
+            "success_achieved": success_achieved,
+            **kwargs
+        })])
+        return self.store.sequential().recommendation()
+    
+    def analyze_results(self, bootstrap: bool = False) -> Dict:
+        """결과 분석 (누적 집계 사용, bootstrap=True 면 부트스트랩 신뢰구간도 계산)"""
+        aggregates = self.store.aggregates()
+        control = aggregates.accumulator("control")
+        treatment = aggregates.accumulator("treatment")
         
-        if not sessions:
+        if not any(accumulator.total for accumulator in aggregates.groups.values()):
             return {"error": "No test data available"}
         
-        control_sessions = [s for s in sessions.values() if s["group"] == "control"]
-        treatment_sessions = [s for s in sessions.values() if s["group"] == "treatment"]
-        
-        if not control_sessions or not treatment_sessions:
+        # 시작만 하고 완료되지 않은 세션은 비교할 완료 시간/성공 여부가 없음
+        if not control.completed or not treatment.completed:
             return {"error": "Insufficient data for comparison"}
         
-        control_stats = self._calculate_group_stats(control_sessions)
-        treatment_stats = self._calculate_group_stats(treatment_sessions)
+        control_stats = control.stats()
+        treatment_stats = treatment.stats()
         
         return {
             "control_group": control_stats,
             "treatment_group": treatment_stats,
+            "by_task_type": aggregates.by_task_type(),
             "comparison": {
                 "completion_time_improvement": self._calculate_improvement(
                     control_stats["avg_completion_time"],
@@ -138,24 +336,43 @@ class ABTestFramework:
                     treatment_stats["consistency_rate"]
                 )
             },
-            "statistical_significance": self._check_significance(control_sessions, treatment_sessions)
+            "statistical_significance": self._check_significance(control, treatment, bootstrap),
+            # 완료마다 갱신되는 mSPRT: 언제 확인해도 유효한 p-value 와 조기 종료 권고
+            "sequential": self.store.sequential().result(),
         }
     
-    def _calculate_group_stats(self, sessions: List[Dict]) -> Dict:
-        """그룹 통계 계산"""
-        completed_sessions = [s for s in sessions if s.get("completion_time_minutes") is not None]
-        
-        if not completed_sessions:
-            return {"error": "No completed sessions"}
+    def verify_aggregates(self) -> Dict:
+        """누적 집계를 전체 세션 재계산과 비교, 어긋난 항목 목록 반환"""
+        sessions = self._load_sessions()
+        aggregates = self.store.aggregates()
+        # 그룹별, (그룹, 작업 유형)별 재계산을 한 번의 순회로
+        recomputed: Dict = {}
+        for session in sessions.values():
+            group = session.get("group", "unknown")
+            for key in ((group, None), (group, session.get("task_type", "unknown"))):
+                accumulator = recomputed.get(key)
+                if accumulator is None:
+                    accumulator = recomputed[key] = GroupAccumulator()
+                accumulator.add(session)
         
-        return {
-            "total_sessions": len(sessions),
-            "completed_sessions": len(completed_sessions),
-            "avg_completion_time": sum(s["completion_time_minutes"] for s in completed_sessions) / len(completed_sessions),
-            "success_rate": sum(1 for s in completed_sessions if s.get("success_achieved")) / len(completed_sessions) * 100,
-            "consistency_rate": sum(1 for s in completed_sessions if s.get("consistency_maintained")) / len(completed_sessions) * 100,
-            "duplicate_work_rate": sum(1 for s in completed_sessions if s.get("duplicate_work_detected")) / len(completed_sessions) * 100
-        }
+        mismatches = []
+        keys = set(recomputed) | {(group, None) for group in aggregates.groups} | set(aggregates.task_types)
+        for group, task_type in sorted(keys, key=lambda key: (key[0], key[1] or "")):
+            expected = recomputed[group, task_type].stats() if (group, task_type) in recomputed else {
+                "error": "No completed sessions"
+            }
+            actual = aggregates.stats(group, task_type)
+            for field, value in expected.items():
+                if isinstance(value, str) or isinstance(actual.get(field), str):
+                    matches = actual.get(field) == value
+                else:
+                    matches = field in actual and abs(actual[field] - value) <= AGGREGATE_TOLERANCE * max(1.0, abs(value))
+                if not matches:
+                    mismatches.append({
+                        "group": group, "task_type": task_type, "field": field,
+                        "expected": value, "actual": actual.get(field),
+                    })
+        return {"sessions": len(sessions), "ok": not mismatches, "mismatches": mismatches}
     
     def _calculate_improvement(self, control_value: float, treatment_value: float, reverse: bool = False) -> float:
         """개선율 계산"""
@@ -165,39 +382,61 @@ class ABTestFramework:
         improvement = (treatment_value - control_value) / control_value * 100
         return -improvement if reverse else improvement
     
-    def _check_significance(self, control_sessions: List[Dict], treatment_sessions: List[Dict]) -> Dict:
-        """통계적 유의성 검정 (간단한 버전)"""
-        # 실제로는 t-test 등을 사용해야 하지만, 여기서는 간단한 체크
-        control_size = len([s for s in control_sessions if s.get("completion_time_minutes") is not None])
-        treatment_size = len([s for s in treatment_sessions if s.get("completion_time_minutes") is not None])
+    def _check_significance(self, control: GroupAccumulator, treatment: GroupAccumulator,
+                            bootstrap: bool = False) -> Dict:
+        """통계적 유의성 검정: 성공률 z-검정, 완료 시간 Welch t-검정 (누적값으로 계산)
+
+        bootstrap=True 면 세션을 읽어 부트스트랩 신뢰구간도 계산한다 (세션 수에 비례).
+        """
+        control_n = control.completed
+        treatment_n = treatment.completed
+        
+        success_rate = two_proportion_z_test(control.successes, control_n, treatment.successes, treatment_n)
+        completion_time = welch_t_test_from_stats(*control.mean_variance(), *treatment.mean_variance())
+        p_values = [test["p_value"] for test in (success_rate, completion_time) if "p_value" in test]
         
+        result = {
+            "sample_size_adequate": control_n >= 10 and treatment_n >= 10,
+            "control_sample_size": control_n,
+            "treatment_sample_size": treatment_n,
+            "alpha": SIGNIFICANCE_LEVEL,
+            "success_rate": success_rate,
+            "completion_time": completion_time,
+            "significant": bool(p_values) and min(p_values) < SIGNIFICANCE_LEVEL,
+        }
+        if bootstrap:
+            result["bootstrap"] = self._bootstrap()
+        return result
+    
+    def _bootstrap(self) -> Dict:
+        """성공률/완료 시간 차이의 부트스트랩 신뢰구간"""
+        values = {"control": ([], []), "treatment": ([], [])}
+        for session in self._load_sessions().values():
+            if session.get("group") in values and session.get("completion_time_minutes") is not None:
+                success, times = values[session["group"]]
+                success.append(1.0 if session.get("success_achieved") else 0.0)
+                times.append(session["completion_time_minutes"])
         return {
-            "sample_size_adequate": control_size >= 10 and treatment_size >= 10,
-            "control_sample_size": control_size,
-            "treatment_sample_size": treatment_size,
-            "note": "실제 프로덕션에서는 적절한 통계 검정 필요"
+            "success_rate": bootstrap_mean_difference(values["control"][0], values["treatment"][0]),
+            "completion_time": bootstrap_mean_difference(values["control"][1], values["treatment"][1]),
         }
     
+    def _has_session(self, session_id: str) -> bool:
+        """알려진 세션인지 (buffered 모드에서 다른 프로세스가 방금 시작해 아직 다시 읽지
+        않은 세션일 수 있으므로, 없으면 바로 다시 읽어 확인)"""
+        return session_id in self._load_sessions() or session_id in self.store.sessions(force=True)
+    
     def _load_sessions(self) -> Dict:
-        """세션 로드"""
-        if not self.test_file.exists():
-            return {}
-        try:
-            with open(self.test_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {}
+        """세션 로드 (스냅샷 + 이후 이벤트, 지난 조회 이후 이벤트만 재생)"""
+        return self.store.sessions()
     
     def _save_session(self, session: TestSession) -> None:
-        """세션 저장"""
-        sessions = self._load_sessions()
-        sessions[session.session_id] = asdict(session)
-        self._save_all_sessions(sessions)
+        """세션 저장 (시작 이벤트 한 줄 추가)"""
+        self.store.append([start_event(session.to_dict())])
     
     def _save_all_sessions(self, sessions: Dict) -> None:
-        """전체 세션 저장"""
-        with open(self.test_file, 'w', encoding='utf-8') as f:
-            json.dump(sessions, f, indent=2, ensure_ascii=False)
+        """전체 세션 저장 (스냅샷 교체)"""
+        self.store.replace(sessions)
 
 def main():
     """CLI 인터페이스"""
@@ -206,7 +445,7 @@ def main():
     framework = ABTestFramework()
     
     if len(sys.argv) < 2:
-        print("Usage: python ab_test_framework.py [start|complete|analyze] [args...]")
+        print("Usage: python ab_test_framework.py [start|complete|analyze|verify|compact|import] [args...]")
         return
     
     command = sys.argv[1]
@@ -222,16 +461,42 @@ def main():
         if len(sys.argv) < 5:
             print("Usage: complete <session_id> <completion_time_minutes> <success_achieved>")
             return
-        framework.complete_test_session(
-            sys.argv[2], 
-            float(sys.argv[3]), 
-            sys.argv[4].lower() == 'true'
-        )
+        try:
+            recommendation = framework.complete_test_session(
+                sys.argv[2], 
+                float(sys.argv[3]), 
+                sys.argv[4].lower() == 'true'
+            )
+        except ValueError as e:
+            print(f"Session not completed: {e}")
+            sys.exit(1)
         print("Session completed")
+        if recommendation["stop"]:
+            print(f"Stop recommended ({recommendation['reason']}): {', '.join(recommendation['metrics'])}")
         
     elif command == "analyze":
-        results = framework.analyze_results()
+        results = framework.analyze_results(bootstrap="--bootstrap" in sys.argv[2:])
         print(json.dumps(results, indent=2, ensure_ascii=False))
+        
+    elif command == "verify":
+        result = framework.verify_aggregates()
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        if not result["ok"]:
+            sys.exit(1)
+        
+    elif command == "import":
+        if len(sys.argv) < 3:
+            print("Usage: import <sessions.csv|sessions.ndjson> [csv|ndjson]")
+            return
+        result = framework.import_sessions(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+        print(f"Sessions imported: {result['started']} started, {result['completed']} completed, "
+              f"{len(result['errors'])} errors")
+        for error in result["errors"][:MAX_REPORTED_ERRORS]:
+            print(f"  row {error['row']}: {error['error']}")
+        
+    elif command == "compact":
+        framework.store.compact()
+        print(f"Sessions compacted: {framework.test_file}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+온라인 변화 지점 탐지 (양측 CUSUM)
+
+토큰 효율과 첫 시도 성공률이 언제 바뀌었는지 샘플 하나당 O(1) 로 추적한다.
+기준 평균/표준편차는 처음 warmup 개 샘플로 정하고, 기준에서 k 표준편차 이상
+벗어난 편차를 누적해 h 표준편차를 넘으면 변화로 보고한다. 보고 후에는 변화
+이후 샘플로 기준을 다시 잡는다.
+
+첫 시도 성공처럼 0/1 인 계열은 표준편차 단위가 맞지 않으므로 (기준 구간이
+모두 성공이면 실패 하나가 수십 σ 가 된다) 기준 성공률 p0 와 오즈비만큼 바뀐
+p1 사이의 로그우도비를 누적하는 Bernoulli CUSUM 을 쓴다.
+"""
+import math
+from typing import Dict, List, Optional
+
+try:
+    from .metrics_rollup import metric_values
+except ImportError:
+    from metrics_rollup import metric_values
+
+# 기준 평균/분산을 추정할 샘플 수
+CUSUM_WARMUP = 30
+
+# 허용 편차 k 와 경보 임계값 h (표준편차 단위)
+# 정규 데이터 기준 오경보는 약 700 샘플에 한 번, 1.6σ 이동은 약 5 샘플 안에 탐지
+CUSUM_SLACK = 0.5
+CUSUM_THRESHOLD = 6.0
+
+# 분산이 0 인 기준 구간에서 0 으로 나누지 않기 위한 최소 표준편차
+DEFAULT_MIN_STD = 1e-9
+
+# Bernoulli CUSUM: 기준 대비 오즈비 3 배 상승/하락을 대립가설로 두고, 로그우도비가
+# 6 을 넘으면 보고. 오경보는 약 400 샘플에 한 번, 성공률 30%p 하락은 약 25 샘플 안에 탐지
+BERNOULLI_ODDS_RATIO = 3.0
+BERNOULLI_THRESHOLD = 6.0
+
+# 0/1 값으로만 이뤄진 계열
+BERNOULLI_METRICS = ("first_attempt_success",)
+
+
+class CusumDetector:
+    """한 메트릭 계열에 대한 양측 CUSUM"""
+
+    def __init__(self, name: str, warmup: int = CUSUM_WARMUP, slack: float = CUSUM_SLACK,
+                 threshold: float = CUSUM_THRESHOLD, min_std: float = DEFAULT_MIN_STD):
+        self.name = name
+        self.warmup = warmup
+        self.slack = slack
+        self.threshold = threshold
+        self.min_std = min_std
+        self.index = -1
+        self._reset_baseline()
+
+    def _reset_baseline(self):
+        # 기준 추정 (Welford)
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.baseline_mean: Optional[float] = None
+        self.baseline_std: Optional[float] = None
+        # 상승/하락 누적합과 누적이 시작된 샘플 위치, 그 이후 합
+        self._high = self._low = 0.0
+        self._high_start = self._low_start = None
+        self._high_sum = self._low_sum = 0.0
+
+    def add(self, value: float, timestamp: Optional[str] = None, position: Optional[int] = None) -> Optional[Dict]:
+        """샘플 추가, 변화가 탐지되면 변화 지점 정보 반환
+
+        position 은 보고에 쓰는 샘플 위치 (생략하면 이 계열 안의 순번)
+        """
+        self.index += 1
+        position = self.index if position is None else position
+        if self.baseline_mean is None:
+            self._count += 1
+            delta = value - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (value - self._mean)
+            if self._count >= self.warmup:
+                self._set_baseline()
+            return None
+
+        high, low = self._increments(value)
+        self._high, self._high_start, self._high_sum = self._step(
+            self._high + high, self._high_start, self._high_sum, value, (position, timestamp)
+        )
+        self._low, self._low_start, self._low_sum = self._step(
+            self._low + low, self._low_start, self._low_sum, value, (position, timestamp)
+        )
+
+        for statistic, start, total, direction in (
+            (self._high, self._high_start, self._high_sum, "increase"),
+            (self._low, self._low_start, self._low_sum, "decrease"),
+        ):
+            if statistic > self.threshold:
+                (index, start_timestamp), samples = start
+                change = {
+                    "metric": self.name,
+                    "direction": direction,
+                    "index": index,
+                    "timestamp": start_timestamp,
+                    "detected_index": position,
+                    "detected_at": timestamp,
+                    "before_mean": self.baseline_mean,
+                    "after_mean": total / samples,
+                }
+                self._reset_baseline()
+                return change
+        return None
+
+    def _set_baseline(self):
+        self.baseline_mean = self._mean
+        self.baseline_std = max(math.sqrt(self._m2 / (self._count - 1)), self.min_std)
+
+    def _increments(self, value: float):
+        """(상승, 하락) 누적합에 더할 값"""
+        z = (value - self.baseline_mean) / self.baseline_std
+        return z - self.slack, -z - self.slack
+
+    @staticmethod
+    def _step(statistic: float, start, total: float, value: float, origin):
+        """누적합이 0 아래로 내려가면 초기화, 새로 쌓이기 시작하면 (위치, 시각) 과 샘플 수 기록"""
+        if statistic <= 0:
+            return 0.0, None, 0.0
+        if start is None:
+            return statistic, (origin, 1), value
+        return statistic, (start[0], start[1] + 1), total + value
+
+
+class BernoulliCusumDetector(CusumDetector):
+    """0/1 계열에 대한 양측 Bernoulli CUSUM (로그우도비 누적)
+
+    기준 성공률은 warmup 구간을 0.5 씩 보정해 (s + 0.5) / (n + 1) 로 잡으므로
+    모두 성공하거나 모두 실패한 구간에서도 0 과 1 에서 떨어져 있다.
+    """
+
+    def __init__(self, name: str, warmup: int = CUSUM_WARMUP, threshold: float = BERNOULLI_THRESHOLD,
+                 odds_ratio: float = BERNOULLI_ODDS_RATIO):
+        self.odds_ratio = odds_ratio
+        super().__init__(name, warmup, slack=0.0, threshold=threshold)
+
+    def _set_baseline(self):
+        self.baseline_mean = self._mean
+        p0 = (self._mean * self._count + 0.5) / (self._count + 1)
+        self.baseline_std = math.sqrt(p0 * (1 - p0))
+        odds = p0 / (1 - p0)
+        # (성공, 실패) 일 때 더할 로그우도비
+        self._llr = []
+        for target_odds in (odds * self.odds_ratio, odds / self.odds_ratio):
+            p1 = target_odds / (1 + target_odds)
+            self._llr.append((math.log(p1 / p0), math.log((1 - p1) / (1 - p0))))
+
+    def _increments(self, value: float):
+        return tuple(success if value else failure for success, failure in self._llr)
+
+
+class MetricChangeDetector:
+    """토큰 효율과 첫 시도 성공에 대한 CUSUM 묶음"""
+
+    def __init__(self, warmup: int = CUSUM_WARMUP, slack: float = CUSUM_SLACK, threshold: float = CUSUM_THRESHOLD):
+        self.detectors = {
+            "token_improvement": CusumDetector("token_improvement", warmup, slack, threshold),
+        }
+        for name in BERNOULLI_METRICS:
+            self.detectors[name] = BernoulliCusumDetector(name, warmup)
+        self.changes: List[Dict] = []
+        self.count = 0
+
+    def add(self, metric: Dict) -> List[Dict]:
+        """메트릭 하나 반영, 이번에 탐지된 변화 지점 반환"""
+        values = {"first_attempt_success": 1.0 if metric.get("first_attempt_success") else 0.0}
+        token_improvement = metric_values(metric).get("token_improvement")
+        if token_improvement is not None:
+            values["token_improvement"] = token_improvement
+        detected = []
+        for name, value in values.items():
+            change = self.detectors[name].add(value, metric.get("timestamp"), self.count)
+            if change is not None:
+                detected.append(change)
+        self.count += 1
+        self.changes.extend(detected)
+        return detected
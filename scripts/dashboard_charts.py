@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+성능 리포트 차트 렌더링
+
+트렌드, 응답 시간 분포, A/B 비교 차트를 리포트 옆 charts/ 에 PNG/SVG 로
+그린다. 차트마다 입력 데이터 해시를 manifest.json 에 기록해 데이터가 바뀐
+차트만 다시 그리며, 렌더링은 Agg 백엔드를 쓰는 프로세스 풀에서 한다.
+matplotlib 은 워커 프로세스에서만 import 하므로 리포트 프로세스는 가볍다.
+"""
+import hashlib
+import importlib.util
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# 차트 모양을 바꾸면 올려서 기존 차트를 모두 다시 그림
+CHART_STYLE_VERSION = 1
+
+CHART_FORMATS = ("png", "svg")
+
+CHART_TITLES = {
+    "trend": "Success rate (EWMA) and token efficiency",
+    "distribution": "Response time distribution",
+    "ab_comparison": "A/B comparison",
+}
+
+
+def matplotlib_available() -> bool:
+    return importlib.util.find_spec("matplotlib") is not None
+
+
+def chart_key(kind: str, data: Dict) -> str:
+    """차트 종류 + 입력 데이터 해시"""
+    payload = json.dumps({"kind": kind, "data": data, "style": CHART_STYLE_VERSION}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _render_chart(kind: str, data: Dict, output_base: str):
+    """워커 프로세스에서 차트 하나를 PNG/SVG 로 저장"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    figure, axis = plt.subplots(figsize=(8, 4.5))
+    if kind == "trend":
+        axis.plot(data["success_ewma"], label="success rate EWMA (%)")
+        axis.plot(data["token_improvement"], label="token improvement (%)", alpha=0.7)
+        axis.set_xlabel("session")
+        axis.legend()
+    elif kind == "distribution":
+        axis.hist(data["response_times"], bins=min(50, max(5, len(data["response_times"]) // 10)))
+        axis.set_xlabel("response time (ms)")
+        axis.set_ylabel("sessions")
+    elif kind == "ab_comparison":
+        groups = list(data)
+        positions = range(len(groups))
+        axis.bar([p - 0.2 for p in positions], [data[g]["success_rate"] for g in groups], 0.4,
+                 label="success rate (%)")
+        axis.bar([p + 0.2 for p in positions], [data[g]["avg_completion_time"] for g in groups], 0.4,
+                 label="avg completion (min)")
+        axis.set_xticks(list(positions))
+        axis.set_xticklabels(groups)
+        axis.legend()
+    axis.set_title(CHART_TITLES.get(kind, kind))
+    figure.tight_layout()
+    for chart_format in CHART_FORMATS:
+        # 같은 디렉터리의 임시 파일에 쓴 뒤 교체해 반쯤 그려진 차트가 보이지 않게 함
+        tmp_path = f"{output_base}.tmp.{chart_format}"
+        figure.savefig(tmp_path, format=chart_format)
+        os.replace(tmp_path, f"{output_base}.{chart_format}")
+    plt.close(figure)
+
+
+class ChartRenderer:
+    """데이터가 바뀐 차트만 프로세스 풀에서 다시 그림"""
+
+    def __init__(self, output_dir: Path, jobs: Optional[int] = None):
+        self.output_dir = Path(output_dir)
+        self.manifest_file = self.output_dir / "manifest.json"
+        self.jobs = jobs or os.cpu_count() or 1
+
+    def _load_manifest(self) -> Dict[str, str]:
+        try:
+            return json.loads(self.manifest_file.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, FileNotFoundError):
+            return {}
+
+    def _is_current(self, name: str, key: str, manifest: Dict[str, str]) -> bool:
+        return manifest.get(name) == key and all(
+            (self.output_dir / f"{name}.{chart_format}").exists() for chart_format in CHART_FORMATS
+        )
+
+    def render(self, charts: Dict[str, Dict]) -> Dict[str, List[str]]:
+        """charts: {이름: {"kind": 종류, "data": 입력}} -> 렌더링/건너뜀 목록"""
+        if not matplotlib_available():
+            return {"rendered": [], "unchanged": [], "skipped": sorted(charts)}
+
+        manifest = self._load_manifest()
+        keys = {name: chart_key(chart["kind"], chart["data"]) for name, chart in charts.items()}
+        pending = [name for name in charts if not self._is_current(name, keys[name], manifest)]
+        unchanged = sorted(set(charts) - set(pending))
+        if pending:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            with ProcessPoolExecutor(max_workers=min(self.jobs, len(pending))) as pool:
+                futures = {
+                    name: pool.submit(
+                        _render_chart, charts[name]["kind"], charts[name]["data"], str(self.output_dir / name)
+                    )
+                    for name in pending
+                }
+                for name, future in futures.items():
+                    future.result()
+                    manifest[name] = keys[name]
+            tmp_path = self.manifest_file.with_name(f".{self.manifest_file.name}.tmp")
+            tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, self.manifest_file)
+        return {"rendered": sorted(pending), "unchanged": unchanged, "skipped": []}
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+로컬 실시간 성능 대시보드 서버 (표준 라이브러리만 사용)
+
+메트릭 로그를 파일 offset 기준으로 이어 읽으며 집계를 메모리에서 증분
+갱신하고, 변경이 생기면 server-sent events 로 정적 HTML 페이지에 보낸다.
+요청마다 전체 재계산을 하지 않는다.
+"""
+import json
+import threading
+import traceback
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+try:
+    from .change_point import MetricChangeDetector
+    from .metrics_rollup import metric_values
+    from .performance_dashboard import (
+        EWMA_ALPHA, PERCENTILES, RECENT_CHANGE_POINTS, RECENT_WINDOW, PerformanceDashboard, RollingQuantiles,
+        _epoch,
+    )
+except ImportError:
+    from change_point import MetricChangeDetector
+    from metrics_rollup import metric_values
+    from performance_dashboard import (
+        EWMA_ALPHA, PERCENTILES, RECENT_CHANGE_POINTS, RECENT_WINDOW, PerformanceDashboard, RollingQuantiles,
+        _epoch,
+    )
+
+# 파일 변경 확인 주기 (초)
+POLL_INTERVAL = 1.0
+
+# 변경이 없어도 SSE 연결 유지를 위해 주석을 보내는 주기 (초)
+HEARTBEAT_INTERVAL = 15.0
+
+# 응답 시간 분위수를 계산할 최근 샘플 수
+LATENCY_WINDOW = 1000
+
+
+class LiveAggregates:
+    """메트릭 하나당 O(1) 로 갱신되는 누적/최근 집계"""
+
+    def __init__(self, window: int = RECENT_WINDOW):
+        self.count = 0
+        self.token_improvement_sum = 0.0
+        self.token_improvement_count = 0
+        self.response_time_sum = 0.0
+        self.response_time_count = 0
+        self.successes = 0
+        self.quality_issues = 0
+        self.ewma_response_time: Optional[float] = None
+        self.ewma_success: Optional[float] = None
+        self.recent = deque(maxlen=window)  # 최근 성공 여부
+        self.latency = RollingQuantiles(max_count=LATENCY_WINDOW)
+        self.changes = MetricChangeDetector()
+        self.last_timestamp = None
+
+    def add(self, metric: Dict):
+        self.count += 1
+        values = metric_values(metric)
+        if "token_improvement" in values:
+            self.token_improvement_sum += values["token_improvement"]
+            self.token_improvement_count += 1
+        if "response_time_ms" in values:
+            response_time = values["response_time_ms"]
+            self.response_time_sum += response_time
+            self.response_time_count += 1
+            self.ewma_response_time = response_time if self.ewma_response_time is None else (
+                EWMA_ALPHA * response_time + (1 - EWMA_ALPHA) * self.ewma_response_time
+            )
+            self.latency.add(_epoch(metric.get("timestamp")), response_time)
+
+        success = 1.0 if metric.get("first_attempt_success") else 0.0
+        self.successes += success
+        self.ewma_success = success if self.ewma_success is None else (
+            EWMA_ALPHA * success + (1 - EWMA_ALPHA) * self.ewma_success
+        )
+        self.recent.append(success)
+        if (metric.get("context_miss_detected") or metric.get("duplicate_work_detected")
+                or metric.get("consistency_violation")):
+            self.quality_issues += 1
+        self.changes.add(metric)
+        self.last_timestamp = metric.get("timestamp", self.last_timestamp)
+
+    def summary(self) -> Dict:
+        if not self.count:
+            return {"sample_size": 0}
+        summary = {
+            "sample_size": self.count,
+            "avg_token_improvement": (
+                self.token_improvement_sum / self.token_improvement_count if self.token_improvement_count else 0.0
+            ),
+            "avg_response_time": self.response_time_sum / self.response_time_count if self.response_time_count else 0.0,
+            "success_rate": self.successes / self.count * 100,
+            "recent_success_rate": sum(self.recent) / len(self.recent) * 100,
+            "quality_issue_rate": self.quality_issues / self.count * 100,
+            "ewma_response_time": self.ewma_response_time or 0.0,
+            "ewma_success_rate": (self.ewma_success or 0.0) * 100,
+            "last_timestamp": self.last_timestamp,
+            "change_points": self.changes.changes[-RECENT_CHANGE_POINTS:],
+        }
+        for p in PERCENTILES:
+            summary[f"p{p}_response_time"] = self.latency.quantile(p / 100)
+        return summary
+
+
+def ab_summary(aggregates) -> Dict:
+    """A/B 저장소 누적 집계 -> 그룹별 통계 (보고서와 같은 format_group_stats 형식)
+
+    완료 세션이 없는 그룹도 세션 수는 보이도록 남긴다.
+    """
+    return {
+        name: {"total_sessions": group.total, "completed_sessions": group.completed, **aggregates.stats(name)}
+        for name, group in sorted(aggregates.groups.items())
+    }
+
+
+class DashboardState:
+    """파일을 이어 읽어 집계를 갱신하고, 바뀔 때마다 version 을 올림"""
+
+    def __init__(self, dashboard: PerformanceDashboard):
+        self.dashboard = dashboard
+        self.metrics = LiveAggregates(dashboard.window or RECENT_WINDOW)
+        self.ab: Dict = {}
+        self.version = 0
+        self.stopping = False
+        self._offset = 0
+        self._ab_loaded = False
+        self._snapshot = json.dumps({"version": 0})
+        self._changed = threading.Condition()
+        if not dashboard.metrics_log.exists():
+            # 로그 도입 전 메트릭은 시작 시 한 번만 읽음
+            for metric in dashboard._load_legacy_metrics():
+                self.metrics.add(metric)
+        self.poll()
+
+    def poll(self) -> bool:
+        """새로 추가된 메트릭/A/B 결과 반영, 바뀐 게 있으면 True"""
+        metrics, self._offset = self.dashboard.metrics_log.read_since(self._offset)
+        for metric in metrics:
+            self.metrics.add(metric)
+        ab_changed = self._poll_ab()
+        changed = bool(metrics) or ab_changed
+        if changed or self.version == 0:
+            self._publish()
+        return changed
+
+    def _poll_ab(self) -> bool:
+        # A/B 저장소는 지난 조회 이후 이벤트만 재생하며 그룹 집계도 함께 갱신함
+        if not self.dashboard.ab_store.refresh() and self._ab_loaded:
+            return False
+        self._ab_loaded = True
+        self.ab = ab_summary(self.dashboard.ab_store.aggregates())
+        return True
+
+    def _publish(self):
+        with self._changed:
+            self.version += 1
+            self._snapshot = json.dumps({
+                "version": self.version,
+                "updated_at": datetime.now().isoformat(timespec="seconds"),
+                "performance": self.metrics.summary(),
+                "ab_test": self.ab,
+            }, ensure_ascii=False)
+            self._changed.notify_all()
+
+    def snapshot(self) -> str:
+        """마지막으로 계산한 집계 (JSON 문자열)"""
+        return self._snapshot
+
+    def wait(self, version: int, timeout: float) -> int:
+        """version 이후 변경 (또는 stop) 을 timeout 까지 기다리고 현재 version 반환"""
+        with self._changed:
+            self._changed.wait_for(lambda: self.stopping or self.version != version, timeout)
+            return self.version
+
+    def stop(self):
+        """기다리는 스트림을 모두 깨워 끝내게 함"""
+        with self._changed:
+            self.stopping = True
+            self._changed.notify_all()
+
+
+DASHBOARD_HTML = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>컨텍스트 관리 성능 대시보드</title>
+<style>
+body { font-family: sans-serif; margin: 2em; }
+table { border-collapse: collapse; margin-bottom: 1.5em; }
+td, th { border: 1px solid #ccc; padding: 4px 10px; text-align: right; }
+th { text-align: left; }
+</style>
+</head>
+<body>
+<h1>컨텍스트 관리 성능 대시보드</h1>
+<p>마지막 갱신: <span id="updated">-</span></p>
+<h2>성능</h2>
+<table id="performance"></table>
+<h2>변화 지점</h2>
+<ul id="change_points"></ul>
+<h2>A/B 테스트</h2>
+<table id="ab_test"></table>
+<script>
+function format(value) {
+  return typeof value === "number" ? value.toFixed(2) : (value === null || value === undefined ? "-" : value);
+}
+// 값은 모두 textContent 로 넣음 (작업 유형, 그룹 이름 등이 HTML 로 해석되지 않도록)
+function cell(tag, text) {
+  const element = document.createElement(tag);
+  element.textContent = text;
+  return element;
+}
+function render(id, rows) {
+  document.getElementById(id).replaceChildren(...rows.map(row => {
+    const tr = document.createElement("tr");
+    tr.append(cell("th", row[0]), ...row.slice(1).map(v => cell("td", format(v))));
+    return tr;
+  }));
+}
+new EventSource("/events").onmessage = function (event) {
+  const data = JSON.parse(event.data);
+  document.getElementById("updated").textContent = data.updated_at;
+  const { change_points = [], ...performance } = data.performance;
+  render("performance", Object.entries(performance));
+  document.getElementById("change_points").replaceChildren(...(change_points.length ? change_points.map(
+    c => cell("li", (c.timestamp || c.index) + ": " + c.metric + " " + c.direction + " (" +
+                    format(c.before_mean) + " → " + format(c.after_mean) + ")")
+  ) : [cell("li", "탐지된 변화 없음")]));
+  const groups = Object.entries(data.ab_test);
+  const fields = [...new Set(groups.flatMap(([name, stats]) => Object.keys(stats)))];
+  render("ab_test", [["group"].concat(fields)].concat(
+    groups.map(([name, stats]) => [name].concat(fields.map(field => stats[field])))
+  ));
+};
+</script>
+</body>
+</html>
+"""
+
+
+def make_handler(state: DashboardState, heartbeat: float = HEARTBEAT_INTERVAL):
+    class DashboardHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/":
+                self._send(200, "text/html; charset=utf-8", DASHBOARD_HTML)
+            elif self.path == "/api/summary":
+                self._send(200, "application/json; charset=utf-8", state.snapshot())
+            elif self.path == "/events":
+                self._stream()
+            else:
+                self._send(404, "text/plain; charset=utf-8", "Not Found")
+
+        def _send(self, status: int, content_type: str, body: str):
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _stream(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            sent = None
+            try:
+                while not state.stopping:
+                    version = state.version
+                    if version != sent:
+                        self.wfile.write(f"data: {state.snapshot()}\n\n".encode("utf-8"))
+                        sent = version
+                    elif state.wait(sent, heartbeat) == sent:
+                        self.wfile.write(b": heartbeat\n\n")
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    return DashboardHandler
+
+
+class DashboardServer(ThreadingHTTPServer):
+    """HTTP 서버 + 파일 변경을 확인하는 백그라운드 스레드"""
+
+    daemon_threads = True
+
+    def __init__(self, dashboard: PerformanceDashboard, host: str = "127.0.0.1", port: int = 8765,
+                 poll_interval: float = POLL_INTERVAL, heartbeat: float = HEARTBEAT_INTERVAL):
+        self.state = DashboardState(dashboard)
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._poller = threading.Thread(target=self._poll_loop, daemon=True)
+        super().__init__((host, port), make_handler(self.state, heartbeat))
+        self._poller.start()
+
+    def _poll_loop(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.state.poll()
+            except Exception:
+                # 잘린 줄, 일시적 I/O 오류 등으로 한 번 실패해도 다음 주기에 다시 시도
+                traceback.print_exc()
+
+    def server_close(self):
+        self._stop.set()
+        self.state.stop()
+        super().server_close()
+
+
+def serve(dashboard: PerformanceDashboard, host: str = "127.0.0.1", port: int = 8765):
+    """대시보드 서버 실행 (Ctrl+C 로 종료)"""
+    server = DashboardServer(dashboard, host, port)
+    print(f"대시보드: http://{host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+컨텍스트 메트릭 로그 (append-only NDJSON)
+
+메트릭 하나당 한 줄을 파일 끝에 추가한다. 기존 context_metrics.json 처럼
+새 메트릭마다 전체 dict를 다시 쓰지 않으며, 읽는 쪽은 파일 끝에서 필요한
+만큼만 거꾸로 읽는다.
+"""
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from .metrics_rollup import RollupStore, default_rollup_dir, parse_timestamp
+except ImportError:
+    from metrics_rollup import RollupStore, default_rollup_dir, parse_timestamp
+
+# tail() 이 파일 끝에서 한 번에 읽는 크기
+TAIL_BLOCK_SIZE = 64 * 1024
+
+
+class MetricsLog:
+    """NDJSON 메트릭 로그 작성/조회
+
+    기록은 한 번의 append 로 끝내고 시간/일 롤업은 갱신하지 않는다. 롤업은 읽는
+    쪽 (RollupStore.period) 이 조회할 때 아직 반영되지 않은 꼬리를 반영하며
+    따라잡는다. rollups=False 면 롤업 저장소를 두지 않는다.
+    """
+
+    def __init__(self, log_file: str = "docs/CURRENT/context_metrics.ndjson", rollups: bool = True,
+                 rollup_dir: Optional[str] = None):
+        self.log_file = Path(log_file)
+        self.rollups = RollupStore(rollup_dir or default_rollup_dir(self.log_file)) if rollups else None
+
+    def exists(self) -> bool:
+        return self.log_file.exists()
+
+    def append(self, metric: Dict) -> None:
+        """메트릭 하나 추가"""
+        self.append_many([metric])
+
+    def append_many(self, metrics: Iterable[Dict]) -> None:
+        """여러 메트릭을 한 번의 write 로 추가"""
+        lines = []
+        for metric in metrics:
+            if "timestamp" not in metric:
+                metric = {"timestamp": datetime.now().isoformat(), **metric}
+            lines.append(json.dumps(metric, ensure_ascii=False, separators=(",", ":")) + "\n")
+        if not lines:
+            return
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        # O_APPEND 단일 write: 동시에 쓰는 프로세스끼리 줄이 섞이지 않음
+        fd = os.open(self.log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, "".join(lines).encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def reverse_lines(self) -> Iterator[bytes]:
+        """파일 끝에서부터 완성된 줄을 최신순으로 (블록 단위로 거꾸로 읽음)"""
+        if not self.log_file.exists():
+            return
+        with open(self.log_file, "rb") as f:
+            position = f.seek(0, os.SEEK_END)
+            remainder = b""
+            first_block = True
+            while position > 0:
+                step = min(TAIL_BLOCK_SIZE, position)
+                position -= step
+                f.seek(position)
+                buffer = f.read(step) + remainder
+                if first_block:
+                    # 아직 쓰는 중인 마지막 줄은 건너뜀
+                    cut = buffer.rfind(b"\n")
+                    if cut == -1:
+                        continue
+                    buffer = buffer[:cut + 1]
+                    first_block = False
+                lines = buffer.split(b"\n")
+                # 블록 경계에서 잘린 첫 줄은 다음 블록과 합침
+                remainder = lines.pop(0) if position > 0 else b""
+                for line in reversed(lines):
+                    if line.strip():
+                        yield line
+            if remainder.strip():
+                yield remainder
+
+    def tail(self, count: int) -> List[Dict]:
+        """마지막 count 개 메트릭 (파일 끝에서부터 블록 단위로 읽음)"""
+        if count <= 0:
+            return []
+        lines = []
+        for line in self.reverse_lines():
+            lines.append(line)
+            if len(lines) == count:
+                break
+        return self._parse(lines[::-1])
+
+    def since(self, cutoff: datetime) -> List[Dict]:
+        """cutoff 이후 기록된 메트릭 (시간순), 더 오래된 메트릭을 만나면 읽기 중단"""
+        cutoff = parse_timestamp(cutoff)
+        metrics = []
+        for line in self.reverse_lines():
+            parsed = self._parse([line])
+            if not parsed:
+                continue
+            timestamp = parse_timestamp(parsed[0].get("timestamp"))
+            if timestamp is None:
+                continue
+            if timestamp < cutoff:
+                break
+            metrics.append(parsed[0])
+        return metrics[::-1]
+
+    def between(self, start: datetime, end: datetime, limit: Optional[int] = None) -> List[Dict]:
+        """[start, end) 에 기록된 메트릭 (limit 바이트 이전만)
+
+        로그는 시간순으로 쌓인다고 보고 (since 와 같은 가정) start 위치를 줄 단위
+        이분 탐색으로 찾은 뒤 end 이후 메트릭을 만날 때까지만 앞으로 읽는다.
+        """
+        if not self.log_file.exists():
+            return []
+        start, end = parse_timestamp(start), parse_timestamp(end)
+        metrics = []
+        with open(self.log_file, "rb") as f:
+            limit = f.seek(0, os.SEEK_END) if limit is None else limit
+            f.seek(self._seek_time(f, start, limit))
+            while f.tell() < limit:
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    break
+                parsed = self._parse([line])
+                timestamp = parse_timestamp(parsed[0].get("timestamp")) if parsed else None
+                if timestamp is None:
+                    continue
+                if timestamp >= end:
+                    break
+                if timestamp >= start:
+                    metrics.append(parsed[0])
+        return metrics
+
+    def _seek_time(self, f, cutoff: datetime, limit: int) -> int:
+        """limit 이전에서 timestamp >= cutoff 인 첫 줄의 시작 위치 (시각을 못 읽는 줄은 이전 것으로 봄)"""
+        low, high = 0, limit
+        while low < high:
+            middle = (low + high) // 2
+            # middle 이후 첫 줄의 시작 위치
+            if middle:
+                f.seek(middle - 1)
+                f.readline()
+            else:
+                f.seek(0)
+            line_start = f.tell()
+            if line_start >= high:
+                high = middle
+                continue
+            line = f.readline()
+            parsed = self._parse([line])
+            timestamp = parse_timestamp(parsed[0].get("timestamp")) if parsed else None
+            if timestamp is None or timestamp < cutoff:
+                low = line_start + len(line)
+            else:
+                high = line_start
+        return low
+
+    def __iter__(self) -> Iterator[Dict]:
+        """처음부터 모든 메트릭 순회"""
+        if not self.log_file.exists():
+            return
+        with open(self.log_file, "rb") as f:
+            for line in f:
+                if line.endswith(b"\n") and line.strip():
+                    yield from self._parse([line])
+
+    def read_since(self, offset: int) -> Tuple[List[Dict], int]:
+        """offset 이후에 추가된 메트릭과 다음에 읽을 offset"""
+        if not self.log_file.exists():
+            return [], offset
+        with open(self.log_file, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        complete = data[:data.rfind(b"\n") + 1]
+        return self._parse(complete.splitlines()), offset + len(complete)
+
+    @staticmethod
+    def _parse(lines: List[bytes]) -> List[Dict]:
+        metrics = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                metrics.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return metrics
+
+    def import_legacy(self, json_file: str) -> int:
+        """기존 context_metrics.json(dict) 을 로그로 옮김, 옮긴 개수 반환"""
+        with open(json_file, "r", encoding="utf-8") as f:
+            metrics = list(json.load(f).values())
+        self.append_many(metrics)
+        return len(metrics)
+
+
+def record_metric(metric: Dict, log_file: str = "docs/CURRENT/context_metrics.ndjson") -> None:
+    """메트릭 생산자용 단축 함수"""
+    MetricsLog(log_file).append(metric)
+
+
+def main():
+    """CLI 인터페이스"""
+    import sys
+
+    if len(sys.argv) < 3 or sys.argv[1] not in ("append", "migrate"):
+        print("Usage: python metrics_log.py [append '<metric json>' | migrate <context_metrics.json>]")
+        return
+
+    log = MetricsLog()
+    if sys.argv[1] == "append":
+        log.append(json.loads(sys.argv[2]))
+        print(f"Metric appended: {log.log_file}")
+    else:
+        count = log.import_legacy(sys.argv[2])
+        print(f"{count} metrics migrated to {log.log_file}")
+
+
+if __name__ == "__main__":
+    main()
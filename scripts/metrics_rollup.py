@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+메트릭 시간/일 단위 롤업
+
+조회할 때 메트릭 로그에서 아직 반영하지 않은 부분을 일자별 파일 하나의
+일 버킷과 시간 버킷 24개에 반영한다 (작성자는 로그에 한 줄 추가만 한다). 버킷에는 개수, Welford 평균/편차 제곱합, 성공/품질 이슈 수와
+t-digest 가 들어 있어 긴 구간의 평균/표준편차/분위수를 원본 없이 계산할 수
+있다.
+"""
+import json
+import math
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: 잠금 없이 동작
+    fcntl = None
+
+try:
+    from .metrics_stats import Moments
+    from .quantile_sketch import TDigest
+except ImportError:
+    from metrics_stats import Moments
+    from quantile_sketch import TDigest
+
+# 평균/분산과 digest 를 유지하는 수치 필드
+ROLLUP_FIELDS = ("token_improvement", "response_time_ms")
+
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """메트릭 timestamp -> naive 로컬 시각 (문자열/datetime 이 아니거나 형식이 틀리면 None)
+
+    시간대가 붙은 값은 로컬 시각으로 바꿔 datetime.now() 로 기록한 값과 비교할 수 있게 한다.
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    elif not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _hour_floor(timestamp: datetime) -> datetime:
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def metric_values(metric: Dict) -> Dict[str, float]:
+    """메트릭에서 집계할 수치 값 (값이 없거나 0 이면 제외)"""
+    values = {}
+    if metric.get('response_time_ms'):
+        values["response_time_ms"] = metric['response_time_ms']
+    if metric.get('token_count_before') and metric.get('token_count_after'):
+        values["token_improvement"] = (
+            (metric['token_count_before'] - metric['token_count_after']) / metric['token_count_before'] * 100
+        )
+    return values
+
+
+def new_bucket() -> Dict:
+    return {"count": 0, "successes": 0, "quality_issues": 0, "fields": {}}
+
+
+def add_metric(bucket: Dict, metric: Dict):
+    """버킷에 메트릭 하나 반영 (digest 는 TDigest 객체로 유지)"""
+    bucket["count"] += 1
+    if metric.get("first_attempt_success"):
+        bucket["successes"] += 1
+    if (metric.get("context_miss_detected") or metric.get("duplicate_work_detected")
+            or metric.get("consistency_violation")):
+        bucket["quality_issues"] += 1
+    for name, value in metric_values(metric).items():
+        field = bucket["fields"].setdefault(name, _new_field())
+        field["moments"].add(value)
+        field["digest"].add(value)
+
+
+def merge_bucket(target: Dict, source: Dict):
+    for key in ("count", "successes", "quality_issues"):
+        target[key] += source[key]
+    for name, field in source["fields"].items():
+        merged = target["fields"].setdefault(name, _new_field())
+        merged["moments"].merge(field["moments"])
+        merged["digest"].merge(field["digest"])
+
+
+def _new_field() -> Dict:
+    return {"moments": Moments(), "digest": TDigest()}
+
+
+def _encode(bucket: Dict) -> Dict:
+    return {**bucket, "fields": {
+        name: {**field["moments"].to_dict(), "digest": field["digest"].to_dict()}
+        for name, field in sorted(bucket["fields"].items())
+    }}
+
+
+def _decode_moments(field: Dict) -> Moments:
+    if "m2" in field:
+        return Moments.from_dict(field)
+    # 합/제곱합으로 저장하던 이전 롤업 파일
+    count = field["count"]
+    mean = field["sum"] / count if count else 0.0
+    return Moments(count, mean, max(field["sumsq"] - count * mean * mean, 0.0))
+
+
+def _decode(data: Dict) -> Dict:
+    return {**data, "fields": {
+        name: {"moments": _decode_moments(field), "digest": TDigest.from_dict(field["digest"])}
+        for name, field in data["fields"].items()
+    }}
+
+
+def summarize_bucket(bucket: Dict, percentiles: Iterable[int] = (50, 95, 99)) -> Dict:
+    """버킷의 성공률/품질 이슈율과 필드별 평균·표준편차·분위수"""
+    count = bucket["count"]
+    summary = {
+        "sample_size": count,
+        "success_rate": bucket["successes"] / count * 100 if count else 0.0,
+        "quality_issue_rate": bucket["quality_issues"] / count * 100 if count else 0.0,
+    }
+    for name in ROLLUP_FIELDS:
+        field = bucket["fields"].get(name)
+        if not field or not field["moments"].count:
+            continue
+        moments = field["moments"]
+        summary[name] = {"count": moments.count, "mean": moments.mean, "std": math.sqrt(moments.variance)}
+        for p in percentiles:
+            summary[name][f"p{p}"] = field["digest"].quantile(p / 100)
+    return summary
+
+
+class RollupStore:
+    """일자별 롤업 파일 (YYYY-MM-DD.json) 과 로그 반영 위치 (state.json)"""
+
+    def __init__(self, rollup_dir: Path):
+        self.rollup_dir = Path(rollup_dir)
+        self.state_file = self.rollup_dir / "state.json"
+
+    def offset(self) -> int:
+        """메트릭 로그에서 롤업에 반영된 위치"""
+        try:
+            return json.loads(self.state_file.read_text(encoding="utf-8"))["offset"]
+        except (json.JSONDecodeError, FileNotFoundError, KeyError):
+            return 0
+
+    @contextmanager
+    def _locked(self):
+        # 여러 프로세스가 동시에 기록해도 같은 로그 구간을 두 번 반영하지 않음
+        self.rollup_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.rollup_dir / ".lock", "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def catch_up(self, log) -> int:
+        """로그에서 아직 반영하지 않은 메트릭을 롤업에 반영, 반영한 개수 반환"""
+        with self._locked():
+            metrics, offset = log.read_since(self.offset())
+            by_day: Dict[str, List] = {}
+            for metric in metrics:
+                timestamp = parse_timestamp(metric.get("timestamp"))
+                if timestamp is not None:
+                    by_day.setdefault(str(timestamp.date()), []).append((f"{timestamp.hour:02d}", metric))
+
+            for day, day_metrics in by_day.items():
+                rollup = self.load_day(day)
+                for hour, metric in day_metrics:
+                    add_metric(rollup["day"], metric)
+                    add_metric(rollup["hours"].setdefault(hour, new_bucket()), metric)
+                self._write(self.rollup_dir / f"{day}.json", {
+                    "day": _encode(rollup["day"]),
+                    "hours": {hour: _encode(bucket) for hour, bucket in sorted(rollup["hours"].items())},
+                })
+            self._write(self.state_file, {"offset": offset})
+            return len(metrics)
+
+    def load_day(self, day: str) -> Dict:
+        try:
+            data = json.loads((self.rollup_dir / f"{day}.json").read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, FileNotFoundError):
+            return {"day": new_bucket(), "hours": {}}
+        return {"day": _decode(data["day"]), "hours": {hour: _decode(b) for hour, b in data["hours"].items()}}
+
+    @staticmethod
+    def _write(path: Path, data: Dict):
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def period(self, start: datetime, end: datetime, log=None) -> Dict:
+        """[start, end) 구간 버킷
+
+        정시로 끊기는 부분은 롤업 (완전한 날은 일 버킷, 걸친 날은 시간 버킷) 을
+        쓴다. log 가 주어지면 먼저 롤업을 로그 끝까지 따라잡고, 정시에 걸치지
+        않는 처음/마지막 시간 조각과 그 사이 추가된 로그 끝부분은 원본으로 읽어
+        더한다.
+        """
+        start, end = parse_timestamp(start), parse_timestamp(end)
+        if log is not None:
+            self.catch_up(log)
+        total = new_bucket()
+        first_hour = _hour_floor(start)
+        if first_hour < start:
+            first_hour += timedelta(hours=1)
+        last_hour = _hour_floor(end)
+        if first_hour < last_hour:
+            raw_ranges = [(start, first_hour), (last_hour, end)]
+            self._merge_hours(total, first_hour, last_hour)
+        else:
+            raw_ranges = [(start, end)]
+
+        if log is not None:
+            rolled_up = self.offset()
+            for low, high in raw_ranges:
+                if low < high:
+                    for metric in log.between(low, high, rolled_up):
+                        add_metric(total, metric)
+            pending, _ = log.read_since(rolled_up)
+            for metric in pending:
+                timestamp = parse_timestamp(metric.get("timestamp"))
+                if timestamp is not None and start <= timestamp < end:
+                    add_metric(total, metric)
+        return total
+
+    def _merge_hours(self, total: Dict, start: datetime, end: datetime):
+        """정시 구간 [start, end) 의 롤업 버킷 합치기"""
+        day = start.replace(hour=0)
+        while day < end:
+            next_day = day + timedelta(days=1)
+            if not (self.rollup_dir / f"{day.date()}.json").exists():
+                day = next_day
+                continue
+            rollup = self.load_day(str(day.date()))
+            if start <= day and next_day <= end:
+                merge_bucket(total, rollup["day"])
+            else:
+                for hour, bucket in rollup["hours"].items():
+                    if start <= day + timedelta(hours=int(hour)) < end:
+                        merge_bucket(total, bucket)
+            day = next_day
+
+    def summarize(self, start: datetime, end: datetime, log=None,
+                  percentiles: Iterable[int] = (50, 95, 99)) -> Dict:
+        return summarize_bucket(self.period(start, end, log), percentiles)
+
+
+def default_rollup_dir(log_file: Path) -> Path:
+    """context_metrics.ndjson -> context_metrics.rollups/"""
+    return Path(log_file).with_suffix(".rollups")
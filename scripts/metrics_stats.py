@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+A/B 테스트 통계 검정
+
+Welch t-검정 (완료 시간), 두 비율 z-검정 (성공률), 평균 차이의 부트스트랩
+신뢰구간을 제공한다. 검정은 표준 라이브러리만 사용하고, 부트스트랩은 NumPy 가
+있으면 리샘플을 행렬 단위로 한 번에 만든다.
+
+그룹 통계(GroupAccumulator)는 세션을 한 번만 순회하며 Welford 방식(Moments)
+으로 완료 시간 평균/분산과 성공·일관성·중복 작업 수를 함께 센다.
+"""
+import math
+import random
+from statistics import NormalDist
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+DEFAULT_CONFIDENCE = 0.95
+
+# 부트스트랩 리샘플 수와 한 번에 만드는 리샘플 행 수
+BOOTSTRAP_ITERATIONS = 2000
+BOOTSTRAP_BATCH = 500
+
+# 서로 다른 값이 이 이하이면 다항 표본으로, 넘으면 인덱스 리샘플로 부트스트랩
+BOOTSTRAP_MAX_SUPPORT = 512
+
+# 인덱스 리샘플 배치 행렬의 최대 원소 수 (메모리 상한)
+BOOTSTRAP_BATCH_CELLS = 1 << 22
+
+# NumPy 가 없을 때는 원본을 직접 리샘플하므로 반복 수를 줄임
+STDLIB_BOOTSTRAP_ITERATIONS = 200
+
+
+def _numpy():
+    """NumPy 가 설치되어 있으면 모듈, 아니면 None"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def mean_variance(values: Iterable[float]):
+    """(개수, 평균, 표본분산)"""
+    values = [float(value) for value in values]
+    n = len(values)
+    if n == 0:
+        return 0, 0.0, 0.0
+    mean = math.fsum(values) / n
+    variance = math.fsum((value - mean) ** 2 for value in values) / (n - 1) if n > 1 else 0.0
+    return n, mean, variance
+
+
+def format_group_stats(total: int, completed: int, mean: float, variance: float,
+                       successes: int, consistent: int, duplicate_work: int) -> Dict:
+    """그룹 통계 출력 형식 (A/B 프레임워크, 대시보드, 누적 집계 공통)"""
+    if not completed:
+        return {"error": "No completed sessions"}
+    return {
+        "total_sessions": total,
+        "completed_sessions": completed,
+        "avg_completion_time": mean,
+        "std_completion_time": math.sqrt(max(variance, 0.0)),
+        "success_rate": successes / completed * 100,
+        "consistency_rate": consistent / completed * 100,
+        "duplicate_work_rate": duplicate_work / completed * 100,
+    }
+
+
+class Moments:
+    """개수/평균/편차 제곱합의 Welford 누적 (빼기, Chan 병렬 합치기 지원)
+
+    합과 제곱합으로 분산을 구하면 평균이 표준편차보다 훨씬 클 때 (예: 평균 1e6,
+    표준편차 5) 자릿수 상쇄로 정밀도를 잃으므로 모든 누적 통계가 이것을 쓴다.
+    """
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def remove(self, value: float):
+        """add 한 값 하나 빼기 (Welford 역산)"""
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        mean = (self.count * self.mean - value) / (self.count - 1)
+        self.m2 = max(self.m2 - (value - mean) * (value - self.mean), 0.0)
+        self.mean = mean
+        self.count -= 1
+
+    def merge(self, other: "Moments"):
+        """다른 누적값 합치기 (Chan 병렬 분산 공식)"""
+        count = self.count + other.count
+        if other.count:
+            delta = other.mean - self.mean
+            self.m2 += other.m2 + delta * delta * self.count * other.count / count
+            self.mean += delta * other.count / count
+        self.count = count
+
+    @property
+    def variance(self) -> float:
+        """표본분산"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {"count": self.count, "mean": self.mean, "m2": self.m2}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Moments":
+        return cls(data["count"], data["mean"], data["m2"])
+
+
+class GroupAccumulator:
+    """세션 그룹 통계를 한 번의 순회로 계산 (완료 시간은 Welford 평균/분산)
+
+    세션을 빼는 remove 도 있어 세션이 바뀔 때 이전 기여분을 빼고 새 기여분을
+    더하는 누적 집계 (ab_aggregates.SessionAggregates) 에도 쓴다.
+    """
+
+    __slots__ = ("total", "times", "successes", "consistent", "duplicate_work")
+
+    def __init__(self):
+        self.total = self.successes = self.consistent = self.duplicate_work = 0
+        self.times = Moments()
+
+    def add(self, session: Dict, sign: int = 1):
+        """세션 기여분 반영 (sign=-1 이면 제거)"""
+        self.total += sign
+        completion_time = session.get("completion_time_minutes")
+        if completion_time is None:
+            return
+        if sign > 0:
+            self.times.add(completion_time)
+        else:
+            self.times.remove(completion_time)
+        if session.get("success_achieved"):
+            self.successes += sign
+        if session.get("consistency_maintained"):
+            self.consistent += sign
+        if session.get("duplicate_work_detected"):
+            self.duplicate_work += sign
+
+    def remove(self, session: Dict):
+        self.add(session, sign=-1)
+
+    def merge(self, other: "GroupAccumulator"):
+        """다른 누적값 합치기 (완료 시간은 Chan 병렬 분산 공식)"""
+        self.times.merge(other.times)
+        for name in ("total", "successes", "consistent", "duplicate_work"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    @property
+    def completed(self) -> int:
+        return self.times.count
+
+    @property
+    def mean(self) -> float:
+        return self.times.mean
+
+    @property
+    def variance(self) -> float:
+        return self.times.variance
+
+    def mean_variance(self) -> Tuple[int, float, float]:
+        """(완료 수, 평균, 표본분산): welch_t_test_from_stats 입력"""
+        return self.completed, self.mean, self.variance
+
+    def stats(self) -> Dict:
+        return format_group_stats(self.total, self.completed, self.mean, self.variance,
+                                  self.successes, self.consistent, self.duplicate_work)
+
+
+def group_stats(sessions: Iterable[Dict]) -> Dict:
+    """세션 목록의 그룹 통계"""
+    accumulator = GroupAccumulator()
+    for session in sessions:
+        accumulator.add(session)
+    return accumulator.stats()
+
+
+def group_accumulators(sessions: Iterable[Dict], key: str = "group") -> Dict[str, GroupAccumulator]:
+    """세션을 한 번 순회해 key 값(기본: 그룹)별 누적값 계산"""
+    groups: Dict[str, GroupAccumulator] = {}
+    for session in sessions:
+        name = session.get(key, "unknown")
+        accumulator = groups.get(name)
+        if accumulator is None:
+            accumulator = groups[name] = GroupAccumulator()
+        accumulator.add(session)
+    return groups
+
+
+def _beta_continued_fraction(a: float, b: float, x: float) -> float:
+    """불완전 베타 함수의 연분수 전개 (Lentz 방법)"""
+    tiny = 1e-300
+    c = 1.0
+    d = 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    result = d
+    for m in range(1, 300):
+        for numerator in (
+            m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+            -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1)),
+        ):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            result *= d * c
+        if abs(d * c - 1.0) < 1e-14:
+            break
+    return result
+
+
+def regularized_beta(a: float, b: float, x: float) -> float:
+    """정규화 불완전 베타 함수 I_x(a, b)"""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    log_front = math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x)
+    if x < (a + 1) / (a + b + 2):
+        return math.exp(log_front) * _beta_continued_fraction(a, b, x) / a
+    return 1.0 - math.exp(log_front) * _beta_continued_fraction(b, a, 1 - x) / b
+
+
+def t_two_sided_p(t: float, df: float) -> float:
+    """자유도 df 인 t 분포의 양측 p-value"""
+    if math.isinf(t):
+        return 0.0
+    return regularized_beta(df / 2, 0.5, df / (df + t * t))
+
+
+def t_critical(df: float, confidence: float = DEFAULT_CONFIDENCE) -> float:
+    """양측 신뢰구간용 t 임계값 (이분법)"""
+    alpha = 1 - confidence
+    low, high = 0.0, 1.0
+    while t_two_sided_p(high, df) > alpha:
+        high *= 2
+    for _ in range(100):
+        middle = (low + high) / 2
+        if t_two_sided_p(middle, df) > alpha:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+
+def welch_t_test_from_stats(n1: int, mean1: float, var1: float, n2: int, mean2: float, var2: float,
+                            confidence: float = DEFAULT_CONFIDENCE) -> Dict:
+    """요약 통계로 Welch t-검정 (difference = 2번 그룹 - 1번 그룹)"""
+    if n1 < 2 or n2 < 2:
+        return {"error": "Need at least 2 samples per group"}
+    difference = mean2 - mean1
+    se_squared = var1 / n1 + var2 / n2
+    if se_squared == 0:
+        return {
+            "statistic": 0.0 if difference == 0 else math.copysign(math.inf, difference),
+            "df": n1 + n2 - 2,
+            "p_value": 1.0 if difference == 0 else 0.0,
+            "difference": difference,
+            "ci_low": difference,
+            "ci_high": difference,
+        }
+    se = math.sqrt(se_squared)
+    df = se_squared ** 2 / ((var1 / n1) ** 2 / (n1 - 1) + (var2 / n2) ** 2 / (n2 - 1))
+    t = difference / se
+    margin = t_critical(df, confidence) * se
+    return {
+        "statistic": t,
+        "df": df,
+        "p_value": t_two_sided_p(t, df),
+        "difference": difference,
+        "ci_low": difference - margin,
+        "ci_high": difference + margin,
+    }
+
+
+def welch_t_test(group1: Iterable[float], group2: Iterable[float],
+                 confidence: float = DEFAULT_CONFIDENCE) -> Dict:
+    """두 그룹 평균 차이의 Welch t-검정 (분산이 달라도 됨)"""
+    return welch_t_test_from_stats(*mean_variance(group1), *mean_variance(group2), confidence=confidence)
+
+
+def two_proportion_z_test(successes1: int, n1: int, successes2: int, n2: int,
+                          confidence: float = DEFAULT_CONFIDENCE) -> Dict:
+    """두 비율 차이의 z-검정 (검정은 합동 비율, 신뢰구간은 개별 비율 사용)"""
+    if n1 == 0 or n2 == 0:
+        return {"error": "Need at least 1 sample per group"}
+    p1, p2 = successes1 / n1, successes2 / n2
+    difference = p2 - p1
+    pooled = (successes1 + successes2) / (n1 + n2)
+    pooled_se = math.sqrt(pooled * (1 - pooled) * (1 / n1 + 1 / n2))
+    if pooled_se == 0:
+        z, p_value = 0.0, 1.0
+    else:
+        z = difference / pooled_se
+        p_value = 2 * NormalDist().cdf(-abs(z))
+    margin = NormalDist().inv_cdf(1 - (1 - confidence) / 2) * math.sqrt(p1 * (1 - p1) / n1 + p2 * (1 - p2) / n2)
+    return {
+        "statistic": z,
+        "p_value": p_value,
+        "difference": difference,
+        "ci_low": difference - margin,
+        "ci_high": difference + margin,
+    }
+
+
+def _bootstrap_means(values, iterations: int, rng, np):
+    """리샘플 평균 iterations 개를 배치 행렬 단위로 계산
+
+    서로 다른 값이 적으면 (성공 여부, 분 단위 시간 등) 크기 n 의 리샘플은 값
+    종류별 출현 횟수(다항분포)로 정확히 정해지므로 (배치 x 값 종류) 다항 표본
+    행렬의 가중 합으로 평균을 구한다. 연속값처럼 종류가 많으면 (배치 x n) 인덱스
+    행렬로 원본을 직접 리샘플한다.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    support, counts = np.unique(values, return_counts=True)
+    means = np.empty(iterations)
+    if len(support) <= BOOTSTRAP_MAX_SUPPORT:
+        probabilities = counts / n
+        for start in range(0, iterations, BOOTSTRAP_BATCH):
+            size = min(BOOTSTRAP_BATCH, iterations - start)
+            means[start:start + size] = rng.multinomial(n, probabilities, size=size) @ support / n
+        return means
+
+    rows = max(1, min(BOOTSTRAP_BATCH, BOOTSTRAP_BATCH_CELLS // n))
+    for start in range(0, iterations, rows):
+        size = min(rows, iterations - start)
+        means[start:start + size] = values[rng.integers(0, n, size=(size, n))].sum(axis=1) / n
+    return means
+
+
+def bootstrap_mean_difference(group1: Sequence[float], group2: Sequence[float],
+                              iterations: int = BOOTSTRAP_ITERATIONS,
+                              confidence: float = DEFAULT_CONFIDENCE,
+                              seed: Optional[int] = None) -> Dict:
+    """평균 차이 (2번 그룹 - 1번 그룹) 의 퍼센타일 부트스트랩 신뢰구간
+
+    성공 여부처럼 0/1 값이면 성공률 차이의 신뢰구간이 된다.
+    """
+    if not group1 or not group2:
+        return {"error": "Need at least 1 sample per group"}
+    alpha = 1 - confidence
+    np = _numpy()
+    if np is None:
+        return _bootstrap_mean_difference_stdlib(group1, group2, confidence, seed)
+
+    rng = np.random.default_rng(seed)
+    differences = _bootstrap_means(group2, iterations, rng, np) - _bootstrap_means(group1, iterations, rng, np)
+    ci_low, ci_high = np.quantile(differences, [alpha / 2, 1 - alpha / 2])
+    return {
+        "difference": float(np.mean(group2) - np.mean(group1)),
+        "ci_low": float(ci_low),
+        "ci_high": float(ci_high),
+        "iterations": iterations,
+    }
+
+
+def _bootstrap_mean_difference_stdlib(group1: Sequence[float], group2: Sequence[float],
+                                      confidence: float, seed: Optional[int]) -> Dict:
+    rng = random.Random(seed)
+    group1, group2 = [float(value) for value in group1], [float(value) for value in group2]
+    differences = sorted(
+        math.fsum(rng.choices(group2, k=len(group2))) / len(group2)
+        - math.fsum(rng.choices(group1, k=len(group1))) / len(group1)
+        for _ in range(STDLIB_BOOTSTRAP_ITERATIONS)
+    )
+    alpha = 1 - confidence
+    last = len(differences) - 1
+    return {
+        "difference": math.fsum(group2) / len(group2) - math.fsum(group1) / len(group1),
+        "ci_low": differences[int(alpha / 2 * last)],
+        "ci_high": differences[math.ceil((1 - alpha / 2) * last)],
+        "iterations": STDLIB_BOOTSTRAP_ITERATIONS,
+    }
@@ -1,38 +1,240 @@
 #!/usr/bin/env python3
 """
 컨텍스트 관리 성능 대시보드
+
+리포트 경로는 표준 라이브러리만 사용한다. NumPy/matplotlib 같은 무거운
+라이브러리는 필요한 코드 경로 안에서만 import 한다.
 """
+import bisect
 import json
-import matplotlib.pyplot as plt
-import pandas as pd
+import math
+from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
+from statistics import fmean
 from typing import Dict, List, Optional
-import numpy as np
+
+try:
+    from .ab_session_store import SessionStore
+    from .change_point import MetricChangeDetector
+    from .dashboard_charts import ChartRenderer
+    from .metrics_log import MetricsLog
+    from .metrics_rollup import metric_values
+    from .metrics_stats import GroupAccumulator, group_accumulators, two_proportion_z_test, welch_t_test_from_stats
+    from .quantile_sketch import SketchStore, merge_sketch_files
+except ImportError:
+    from ab_session_store import SessionStore
+    from change_point import MetricChangeDetector
+    from dashboard_charts import ChartRenderer
+    from metrics_log import MetricsLog
+    from metrics_rollup import metric_values
+    from metrics_stats import GroupAccumulator, group_accumulators, two_proportion_z_test, welch_t_test_from_stats
+    from quantile_sketch import SketchStore, merge_sketch_files
+
+# 성능 분석에 사용하는 최근 메트릭 수
+RECENT_WINDOW = 20
+
+# EWMA 평활 계수 (클수록 최근 값 비중이 큼)
+EWMA_ALPHA = 0.3
+
+# 응답 시간 분포를 보여줄 구간과 분위수
+LATENCY_HORIZONS = {"1h": timedelta(hours=1), "24h": timedelta(days=1), "7d": timedelta(days=7)}
+PERCENTILES = (50, 95, 99)
+
+# 롤업으로 요약하는 장기 구간
+LONG_HORIZONS = {"7d": timedelta(days=7), "30d": timedelta(days=30), "90d": timedelta(days=90)}
+
+# 이 개수 이상이면 NumPy 벡터 연산으로 분석 (설치되어 있을 때)
+VECTORIZE_MIN_SAMPLES = 1000
+
+# 리포트에 표시할 최근 변화 지점 수
+RECENT_CHANGE_POINTS = 5
+
+# 트렌드/분포 차트에 쓰는 최근 메트릭 수
+CHART_POINTS = 500
+
+# 메트릭 구조화 배열 필드 (값이 없으면 NaN)
+METRIC_FIELDS = [
+    ("timestamp", "f8"),
+    ("token_before", "f8"),
+    ("token_after", "f8"),
+    ("response_time", "f8"),
+    ("success", "?"),
+    ("context_miss", "?"),
+    ("duplicate_work", "?"),
+    ("consistency_violation", "?"),
+]
+
+
+def _numpy():
+    """NumPy 가 설치되어 있으면 모듈, 아니면 None (필요한 경로에서만 호출)"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _number(value) -> float:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else math.nan
+
+
+def _epoch(value) -> float:
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def metrics_to_array(metrics: List[Dict], np):
+    """메트릭 dict 목록을 구조화 배열로 한 번에 변환"""
+    rows = [
+        (
+            _epoch(m.get("timestamp")),
+            _number(m.get("token_count_before")),
+            _number(m.get("token_count_after")),
+            _number(m.get("response_time_ms")),
+            bool(m.get("first_attempt_success")),
+            bool(m.get("context_miss_detected")),
+            bool(m.get("duplicate_work_detected")),
+            bool(m.get("consistency_violation")),
+        )
+        for m in metrics
+    ]
+    return np.array(rows, dtype=METRIC_FIELDS)
+
+
+class RollingQuantiles:
+    """슬라이딩 윈도우의 정확한 분위수
+
+    값을 정렬 리스트로 유지하므로 분위수 조회는 인덱스 계산 한 번이고,
+    추가/만료는 이진 탐색으로 처리한다. 윈도우는 시간(max_age 초),
+    개수(max_count) 또는 둘 다로 제한할 수 있다.
+    """
+    
+    def __init__(self, max_age: Optional[float] = None, max_count: Optional[int] = None):
+        self.max_age = max_age
+        self.max_count = max_count
+        self._arrivals = deque()  # (timestamp, value) 도착 순
+        self._sorted: List[float] = []
+    
+    def __len__(self) -> int:
+        return len(self._sorted)
+    
+    def add(self, timestamp: float, value: float):
+        self._arrivals.append((timestamp, value))
+        bisect.insort(self._sorted, value)
+        if self.max_count is not None and len(self._arrivals) > self.max_count:
+            self._drop_oldest()
+        self.evict(timestamp)
+    
+    def evict(self, now: float):
+        """max_age 보다 오래된 값 제거"""
+        if self.max_age is None:
+            return
+        while self._arrivals and self._arrivals[0][0] < now - self.max_age:
+            self._drop_oldest()
+    
+    def _drop_oldest(self):
+        _, value = self._arrivals.popleft()
+        del self._sorted[bisect.bisect_left(self._sorted, value)]
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """선형 보간 분위수 (q: 0~1), 비어 있으면 None"""
+        if not self._sorted:
+            return None
+        position = q * (len(self._sorted) - 1)
+        lower = math.floor(position)
+        upper = min(lower + 1, len(self._sorted) - 1)
+        return self._sorted[lower] + (self._sorted[upper] - self._sorted[lower]) * (position - lower)
+
+
+def _ewma(values: List[float], alpha: float = EWMA_ALPHA) -> float:
+    """지수가중이동평균의 마지막 값 (첫 값에서 시작)"""
+    if not values:
+        return 0
+    smoothed = values[0]
+    for value in values[1:]:
+        smoothed = alpha * value + (1 - alpha) * smoothed
+    return smoothed
+
+
+def _ewma_array(values, np, alpha: float = EWMA_ALPHA) -> float:
+    """_ewma 의 벡터 버전: 가중치 (1-α)^(n-1-i) 의 닫힌 형태"""
+    if not values.size:
+        return 0
+    weights = alpha * (1 - alpha) ** np.arange(values.size - 1, -1, -1, dtype=float)
+    weights[0] = (1 - alpha) ** (values.size - 1)
+    return float((weights * values).sum())
+
+
+def _mean(values: List[float]) -> float:
+    return fmean(values) if values else 0
+
+
+def _slope(values: List[float]) -> float:
+    """최소제곱 직선의 기울기 (x = 0, 1, 2, ...)"""
+    n = len(values)
+    x_mean = (n - 1) / 2
+    y_mean = fmean(values)
+    numerator = sum((x - x_mean) * (y - y_mean) for x, y in enumerate(values))
+    denominator = sum((x - x_mean) ** 2 for x in range(n))
+    return numerator / denominator if denominator else 0.0
 
 class PerformanceDashboard:
     """성능 대시보드 클래스"""
     
     def __init__(self, 
                  metrics_file: str = "docs/CURRENT/context_metrics.json",
-                 ab_test_file: str = "docs/CURRENT/ab_test_results.json"):
+                 ab_test_file: str = "docs/CURRENT/ab_test_results.json",
+                 window: Optional[int] = RECENT_WINDOW,
+                 window_seconds: Optional[float] = None,
+                 horizons: Optional[Dict[str, timedelta]] = None):
         self.metrics_file = Path(metrics_file)
+        # 분석 윈도우: 최근 window 개, window_seconds 가 있으면 그 시간 안의 메트릭
+        self.window = window
+        self.window_seconds = window_seconds
+        self.horizons = horizons or LATENCY_HORIZONS
+        self.metrics_log = MetricsLog(self.metrics_file.with_suffix(".ndjson"))
+        self.rollups = self.metrics_log.rollups
+        # 메트릭별·일자별 t-digest (다른 머신의 스케치와 병합 가능)
+        self.sketch_file = self.metrics_file.with_suffix(".sketches.json")
         self.ab_test_file = Path(ab_test_file)
+        self.ab_store = SessionStore(str(self.ab_test_file))
+        # analyze_history() 용 전체 메트릭 배열과 로그에서 읽은 위치
+        self._history = None
+        self._history_offset = 0
+        # detect_changes() 용 CUSUM 상태와 로그에서 읽은 위치
+        self._change_detector = MetricChangeDetector()
+        self._change_offset = 0
         
-    def generate_report(self, output_file: str = "docs/CURRENT/performance_report.md") -> Dict:
-        """종합 성능 리포트 생성"""
+    def generate_report(self, output_file: str = "docs/CURRENT/performance_report.md", charts: bool = False) -> Dict:
+        """종합 성능 리포트 생성 (charts=True 이면 리포트 옆 charts/ 에 차트도 그림)"""
         
         # 데이터 로드
         performance_data = self._load_performance_data()
         ab_test_data = self._load_ab_test_data()
         
         # 분석 수행
-        performance_analysis = self._analyze_performance(performance_data)
+        performance_analysis = self._analyze_performance(performance_data, self.window)
+        performance_analysis["latency"] = self._latency_distributions()
+        performance_analysis["change_points"] = self.detect_changes()[-RECENT_CHANGE_POINTS:]
+        performance_analysis["long_term"] = {
+            name: self.summarize_period(datetime.now() - horizon) for name, horizon in LONG_HORIZONS.items()
+        }
         ab_test_analysis = self._analyze_ab_test(ab_test_data)
         recommendations = self._generate_recommendations(performance_analysis, ab_test_analysis)
         
+        # 차트 렌더링 (데이터가 바뀐 차트만)
+        chart_result = None
+        if charts:
+            renderer = ChartRenderer(Path(output_file).parent / "charts")
+            chart_result = renderer.render(self._chart_inputs(ab_test_analysis))
+        
         # 리포트 생성
         report = self._generate_markdown_report(performance_analysis, ab_test_analysis, recommendations)
+        if chart_result:
+            report += self._format_charts(chart_result["rendered"] + chart_result["unchanged"])
         
         # 파일 저장
         with open(output_file, 'w', encoding='utf-8') as f:
@@ -42,36 +244,144 @@ class PerformanceDashboard:
             "performance_score": performance_analysis.get("overall_score", 0),
             "ab_test_winner": ab_test_analysis.get("winner", "inconclusive"),
             "recommendation": recommendations.get("primary_action", "continue_monitoring"),
-            "report_file": output_file
+            "report_file": output_file,
+            "charts": chart_result
         }
     
-    def _load_performance_data(self) -> Dict:
-        """성능 데이터 로드"""
+    def _chart_inputs(self, ab_test: Dict) -> Dict[str, Dict]:
+        """차트별 입력 데이터 (이 데이터의 해시로 다시 그릴지 결정)"""
+        if self.metrics_log.exists():
+            metrics = self.metrics_log.tail(CHART_POINTS)
+        else:
+            metrics = self._load_legacy_metrics()[-CHART_POINTS:]
+        
+        success_ewma = []
+        token_improvement = []
+        response_times = []
+        smoothed = None
+        for metric in metrics:
+            success = 100.0 if metric.get("first_attempt_success") else 0.0
+            smoothed = success if smoothed is None else EWMA_ALPHA * success + (1 - EWMA_ALPHA) * smoothed
+            success_ewma.append(smoothed)
+            values = metric_values(metric)
+            token_improvement.append(values.get("token_improvement", math.nan))
+            if "response_time_ms" in values:
+                response_times.append(values["response_time_ms"])
+        
+        charts = {}
+        if metrics:
+            charts["trend"] = {
+                "kind": "trend",
+                "data": {"success_ewma": success_ewma, "token_improvement": token_improvement},
+            }
+        if response_times:
+            charts["distribution"] = {"kind": "distribution", "data": {"response_times": response_times}}
+        if "control_stats" in ab_test and "error" not in ab_test["control_stats"] \
+                and "error" not in ab_test["treatment_stats"]:
+            charts["ab_comparison"] = {
+                "kind": "ab_comparison",
+                "data": {
+                    group: {key: ab_test[f"{group}_stats"][key] for key in ("success_rate", "avg_completion_time")}
+                    for group in ("control", "treatment")
+                },
+            }
+        return charts
+    
+    def _load_performance_data(self) -> List[Dict]:
+        """성능 데이터 로드 (NDJSON 로그 끝에서 윈도우 만큼만 읽음)"""
+        if self.window_seconds is not None:
+            metrics = self._load_since(datetime.now() - timedelta(seconds=self.window_seconds))
+            return metrics[-self.window:] if self.window else metrics
+        if self.metrics_log.exists():
+            return self.metrics_log.tail(self.window) if self.window else list(self.metrics_log)
+        metrics = self._load_legacy_metrics()
+        return metrics[-self.window:] if self.window else metrics
+    
+    def _load_legacy_metrics(self) -> List[Dict]:
+        """로그 도입 전의 context_metrics.json(dict) 호환"""
         if not self.metrics_file.exists():
-            return {}
+            return []
         try:
             with open(self.metrics_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                return list(json.load(f).values())
         except (json.JSONDecodeError, FileNotFoundError):
-            return {}
+            return []
+    
+    def _load_since(self, cutoff: datetime) -> List[Dict]:
+        """cutoff 이후 메트릭 (시간순)"""
+        if self.metrics_log.exists():
+            return self.metrics_log.since(cutoff)
+        return [m for m in self._load_legacy_metrics() if _epoch(m.get("timestamp")) >= cutoff.timestamp()]
+    
+    def _latency_distributions(self, now: Optional[datetime] = None) -> Dict[str, Dict]:
+        """구간별 응답 시간 분포 (p50/p95/p99) 를 한 번의 순회로 계산"""
+        now = now or datetime.now()
+        longest = max(self.horizons.values())
+        windows = {
+            name: RollingQuantiles(max_age=horizon.total_seconds())
+            for name, horizon in self.horizons.items()
+        }
+        for metric in self._load_since(now - longest):
+            response_time = metric.get("response_time_ms")
+            if not response_time:
+                continue
+            timestamp = _epoch(metric.get("timestamp"))
+            for window in windows.values():
+                window.add(timestamp, response_time)
+        
+        distributions = {}
+        for name, window in windows.items():
+            window.evict(now.timestamp())
+            distributions[name] = {"count": len(window)}
+            for p in PERCENTILES:
+                distributions[name][f"p{p}"] = window.quantile(p / 100)
+        return distributions
+    
+    def summarize_period(self, start: datetime, end: Optional[datetime] = None) -> Dict:
+        """[start, end) 요약: 롤업 버킷 + 롤업에 아직 반영되지 않은 로그 끝부분만 원본으로"""
+        end = end or datetime.now()
+        return self.rollups.summarize(start, end, self.metrics_log, PERCENTILES)
+    
+    def detect_changes(self) -> List[Dict]:
+        """전체 메트릭 이력의 변화 지점 (새로 추가된 메트릭만 CUSUM 에 반영)"""
+        if self.metrics_log.exists():
+            metrics, self._change_offset = self.metrics_log.read_since(self._change_offset)
+        else:
+            # 로그 도입 전 JSON 은 이어 읽을 수 없으므로 매번 처음부터
+            self._change_detector = MetricChangeDetector()
+            metrics = self._load_legacy_metrics()
+        for metric in metrics:
+            self._change_detector.add(metric)
+        return self._change_detector.changes
+    
+    def update_sketches(self) -> SketchStore:
+        """지난번 이후 로그에 추가된 메트릭만 일자별 스케치에 반영"""
+        store = SketchStore(self.sketch_file)
+        metrics, offset = self.metrics_log.read_since(store.offset)
+        for metric in metrics:
+            day = str(metric.get("timestamp", ""))[:10]
+            for name, value in metric_values(metric).items():
+                store.add(name, day, value)
+        if offset != store.offset:
+            store.offset = offset
+            store.save()
+        return store
     
     def _load_ab_test_data(self) -> Dict:
-        """A/B 테스트 데이터 로드"""
-        if not self.ab_test_file.exists():
-            return {}
-        try:
-            with open(self.ab_test_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {}
+        """A/B 테스트 데이터 로드 (스냅샷 + 이벤트 로그)"""
+        return self.ab_store.sessions()
     
-    def _analyze_performance(self, data: Dict) -> Dict:
-        """성능 데이터 분석"""
+    def _analyze_performance(self, data: List[Dict], window: Optional[int] = RECENT_WINDOW) -> Dict:
+        """성능 데이터 분석 (window=None 이면 전체)"""
         if not data:
             return {"error": "No performance data available"}
         
         # 최근 메트릭 계산
-        recent_metrics = list(data.values())[-20:]  # 최근 20개
+        recent_metrics = data[-window:] if window else data
+        if len(recent_metrics) >= VECTORIZE_MIN_SAMPLES:
+            np = _numpy()
+            if np is not None:
+                return self._analyze_array(metrics_to_array(recent_metrics, np), np)
         
         # 효율성 메트릭
         token_improvements = []
@@ -79,12 +389,12 @@ class PerformanceDashboard:
         success_rates = []
         
         for metric in recent_metrics:
-            if metric.get('token_count_before') and metric.get('token_count_after'):
-                improvement = (metric['token_count_before'] - metric['token_count_after']) / metric['token_count_before'] * 100
-                token_improvements.append(improvement)
+            values = metric_values(metric)
+            if "token_improvement" in values:
+                token_improvements.append(values["token_improvement"])
             
-            if metric.get('response_time_ms'):
-                response_times.append(metric['response_time_ms'])
+            if "response_time_ms" in values:
+                response_times.append(values["response_time_ms"])
             
             success_rates.append(1.0 if metric.get('first_attempt_success') else 0.0)
         
@@ -98,27 +408,106 @@ class PerformanceDashboard:
         
         return {
             "sample_size": len(recent_metrics),
-            "avg_token_improvement": np.mean(token_improvements) if token_improvements else 0,
-            "avg_response_time": np.mean(response_times) if response_times else 0,
-            "success_rate": np.mean(success_rates) * 100,
+            "avg_token_improvement": _mean(token_improvements),
+            "avg_response_time": _mean(response_times),
+            "success_rate": _mean(success_rates) * 100,
             "quality_issue_rate": len(quality_issues) / len(recent_metrics) * 100,
             "overall_score": self._calculate_overall_score(token_improvements, success_rates, quality_issues, recent_metrics),
+            "ewma_response_time": _ewma(response_times),
+            "ewma_success_rate": _ewma(success_rates) * 100,
             "trend": self._analyze_trend(recent_metrics)
         }
     
+    def analyze_history(self, window: Optional[int] = None) -> Dict:
+        """전체 (또는 최근 window 개) 메트릭 이력 분석
+
+        로그는 처음 한 번 구조화 배열로 읽고, 이후 호출에서는 새로 추가된
+        줄만 이어 붙인다. NumPy 가 없으면 표준 라이브러리 경로로 분석한다.
+        """
+        np = _numpy()
+        if np is None:
+            metrics = list(self.metrics_log) if self.metrics_log.exists() else self._load_performance_data()
+            return self._analyze_performance(metrics, window)
+        
+        if self.metrics_log.exists():
+            new_metrics, self._history_offset = self.metrics_log.read_since(self._history_offset)
+        elif self._history is None and self.metrics_file.exists():
+            try:
+                with open(self.metrics_file, 'r', encoding='utf-8') as f:
+                    new_metrics = list(json.load(f).values())
+            except (json.JSONDecodeError, FileNotFoundError):
+                new_metrics = []
+        else:
+            new_metrics = []
+        
+        if self._history is None:
+            self._history = metrics_to_array(new_metrics, np)
+        elif new_metrics:
+            self._history = np.concatenate([self._history, metrics_to_array(new_metrics, np)])
+        
+        history = self._history[-window:] if window else self._history
+        if not len(history):
+            return {"error": "No performance data available"}
+        return self._analyze_array(history, np)
+    
+    def _analyze_array(self, metrics, np) -> Dict:
+        """구조화 배열 기반 벡터 분석 (_analyze_performance 와 같은 결과)"""
+        before, after = metrics["token_before"], metrics["token_after"]
+        has_tokens = ~np.isnan(before) & (before != 0) & ~np.isnan(after) & (after != 0)
+        token_improvements = (before[has_tokens] - after[has_tokens]) / before[has_tokens] * 100
+        
+        response_times = metrics["response_time"]
+        response_times = response_times[~np.isnan(response_times) & (response_times != 0)]
+        
+        success = metrics["success"]
+        quality_issue = metrics["context_miss"] | metrics["duplicate_work"] | metrics["consistency_violation"]
+        
+        sample_size = len(metrics)
+        avg_token_improvement = float(token_improvements.mean()) if token_improvements.size else 0
+        success_rate = float(success.mean()) * 100
+        quality_issue_rate = float(quality_issue.mean()) * 100
+        reliability_score = max(0, 100 - quality_issue_rate)
+        
+        return {
+            "sample_size": sample_size,
+            "avg_token_improvement": avg_token_improvement,
+            "avg_response_time": float(response_times.mean()) if response_times.size else 0,
+            "success_rate": success_rate,
+            "quality_issue_rate": quality_issue_rate,
+            "overall_score": avg_token_improvement * 0.3 + success_rate * 0.5 + reliability_score * 0.2,
+            "ewma_response_time": _ewma_array(response_times, np),
+            "ewma_success_rate": _ewma_array(success.astype(float), np) * 100,
+            "trend": self._analyze_trend_array(metrics[-10:], np) if sample_size >= 10 else "insufficient_data"
+        }
+    
+    def _analyze_trend_array(self, metrics, np) -> str:
+        """_analyze_trend 의 벡터 버전"""
+        scores = 50.0 * metrics["success"] + 25.0 * ~metrics["context_miss"] + 25.0 * ~metrics["duplicate_work"]
+        x = np.arange(len(scores)) - (len(scores) - 1) / 2
+        slope = float((x * (scores - scores.mean())).sum() / (x * x).sum())
+        
+        if slope > 2:
+            return "improving"
+        elif slope < -2:
+            return "declining"
+        else:
+            return "stable"
+    
     def _analyze_ab_test(self, data: Dict) -> Dict:
         """A/B 테스트 분석"""
         if not data:
             return {"error": "No A/B test data available"}
         
-        control_sessions = [s for s in data.values() if s["group"] == "control"]
-        treatment_sessions = [s for s in data.values() if s["group"] == "treatment"]
+        # 세션을 한 번만 순회해 그룹별 통계를 함께 계산
+        groups = group_accumulators(data.values())
+        control = groups.get("control", GroupAccumulator())
+        treatment = groups.get("treatment", GroupAccumulator())
         
-        if len(control_sessions) < 5 or len(treatment_sessions) < 5:
+        if control.total < 5 or treatment.total < 5 or not control.completed or not treatment.completed:
             return {"error": "Insufficient data for A/B analysis"}
         
-        control_stats = self._calculate_group_stats(control_sessions)
-        treatment_stats = self._calculate_group_stats(treatment_sessions)
+        control_stats = self._calculate_group_stats(control)
+        treatment_stats = self._calculate_group_stats(treatment)
         
         # 승자 결정
         winner = "inconclusive"
@@ -132,7 +521,7 @@ class PerformanceDashboard:
             "control_stats": control_stats,
             "treatment_stats": treatment_stats,
             "winner": winner,
-            "confidence": self._calculate_confidence(control_sessions, treatment_sessions)
+            "significance": self._significance_tests(control, treatment)
         }
     
     def _generate_recommendations(self, performance: Dict, ab_test: Dict) -> Dict:
@@ -175,8 +564,8 @@ class PerformanceDashboard:
             return 0
         
         # 가중치 기반 점수 계산
-        efficiency_score = np.mean(token_improvements) if token_improvements else 0
-        quality_score = np.mean(success_rates) * 100
+        efficiency_score = _mean(token_improvements)
+        quality_score = _mean(success_rates) * 100
         reliability_score = max(0, 100 - (len(quality_issues) / len(all_metrics) * 100))
         
         return (efficiency_score * 0.3 + quality_score * 0.5 + reliability_score * 0.2)
@@ -199,8 +588,7 @@ class PerformanceDashboard:
             recent_scores.append(score)
         
         # 선형 회귀로 트렌드 계산
-        x = np.arange(len(recent_scores))
-        slope = np.polyfit(x, recent_scores, 1)[0]
+        slope = _slope(recent_scores)
         
         if slope > 2:
             return "improving"
@@ -209,34 +597,24 @@ class PerformanceDashboard:
         else:
             return "stable"
     
-    def _calculate_group_stats(self, sessions: List[Dict]) -> Dict:
+    def _calculate_group_stats(self, group: GroupAccumulator) -> Dict:
         """그룹 통계 계산"""
-        completed = [s for s in sessions if s.get("completion_time_minutes") is not None]
-        
-        if not completed:
-            return {"error": "No completed sessions"}
-        
-        return {
-            "total_sessions": len(sessions),
-            "completed_sessions": len(completed),
-            "success_rate": sum(1 for s in completed if s.get("success_achieved")) / len(completed) * 100,
-            "avg_completion_time": sum(s["completion_time_minutes"] for s in completed) / len(completed),
-            "consistency_rate": sum(1 for s in completed if s.get("consistency_maintained")) / len(completed) * 100
-        }
+        return group.stats()
     
-    def _calculate_confidence(self, control: List[Dict], treatment: List[Dict]) -> float:
-        """신뢰도 계산 (간단한 버전)"""
-        control_size = len([s for s in control if s.get("completion_time_minutes")])
-        treatment_size = len([s for s in treatment if s.get("completion_time_minutes")])
-        
-        if control_size >= 30 and treatment_size >= 30:
-            return 0.95
-        elif control_size >= 15 and treatment_size >= 15:
-            return 0.80
-        elif control_size >= 10 and treatment_size >= 10:
-            return 0.65
-        else:
-            return 0.50
+    def _significance_tests(self, control: GroupAccumulator, treatment: GroupAccumulator) -> Dict:
+        """성공률 z-검정과 완료 시간 Welch t-검정 (차이는 treatment - control)
+
+        adjusted_p_value 는 두 검정 중 작은 p-value 의 Bonferroni 보정값이다.
+        """
+        tests = {
+            "success_rate": two_proportion_z_test(
+                control.successes, control.completed, treatment.successes, treatment.completed,
+            ),
+            "completion_time": welch_t_test_from_stats(*control.mean_variance(), *treatment.mean_variance()),
+        }
+        p_values = [test["p_value"] for test in tests.values() if "p_value" in test]
+        tests["adjusted_p_value"] = min(1.0, len(p_values) * min(p_values)) if p_values else None
+        return tests
     
     def _generate_markdown_report(self, performance: Dict, ab_test: Dict, recommendations: Dict) -> str:
         """마크다운 리포트 생성"""
@@ -253,6 +631,17 @@ class PerformanceDashboard:
 - **토큰 효율성**: {performance.get('avg_token_improvement', 0):.1f}% 개선
 - **품질 이슈율**: {performance.get('quality_issue_rate', 0):.1f}%
 - **트렌드**: {performance.get('trend', 'unknown')}
+- **EWMA 성공률**: {performance.get('ewma_success_rate', 0):.1f}%
+- **EWMA 응답 시간**: {performance.get('ewma_response_time', 0):.0f}ms
+
+### 응답 시간 분포
+{self._format_latency(performance.get('latency', {}))}
+
+### 변화 지점
+{self._format_change_points(performance.get('change_points', []))}
+
+### 장기 추세
+{self._format_long_term(performance.get('long_term', {}))}
 
 ## 🧪 A/B 테스트 결과
 
@@ -264,7 +653,8 @@ class PerformanceDashboard:
 #### Treatment Group (새 방식)  
 {self._format_group_stats(ab_test.get('treatment_stats', {}))}
 
-### 신뢰도: {ab_test.get('confidence', 0):.0%}
+### 유의성 검정 (treatment - control, 95% 신뢰구간)
+{self._format_significance(ab_test.get('significance', {}))}
 
 ## 💡 추천사항
 
@@ -292,6 +682,62 @@ class PerformanceDashboard:
         
         return report
     
+    def _format_latency(self, latency: Dict[str, Dict]) -> str:
+        """구간별 응답 시간 분위수 표"""
+        rows = [
+            "| 구간 | 샘플 | " + " | ".join(f"p{p}" for p in PERCENTILES) + " |",
+            "|------|------|" + "|".join("------" for _ in PERCENTILES) + "|",
+        ]
+        for name, stats in latency.items():
+            values = [
+                f"{stats[f'p{p}']:.0f}ms" if stats[f"p{p}"] is not None else "-"
+                for p in PERCENTILES
+            ]
+            rows.append(f"| {name} | {stats['count']} | " + " | ".join(values) + " |")
+        return "\n".join(rows)
+    
+    def _format_charts(self, names: List[str]) -> str:
+        """리포트 끝에 붙이는 차트 섹션 (리포트 기준 상대 경로)"""
+        if not names:
+            return ""
+        lines = ["", "## 📉 차트", ""]
+        for name in sorted(names):
+            lines.append(f"![{name}](charts/{name}.svg)")
+        return "\n".join(lines) + "\n"
+    
+    def _format_long_term(self, long_term: Dict[str, Dict]) -> str:
+        """롤업 기반 장기 구간 요약 표"""
+        rows = [
+            "| 구간 | 샘플 | 성공률 | 토큰 효율성 | 평균 응답 시간 | p95 응답 시간 |",
+            "|------|------|--------|-------------|----------------|---------------|",
+        ]
+        for name, summary in long_term.items():
+            tokens = summary.get("token_improvement", {})
+            latency = summary.get("response_time_ms", {})
+            rows.append(
+                f"| {name} | {summary['sample_size']} | {summary['success_rate']:.1f}% | "
+                + (f"{tokens['mean']:.1f}%" if tokens else "-") + " | "
+                + (f"{latency['mean']:.0f}ms | {latency['p95']:.0f}ms" if latency else "- | -") + " |"
+            )
+        return "\n".join(rows)
+    
+    def _format_change_points(self, changes: List[Dict]) -> str:
+        """최근 변화 지점 목록"""
+        if not changes:
+            return "- 탐지된 변화 없음"
+        labels = {"token_improvement": "토큰 효율성", "first_attempt_success": "첫 시도 성공률"}
+        scale = {"first_attempt_success": 100}
+        lines = []
+        for change in changes:
+            factor = scale.get(change["metric"], 1)
+            lines.append(
+                f"- {change['timestamp'] or change['index']}: {labels.get(change['metric'], change['metric'])} "
+                f"{'상승' if change['direction'] == 'increase' else '하락'} "
+                f"({change['before_mean'] * factor:.1f} → {change['after_mean'] * factor:.1f}, "
+                f"{change['detected_index'] - change['index'] + 1}개 세션 후 탐지)"
+            )
+        return "\n".join(lines)
+    
     def _format_group_stats(self, stats: Dict) -> str:
         """그룹 통계 포맷팅"""
         if not stats or "error" in stats:
@@ -301,16 +747,84 @@ class PerformanceDashboard:
 - 성공률: {stats.get('success_rate', 0):.1f}%  
 - 평균 완료 시간: {stats.get('avg_completion_time', 0):.1f}분
 - 일관성 유지율: {stats.get('consistency_rate', 0):.1f}%"""
+    
+    def _format_significance(self, significance: Dict) -> str:
+        """검정별 차이, 신뢰구간, p-value"""
+        lines = []
+        for name, label, scale, unit in (("success_rate", "성공률", 100, "%p"), ("completion_time", "완료 시간", 1, "분")):
+            test = significance.get(name, {})
+            if "p_value" not in test:
+                continue
+            lines.append(
+                f"- {label}: {test['difference'] * scale:+.1f}{unit} "
+                f"[{test['ci_low'] * scale:+.1f}, {test['ci_high'] * scale:+.1f}], p={test['p_value']:.4f}"
+            )
+        if not lines:
+            return "- 데이터 부족"
+        if significance.get("adjusted_p_value") is not None:
+            lines.append(f"- 보정 p-value (Bonferroni): {significance['adjusted_p_value']:.4f}")
+        return "\n".join(lines)
 
 def main():
     """메인 실행"""
+    import sys
+    
     dashboard = PerformanceDashboard()
-    result = dashboard.generate_report()
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "history":
+        window = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        print(json.dumps(dashboard.analyze_history(window), indent=2, ensure_ascii=False))
+        return
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        try:
+            from .dashboard_server import serve
+        except ImportError:
+            from dashboard_server import serve
+        serve(dashboard, port=int(sys.argv[2]) if len(sys.argv) > 2 else 8765)
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "rollup":
+        days = float(sys.argv[2]) if len(sys.argv) > 2 else 30
+        summary = dashboard.summarize_period(datetime.now() - timedelta(days=days))
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+        return
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "changes":
+        print(json.dumps(dashboard.detect_changes(), indent=2, ensure_ascii=False))
+        return
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "sketches":
+        print(json.dumps(dashboard.update_sketches().percentiles(PERCENTILES), indent=2, ensure_ascii=False))
+        return
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "merge-sketches":
+        args = sys.argv[2:]
+        output = None
+        if "--output" in args:
+            position = args.index("--output")
+            output = args[position + 1]
+            del args[position:position + 2]
+        if not args:
+            print("Usage: python performance_dashboard.py merge-sketches <sketches.json>... [--output <merged.json>]")
+            return
+        merged = merge_sketch_files(args)
+        if output:
+            merged.save(output)
+        print(json.dumps(merged.percentiles(PERCENTILES), indent=2, ensure_ascii=False))
+        return
+    
+    result = dashboard.generate_report(charts=True)
     
     print(f"성능 리포트 생성 완료: {result['report_file']}")
     print(f"전체 점수: {result['performance_score']:.1f}")
     print(f"A/B 테스트 승자: {result['ab_test_winner']}")
     print(f"권장 액션: {result['recommendation']}")
+    charts = result["charts"]
+    if charts["skipped"]:
+        print("matplotlib 이 없어 차트를 생략했습니다")
+    else:
+        print(f"차트: {len(charts['rendered'])}개 렌더링, {len(charts['unchanged'])}개 변경 없음")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,13 +4,263 @@ PRD Decomposer - Automatically extract specs from PRD documents
 Addresses the docs/specs vs docs/CURRENT separation issue
 """
 
+import bisect
+import hashlib
+import mmap
 import os
 import re
+import select
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple, Union
 import json
 
+try:
+    from .spec_search import SpecSearchIndex
+    from .spec_traceability import TraceabilityIndex
+except ImportError:
+    from spec_search import SpecSearchIndex
+    from spec_traceability import TraceabilityIndex
+
+
+# PRDs at least this large are mapped into memory instead of read
+MMAP_THRESHOLD = 1 << 20
+
+CLASS_PATTERN = re.compile(rb'class\s+(\w+):')
+MODULE_PATTERN = re.compile(rb'(\w+)\.py')
+
+PRD_PATTERN = re.compile(r'PRD-v\d+.*\.md$')
+SPEC_SECTIONS = ("requirements", "architecture")
+SHARD_SEPARATOR = "\n\n---\n\n"
+
+# Placeholder NFRs used when a PRD has no metrics section; never traced to tests
+DEFAULT_NFRS = [
+    "- Performance targets defined in PRD",
+    "- Quality metrics specified in test cases",
+    "- Compatibility requirements as per version strategy",
+]
+REQUIREMENT_LINE = re.compile(r'^\s*(?:[-*+]|\d+\.)\s+\S')
+
+
+@dataclass
+class Heading:
+    """A line containing a ``##`` marker, with byte offsets into the PRD"""
+    level: int
+    title: bytes  # lowercased line text
+    start: int
+    end: int
+    parent: Optional[int] = None
+
+
+class PRDDocument:
+    """PRD content parsed once into a heading tree with byte offsets
+
+    Every line containing ``##`` is indexed, which mirrors the
+    ``##.*marker`` patterns the decomposer has always matched against.
+    Marker lookups are memoized, so repeated section extraction from the
+    same document never rescans the content.
+    """
+
+    def __init__(self, data: Union[bytes, mmap.mmap]):
+        self.data = data
+        self.headings = self._scan(data)
+        self._matches: Dict[bytes, List[int]] = {}
+
+    @classmethod
+    def from_text(cls, text: str) -> "PRDDocument":
+        return cls(text.encode("utf-8"))
+
+    @classmethod
+    def open(cls, path: Path) -> "PRDDocument":
+        """Open a PRD file, mapping it into memory when it is large"""
+        if path.stat().st_size >= MMAP_THRESHOLD:
+            with open(path, "rb") as f:
+                return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        return cls(path.read_bytes())
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def __enter__(self) -> "PRDDocument":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def _scan(data) -> List[Heading]:
+        """Index every ``##`` line in a single forward pass"""
+        headings: List[Heading] = []
+        stack: List[int] = []
+        pos = data.find(b"##")
+        while pos != -1:
+            start = data.rfind(b"\n", 0, pos) + 1
+            end = data.find(b"\n", pos)
+            if end == -1:
+                end = len(data)
+            line = data[start:end]
+            level = len(line) - len(line.lstrip(b"#"))
+            parent = None
+            if level:
+                while stack and headings[stack[-1]].level >= level:
+                    stack.pop()
+                parent = stack[-1] if stack else None
+                stack.append(len(headings))
+            headings.append(Heading(level, line.lower(), start, end, parent))
+            pos = data.find(b"##", end)
+        return headings
+
+    def _matching(self, marker: bytes) -> List[int]:
+        """Indices of headings matching ``##.*marker``, memoized per marker"""
+        if marker not in self._matches:
+            self._matches[marker] = [
+                i for i, heading in enumerate(self.headings)
+                if marker in heading.title[heading.title.find(b"##") + 2:]
+            ]
+        return self._matches[marker]
+
+    def outline(self) -> List[Tuple[int, str]]:
+        """(level, title) pairs for the real markdown headings"""
+        return [
+            (heading.level, self.data[heading.start:heading.end].decode("utf-8").lstrip("#").strip())
+            for heading in self.headings if heading.level
+        ]
+
+    def extract(self, start_marker: str, end_marker: str) -> Optional[str]:
+        """Extract content between two section markers"""
+        start_key = start_marker.lower().encode("utf-8")
+        end_key = end_marker.lower().encode("utf-8")
+
+        starts = self._matching(start_key)
+        if not starts:
+            return None
+
+        index = starts[0]
+        heading = self.headings[index]
+        marker_at = heading.title.find(b"##")
+        start_pos = heading.start + heading.title.rfind(start_key, marker_at + 2) + len(start_key)
+
+        # The end marker may still appear on the remainder of the start line
+        rest = heading.title[start_pos - heading.start:]
+        rest_marker = rest.find(b"##")
+        if rest_marker != -1 and end_key in rest[rest_marker + 2:]:
+            end_pos = start_pos + rest_marker
+        else:
+            ends = self._matching(end_key)
+            next_end = bisect.bisect_right(ends, index)
+            if next_end < len(ends):
+                end_heading = self.headings[ends[next_end]]
+                end_pos = end_heading.start + end_heading.title.find(b"##")
+            else:
+                end_pos = len(self.data)
+
+        return self.data[start_pos:end_pos].decode("utf-8").strip()
+
+    def findall(self, pattern: "re.Pattern") -> List[str]:
+        return [match.decode("utf-8") for match in pattern.findall(self.data)]
+
+
+class PollingWatcher:
+    """Detect PRD changes by comparing (size, mtime) snapshots"""
+
+    def __init__(self, directory: Path, interval: float = 0.5):
+        self.directory = Path(directory)
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for entry in os.scandir(self.directory):
+            if PRD_PATTERN.match(entry.name):
+                stat = entry.stat()
+                snapshot[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def changes(self, timeout: float) -> Set[str]:
+        """Names of PRDs created, modified or deleted within ``timeout``"""
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {
+                name for name in current.keys() | self._snapshot.keys()
+                if current.get(name) != self._snapshot.get(name)
+            }
+            self._snapshot = current
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Detect PRD changes with Linux inotify (via libc, no dependencies)"""
+
+    # inotify event masks from <sys/inotify.h>
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_DELETE = 0x200
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, directory: Path):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_FROM | self.IN_MOVED_TO | self.IN_DELETE
+        if libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+
+    def changes(self, timeout: float) -> Set[str]:
+        """Names of PRDs created, modified or deleted within ``timeout``"""
+        changed: Set[str] = set()
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return changed
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(buffer):
+            _, _, _, name_length = self.EVENT_HEADER.unpack_from(buffer, offset)
+            offset += self.EVENT_HEADER.size
+            name = os.fsdecode(buffer[offset:offset + name_length].rstrip(b"\0"))
+            offset += name_length
+            if PRD_PATTERN.match(name):
+                changed.add(name)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def make_watcher(directory: Path, poll_interval: float = 0.5):
+    """inotify where available, stat polling everywhere else"""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError, TypeError):
+            pass
+    return PollingWatcher(directory, poll_interval)
+
+
+PRDContent = Union[str, PRDDocument]
+
 
 class PRDDecomposer:
     """Automatically decompose PRD into architecture and requirements specs"""
@@ -19,24 +269,35 @@ class PRDDecomposer:
         self.base_path = Path(base_path)
         self.specs_dir = self.base_path / "docs" / "specs"
         self.current_dir = self.base_path / "docs" / "CURRENT"
+        self.shards_dir = self.specs_dir / "versions"
+        self.index_file = self.shards_dir / "index.json"
+        self.search_index_file = self.shards_dir / "search_index.json"
+        self.traceability_file = self.shards_dir / "traceability.json"
+        self.tests_dir = self.base_path / "tests"
         self.prd_files = []
+        self._search_index: Optional[SpecSearchIndex] = None
+        self._traceability: Optional[TraceabilityIndex] = None
+        # State kept between runs of a long-lived decomposer (watch mode)
+        self._index: Optional[Dict[str, Dict]] = None
+        self._shards: Dict[str, Tuple[str, bytes]] = {}
+        self.generated_at: Optional[str] = None  # pinned per run for reproducible output
         
     def find_prd_files(self) -> List[Path]:
         """Find all PRD files in docs/specs/"""
-        prd_pattern = re.compile(r'PRD-v\d+.*\.md$')
         prd_files = []
         
         for file_path in self.specs_dir.glob("*.md"):
-            if prd_pattern.match(file_path.name):
+            if PRD_PATTERN.match(file_path.name):
                 prd_files.append(file_path)
                 
         return sorted(prd_files)
     
-    def extract_requirements(self, prd_content: str, version: str) -> str:
+    def extract_requirements(self, prd_content: PRDContent, version: str) -> str:
         """Extract requirements from PRD content"""
+        prd_content = self._document(prd_content)
         requirements = [
             f"# Requirements Specification (Extracted from {version})",
-            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Generated: {self._generated()}",
             "",
             "## Functional Requirements",
             ""
@@ -61,11 +322,7 @@ class PRDDecomposer:
         if nfr_section:
             requirements.extend(nfr_section.split('\n'))
         else:
-            requirements.extend([
-                "- Performance targets defined in PRD",
-                "- Quality metrics specified in test cases",
-                "- Compatibility requirements as per version strategy"
-            ])
+            requirements.extend(DEFAULT_NFRS)
             
         requirements.extend([
             "",
@@ -80,11 +337,12 @@ class PRDDecomposer:
         
         return "\n".join(requirements)
     
-    def extract_architecture(self, prd_content: str, version: str) -> str:
+    def extract_architecture(self, prd_content: PRDContent, version: str) -> str:
         """Extract architecture from PRD content"""
+        prd_content = self._document(prd_content)
         architecture = [
             f"# Architecture Specification (Extracted from {version})",
-            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Generated: {self._generated()}",
             "",
             "## System Overview",
             ""
@@ -128,44 +386,37 @@ class PRDDecomposer:
         
         return "\n".join(architecture)
     
-    def _extract_section(self, content: str, start_marker: str, end_marker: str) -> Optional[str]:
+    def _generated(self) -> str:
+        return self.generated_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    def _document(self, content: PRDContent) -> PRDDocument:
+        """Parse raw PRD text once; already parsed documents pass through"""
+        if isinstance(content, PRDDocument):
+            return content
+        return PRDDocument.from_text(content)
+    
+    def _extract_section(self, content: PRDContent, start_marker: str, end_marker: str) -> Optional[str]:
         """Extract content between two section markers"""
-        start_pattern = rf"##.*{start_marker}"
-        end_pattern = rf"##.*{end_marker}"
-        
-        start_match = re.search(start_pattern, content, re.IGNORECASE)
-        if not start_match:
-            return None
-            
-        start_pos = start_match.end()
-        end_match = re.search(end_pattern, content[start_pos:], re.IGNORECASE)
-        
-        if end_match:
-            end_pos = start_pos + end_match.start()
-            return content[start_pos:end_pos].strip()
-        else:
-            return content[start_pos:].strip()
+        return self._document(content).extract(start_marker, end_marker)
     
-    def _extract_components(self, content: str) -> List[str]:
+    def _extract_components(self, content: PRDContent) -> List[str]:
         """Extract component information from PRD"""
         components = []
+        document = self._document(content)
         
         # Look for class definitions, modules, or architectural elements
-        class_pattern = r'class\s+(\w+):'
-        module_pattern = r'(\w+)\.py'
-        
-        classes = re.findall(class_pattern, content)
-        modules = re.findall(module_pattern, content)
+        classes = document.findall(CLASS_PATTERN)
+        modules = document.findall(MODULE_PATTERN)
         
         if classes:
             components.append("### Core Classes")
-            for cls in set(classes):
+            for cls in dict.fromkeys(classes):
                 components.append(f"- **{cls}**: Core component for system functionality")
             components.append("")
             
         if modules:
             components.append("### Modules")
-            for module in set(modules):
+            for module in dict.fromkeys(modules):
                 components.append(f"- **{module}.py**: Implementation module")
             components.append("")
                 
@@ -201,8 +452,17 @@ class PRDDecomposer:
         
         return specs_rules.exists()
     
-    def decompose_all_prds(self) -> Dict[str, bool]:
-        """Decompose all PRD files into specs"""
+    def decompose_all_prds(self, jobs: int = 1) -> Dict[str, bool]:
+        """Decompose all PRD files into specs
+
+        Each PRD gets its own shard under ``docs/specs/versions/``, listed
+        in ``index.json`` with its content hash and section offsets. Only
+        PRDs whose hash changed are re-extracted, and the consolidated
+        ``requirements.md``/``architecture.md`` are regenerated from the
+        shards only when something changed. With ``jobs > 1`` extraction
+        runs in worker processes and this process writes the results, so
+        the output is identical to a serial run.
+        """
         results = {}
         prd_files = self.find_prd_files()
         
@@ -213,57 +473,343 @@ class PRDDecomposer:
         print(f"Found {len(prd_files)} PRD files to decompose...")
         
         # Ensure specs directory exists
-        self.specs_dir.mkdir(parents=True, exist_ok=True)
+        self.shards_dir.mkdir(parents=True, exist_ok=True)
         
-        # Process each PRD
+        index = self._index if self._index is not None else self.load_index()
+        index_dirty = False
+        
+        # Find PRDs whose content changed since the last run
+        changed = {}
         for prd_file in prd_files:
             try:
-                print(f"Processing {prd_file.name}...")
-                
-                # Read PRD content
-                prd_content = prd_file.read_text()
-                version = self._extract_version(prd_file.name)
-                
-                # Extract requirements
-                requirements_content = self.extract_requirements(prd_content, version)
-                requirements_file = self.specs_dir / "requirements.md"
+                key = self._shard_key(prd_file.name)
+                stat = prd_file.stat()
+                entry = index.get(key)
+                if entry and not (self.specs_dir / entry["file"]).exists():
+                    entry = None
+                if entry and (entry["size"], entry["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+                    results[prd_file.name] = True
+                    continue
                 
-                # Extract architecture  
-                architecture_content = self.extract_architecture(prd_content, version)
-                architecture_file = self.specs_dir / "architecture.md"
+                digest = self._hash_file(prd_file)
+                if entry and entry["sha256"] == digest:
+                    entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                    index_dirty = True
+                    results[prd_file.name] = True
+                    continue
                 
-                # Write files (append to existing or create new)
-                self._append_or_create(requirements_file, requirements_content, version)
-                self._append_or_create(architecture_file, architecture_content, version)
-                
-                results[prd_file.name] = True
-                print(f"  ✅ Decomposed {version}")
-                
-            except Exception as e:
+                changed[prd_file] = {
+                    "version": self._extract_version(prd_file.name),
+                    "prd": prd_file.name,
+                    "file": f"{self.shards_dir.name}/{key}.md",
+                    "sha256": digest,
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                }
+            except OSError as e:
                 print(f"  ❌ Error processing {prd_file.name}: {e}")
                 results[prd_file.name] = False
         
+        extracted = self._extract_all(list(changed), jobs)
+        
+        # Single writer: store extracted shards in version order
+        shards_changed = False
+        reindex = []
+        for prd_file in sorted(changed, key=lambda path: self._version_key(path.name)):
+            print(f"Processing {prd_file.name}...")
+            outcome = extracted[prd_file]
+            if isinstance(outcome, Exception):
+                print(f"  ❌ Error processing {prd_file.name}: {outcome}")
+                results[prd_file.name] = False
+                continue
+            
+            key = self._shard_key(prd_file.name)
+            entry = changed[prd_file]
+            self._write_shard(key, entry, outcome)
+            index[key] = entry
+            reindex.append(key)
+            index_dirty = shards_changed = True
+            
+            results[prd_file.name] = True
+            print(f"  ✅ Decomposed {entry['version']}")
+        
+        # Drop shards of PRDs that no longer exist
+        current = {self._shard_key(prd_file.name) for prd_file in prd_files}
+        removed = sorted(set(index) - current)
+        for key in removed:
+            (self.specs_dir / index.pop(key)["file"]).unlink(missing_ok=True)
+            self._shards.pop(key, None)
+            index_dirty = shards_changed = True
+        
+        if reindex or removed or not self.search_index_file.exists():
+            self._update_search_index(index, reindex, removed)
+        if reindex or removed or not self.traceability_file.exists():
+            self._update_traceability(index, reindex, removed)
+        
+        requirements_file = self.specs_dir / "requirements.md"
+        architecture_file = self.specs_dir / "architecture.md"
+        if shards_changed or not (requirements_file.exists() and architecture_file.exists()):
+            self._write_consolidated(index)
+        if index_dirty:
+            self._save_index(index)
+        self._index = index
+        
         # Move project_rules.md
         rules_moved = self.move_project_rules()
         results["project_rules.md"] = rules_moved
         
         return results
     
+    def watch(self, jobs: int = 1, debounce: float = 0.3, poll_interval: float = 0.5,
+              stop: Optional[threading.Event] = None, watcher=None):
+        """Re-decompose changed PRDs as they are saved
+
+        Bursts of saves are collapsed: after the first change we wait until
+        ``debounce`` seconds pass without another one. The shard index,
+        shard contents and search index stay in memory between runs, so
+        each cycle only stats the PRDs and re-extracts the changed ones.
+        """
+        stop = stop or threading.Event()
+        self.decompose_all_prds(jobs=jobs)
+        watcher = watcher or make_watcher(self.specs_dir, poll_interval)
+        print(f"👀 Watching {self.specs_dir} ({type(watcher).__name__})")
+        try:
+            while not stop.is_set():
+                pending = watcher.changes(poll_interval)
+                if not pending:
+                    continue
+                while True:
+                    more = watcher.changes(debounce)
+                    if not more:
+                        break
+                    pending |= more
+                print(f"🔄 Changed: {', '.join(sorted(pending))}")
+                self.decompose_all_prds(jobs=jobs)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
+    
+    def extract_prd(self, prd_file: Path) -> Tuple[str, str]:
+        """Extract (requirements, architecture) for one PRD file"""
+        version = self._extract_version(prd_file.name)
+        # Parse PRD once; both extractors share the heading index
+        with PRDDocument.open(prd_file) as prd_content:
+            return (
+                self.extract_requirements(prd_content, version),
+                self.extract_architecture(prd_content, version),
+            )
+    
+    def _extract_all(self, prd_files: List[Path], jobs: int) -> Dict[Path, Union[Tuple[str, str], Exception]]:
+        """Extract many PRDs, in worker processes when ``jobs > 1``"""
+        extracted: Dict[Path, Union[Tuple[str, str], Exception]] = {}
+        generated_at = self._generated()  # one timestamp for the whole run
+        if jobs <= 1 or len(prd_files) <= 1:
+            pinned, self.generated_at = self.generated_at, generated_at
+            try:
+                for prd_file in prd_files:
+                    try:
+                        extracted[prd_file] = self.extract_prd(prd_file)
+                    except Exception as e:
+                        extracted[prd_file] = e
+            finally:
+                self.generated_at = pinned
+            return extracted
+        
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {
+                prd_file: executor.submit(_extract_prd_worker, str(self.base_path), prd_file, generated_at)
+                for prd_file in prd_files
+            }
+            for prd_file, future in futures.items():
+                try:
+                    extracted[prd_file] = future.result()
+                except Exception as e:
+                    extracted[prd_file] = e
+        return extracted
+    
     def _extract_version(self, filename: str) -> str:
         """Extract version from PRD filename"""
         match = re.search(r'PRD-v(\d+(?:\.\d+)?)', filename)
         return f"v{match.group(1)}" if match else filename
     
-    def _append_or_create(self, file_path: Path, content: str, version: str):
-        """Append to existing file or create new one"""
-        if file_path.exists():
-            # Append new version
-            existing = file_path.read_text()
-            separator = f"\n\n---\n\n# {version} Addition\n\n"
-            file_path.write_text(existing + separator + content)
-        else:
-            # Create new file
-            file_path.write_text(content)
+    def _version_key(self, filename: str) -> Tuple:
+        """Sort key ordering PRD files by numeric version, then name"""
+        version = self._extract_version(filename).lstrip("v")
+        try:
+            return tuple(int(part) for part in version.split(".")), filename
+        except ValueError:
+            return (), filename
+    
+    @staticmethod
+    def _hash_file(file_path: Path) -> str:
+        """SHA-256 of a file's content"""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _shard_key(self, filename: str) -> str:
+        """Shard name for a PRD file, e.g. ``v24-true-tadd-enforcement``"""
+        return Path(filename).stem[len("PRD-"):]
+    
+    def load_index(self) -> Dict[str, Dict]:
+        """Load the shard index: key -> version, file, hash and section offsets"""
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                return json.load(f).get("shards", {})
+        except (json.JSONDecodeError, FileNotFoundError):
+            return {}
+    
+    def _save_index(self, index: Dict[str, Dict]):
+        self._write_atomic(self.index_file, json.dumps({"shards": index}, indent=2, sort_keys=True, ensure_ascii=False))
+    
+    def _write_shard(self, key: str, entry: Dict, contents: Tuple[str, str]):
+        """Write one PRD's specs and record each section's byte range"""
+        sections = {}
+        offset = 0
+        for name, content in zip(SPEC_SECTIONS, contents):
+            if offset:
+                offset += len(SHARD_SEPARATOR.encode("utf-8"))
+            size = len(content.encode("utf-8"))
+            sections[name] = [offset, offset + size]
+            offset += size
+        entry["sections"] = sections
+        data = (SHARD_SEPARATOR.join(contents) + "\n").encode("utf-8")
+        self._write_atomic(self.specs_dir / entry["file"], data)
+        self._shards[key] = (entry["sha256"], data)
+    
+    def _read_shard(self, key: str, entry: Dict) -> bytes:
+        """Shard content, served from memory when this decomposer wrote it"""
+        cached = self._shards.get(key)
+        if cached and cached[0] == entry["sha256"]:
+            return cached[1]
+        data = (self.specs_dir / entry["file"]).read_bytes()
+        self._shards[key] = (entry["sha256"], data)
+        return data
+    
+    def find_shards(self, version: str) -> List[str]:
+        """Shard keys for a version such as ``v29`` (several PRDs may share one)"""
+        version = version if version.startswith("v") else f"v{version}"
+        index = self.load_index()
+        return sorted(
+            (key for key, entry in index.items() if key == version or entry["version"] == version),
+            key=lambda key: self._version_key(index[key]["prd"]),
+        )
+    
+    def load_spec(self, key: str, section: str = "requirements", index: Optional[Dict[str, Dict]] = None) -> str:
+        """Read a single section of one shard without touching the others"""
+        entry = (index if index is not None else self.load_index())[key]
+        start, end = entry["sections"][section]
+        with open(self.specs_dir / entry["file"], "rb") as f:
+            f.seek(start)
+            return f.read(end - start).decode("utf-8")
+    
+    @property
+    def search_index(self) -> SpecSearchIndex:
+        """Inverted index over shard lines, loaded once per decomposer"""
+        if self._search_index is None:
+            self._search_index = SpecSearchIndex(self.search_index_file)
+        return self._search_index
+    
+    def _update_search_index(self, index: Dict[str, Dict], changed: List[str], removed: List[str]):
+        """Re-index changed shards; rebuild everything if the index is missing"""
+        search_index = self.search_index
+        if not search_index.exists():
+            changed = sorted(index)
+            search_index.dirty = True
+        for key in removed:
+            search_index.remove_shard(key)
+        for key in changed:
+            entry = index[key]
+            shard = self._read_shard(key, entry)
+            sections = {}
+            for section in SPEC_SECTIONS:
+                start, end = entry["sections"][section]
+                sections[section] = (shard.count(b"\n", 0, start) + 1, shard[start:end].decode("utf-8"))
+            search_index.update_shard(key, entry["version"], sections)
+        search_index.save()
+    
+    @property
+    def traceability(self) -> TraceabilityIndex:
+        """Requirement <-> test links, loaded once per decomposer"""
+        if self._traceability is None:
+            self._traceability = TraceabilityIndex(self.traceability_file)
+        return self._traceability
+    
+    def _requirement_lines(self, requirements: str, first_line: int) -> List[Tuple[int, str]]:
+        """List items of a requirements section, up to the generated constraints"""
+        lines = []
+        for offset, line in enumerate(requirements.split("\n")):
+            if line == "## Constraints":
+                break
+            if REQUIREMENT_LINE.match(line) and line not in DEFAULT_NFRS:
+                lines.append((first_line + offset, line.strip()))
+        return lines
+    
+    def _update_traceability(self, index: Dict[str, Dict], changed: List[str], removed: List[str]):
+        """Re-link requirements of changed shards; rebuild if the index is missing"""
+        traceability = self.traceability
+        if not traceability.exists():
+            changed = sorted(index)
+            traceability.dirty = True
+        for key in removed:
+            traceability.remove_requirements(key)
+        for key in changed:
+            entry = index[key]
+            shard = self._read_shard(key, entry)
+            start, end = entry["sections"]["requirements"]
+            requirements = shard[start:end].decode("utf-8")
+            traceability.update_requirements(
+                key, entry["version"], self._requirement_lines(requirements, shard.count(b"\n", 0, start) + 1)
+            )
+        traceability.save()
+    
+    def refresh_traceability(self) -> TraceabilityIndex:
+        """Bring test links up to date with tests/ before answering queries"""
+        traceability = self.traceability
+        if not traceability.exists():
+            self._update_traceability(self._index if self._index is not None else self.load_index(), [], [])
+        if self.tests_dir.exists():
+            traceability.refresh_tests(self.tests_dir, self.base_path)
+        traceability.save()
+        return traceability
+    
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """BM25-ranked spec lines matching a query, with their text"""
+        results = self.search_index.search(query, limit)
+        index = self.load_index()
+        lines: Dict[str, List[str]] = {}
+        for result in results:
+            key = result["shard"]
+            if key not in lines:
+                lines[key] = (self.specs_dir / index[key]["file"]).read_text(encoding="utf-8").split("\n")
+            result["file"] = index[key]["file"]
+            result["text"] = lines[key][result["line"] - 1].strip()
+        return results
+    
+    def _write_consolidated(self, index: Dict[str, Dict]):
+        """Regenerate requirements.md/architecture.md from the shards"""
+        blocks: Dict[str, List[str]] = {section: [] for section in SPEC_SECTIONS}
+        for key in sorted(index, key=lambda key: self._version_key(index[key]["prd"])):
+            entry = index[key]
+            shard = self._read_shard(key, entry)
+            for section in SPEC_SECTIONS:
+                start, end = entry["sections"][section]
+                content = shard[start:end].decode("utf-8")
+                blocks[section].append(f"<!-- prd:{entry['prd']} -->\n{content}\n<!-- /prd:{entry['prd']} -->")
+        for section in SPEC_SECTIONS:
+            self._write_atomic(self.specs_dir / f"{section}.md", "\n\n---\n\n".join(blocks[section]) + "\n")
+    
+    @staticmethod
+    def _write_atomic(file_path: Path, content: Union[str, bytes]):
+        """Replace a file in one step so readers never see partial output"""
+        tmp_path = file_path.with_name(f".{file_path.name}.tmp")
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, file_path)
     
     def generate_report(self, results: Dict[str, bool]) -> str:
         """Generate decomposition report"""
@@ -288,9 +834,13 @@ class PRDDecomposer:
         report.extend([
             "",
             "## Generated Files",
-            "- `docs/specs/requirements.md` - Consolidated requirements",
-            "- `docs/specs/architecture.md` - System architecture", 
+            "- `docs/specs/requirements.md` - Consolidated requirements (generated from shards)",
+            "- `docs/specs/architecture.md` - System architecture (generated from shards)",
             "- `docs/specs/project_rules.md` - Project guidelines (moved from root)",
+            "- `docs/specs/versions/*.md` - Per-PRD spec shards",
+            "- `docs/specs/versions/index.json` - Shard index (version, file, sections, hash)",
+            "- `docs/specs/versions/search_index.json` - BM25 inverted index over spec lines",
+            "- `docs/specs/versions/traceability.json` - Requirement <-> test links",
             "",
             "## Next Steps",
             "1. Review generated specs for accuracy",
@@ -302,13 +852,99 @@ class PRDDecomposer:
         return "\n".join(report)
 
 
+def _extract_prd_worker(base_path: str, prd_file: Path, generated_at: str) -> Tuple[str, str]:
+    """Process pool entry point for PRDDecomposer.extract_prd"""
+    decomposer = PRDDecomposer(base_path)
+    decomposer.generated_at = generated_at
+    return decomposer.extract_prd(prd_file)
+
+
+def show_spec(decomposer: PRDDecomposer, args: List[str]) -> bool:
+    """Print one version's spec section from its shard"""
+    if not args:
+        print("Usage: python prd_decomposer.py show <version> [requirements|architecture]")
+        return False
+    section = args[1] if len(args) > 1 else "requirements"
+    if section not in SPEC_SECTIONS:
+        print(f"Unknown section: {section}")
+        return False
+    keys = decomposer.find_shards(args[0])
+    if not keys:
+        print(f"No spec shard for {args[0]}")
+        return False
+    print("\n\n".join(decomposer.load_spec(key, section) for key in keys))
+    return True
+
+
+def search_specs(decomposer: PRDDecomposer, args: List[str]) -> bool:
+    """Print BM25-ranked spec lines for a query"""
+    limit = 10
+    if "--limit" in args:
+        position = args.index("--limit")
+        try:
+            limit = int(args[position + 1])
+        except (IndexError, ValueError):
+            args = []
+        else:
+            args = args[:position] + args[position + 2:]
+    if not args:
+        print("Usage: python prd_decomposer.py search <query> [--limit N]")
+        return False
+    results = decomposer.search(" ".join(args), limit)
+    if not results:
+        print("No matches")
+        return False
+    for result in results:
+        print(f"{result['score']:6.2f}  {result['version']:<6} {result['file']}:{result['line']}  {result['text']}")
+    return True
+
+
+def trace_specs(decomposer: PRDDecomposer, args: List[str]) -> bool:
+    """Query requirement <-> test traceability"""
+    usage = "Usage: python prd_decomposer.py trace [req <requirement>|test <test>|untested]"
+    if not args or args[0] not in ("req", "test", "untested") or (args[0] != "untested" and len(args) < 2):
+        print(usage)
+        return False
+    traceability = decomposer.refresh_traceability()
+    if args[0] == "untested":
+        print(traceability.untested_report())
+        return not traceability.untested()
+    linked = traceability.tests_for(args[1]) if args[0] == "req" else traceability.requirements_for(args[1])
+    if not linked:
+        print(f"No {'tests' if args[0] == 'req' else 'requirements'} linked to {args[1]}")
+        return False
+    for item in linked:
+        print(item)
+    return True
+
+
 def main():
     """Main execution"""
+    args = sys.argv[1:]
+    if args and args[0] == "show":
+        return show_spec(PRDDecomposer(), args[1:])
+    if args and args[0] == "search":
+        return search_specs(PRDDecomposer(), args[1:])
+    if args and args[0] == "trace":
+        return trace_specs(PRDDecomposer(), args[1:])
+    
+    jobs = 1
+    if "--jobs" in args:
+        try:
+            jobs = int(args[args.index("--jobs") + 1])
+        except (IndexError, ValueError):
+            print("Usage: python prd_decomposer.py [--jobs N] [--watch] | show <version> [section] | search <query> | trace ...")
+            return False
+    
     print("🔧 PRD Decomposer - Fixing docs/specs separation")
     print("=" * 50)
     
     decomposer = PRDDecomposer()
-    results = decomposer.decompose_all_prds()
+    if "--watch" in args:
+        decomposer.watch(jobs=jobs)
+        return True
+    
+    results = decomposer.decompose_all_prds(jobs=jobs)
     
     # Generate and save report
     report = decomposer.generate_report(results)
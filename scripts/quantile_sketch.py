@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+병합 가능한 분위수 스케치 (t-digest)
+
+여러 개발자 머신/CI 러너의 분위수는 평균으로 합칠 수 없다. 각 머신은 메트릭별,
+일자별 t-digest 만 저장하고, 원본 샘플 없이 스케치를 병합해 전체 분위수를 구한다.
+"""
+import json
+import math
+import os
+import socket
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 압축 계수: 클수록 정확하고 센트로이드가 많아짐 (대략 2 * compression 개 이하)
+DEFAULT_COMPRESSION = 100
+
+# 이만큼 값이 쌓이면 센트로이드로 압축
+BUFFER_FACTOR = 5
+
+
+class TDigest:
+    """Merging t-digest (Dunning) 구현"""
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.centroids: List[List[float]] = []  # [mean, weight], mean 오름차순
+        self._buffer: List[Tuple[float, float]] = []
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, weight: float = 1.0):
+        self._buffer.append((value, weight))
+        self.count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer) >= BUFFER_FACTOR * self.compression:
+            self._compress()
+
+    def merge(self, other: "TDigest"):
+        """다른 digest 를 이 digest 에 합침"""
+        other._compress()
+        self._buffer.extend((mean, weight) for mean, weight in other.centroids)
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def _scale(self, q: float) -> float:
+        """k1 스케일 함수: 양 끝 분위수일수록 센트로이드를 작게 유지"""
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        points = sorted(self.centroids + [list(point) for point in self._buffer])
+        self._buffer = []
+        total = sum(weight for _, weight in points)
+
+        merged = [list(points[0])]
+        cumulative = 0.0  # merged[-1] 이전까지의 누적 가중치
+        k_lower = self._scale(0.0)
+        for mean, weight in points[1:]:
+            current = merged[-1]
+            if self._scale((cumulative + current[1] + weight) / total) - k_lower <= 1:
+                current[0] += (mean - current[0]) * weight / (current[1] + weight)
+                current[1] += weight
+            else:
+                cumulative += current[1]
+                k_lower = self._scale(cumulative / total)
+                merged.append([mean, weight])
+        self.centroids = merged
+
+    def quantile(self, q: float) -> Optional[float]:
+        """q (0~1) 분위수 추정, 비어 있으면 None"""
+        self._compress()
+        if not self.centroids:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        if len(self.centroids) == 1:
+            return self.centroids[0][0]
+
+        index = q * self.count
+        first_mean, first_weight = self.centroids[0]
+        if index < first_weight / 2:
+            return self.min + (first_mean - self.min) * index / (first_weight / 2)
+
+        cumulative = first_weight / 2
+        for (mean, weight), (next_mean, next_weight) in zip(self.centroids, self.centroids[1:]):
+            step = (weight + next_weight) / 2
+            if cumulative + step > index:
+                return mean + (next_mean - mean) * (index - cumulative) / step
+            cumulative += step
+
+        last_mean, last_weight = self.centroids[-1]
+        fraction = min((index - cumulative) / (last_weight / 2), 1.0)
+        return last_mean + (self.max - last_mean) * fraction
+
+    def to_dict(self) -> Dict:
+        self._compress()
+        return {
+            "compression": self.compression,
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "centroids": self.centroids,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TDigest":
+        digest = cls(data.get("compression", DEFAULT_COMPRESSION))
+        digest.centroids = [list(centroid) for centroid in data.get("centroids", [])]
+        digest.count = data.get("count", sum(weight for _, weight in digest.centroids))
+        digest.min = data.get("min", math.inf)
+        digest.max = data.get("max", -math.inf)
+        return digest
+
+
+class SketchStore:
+    """메트릭별·일자별 t-digest 모음 (JSON 파일 하나)"""
+
+    def __init__(self, sketch_file: Path, source: Optional[str] = None):
+        self.sketch_file = Path(sketch_file)
+        self.source = source or socket.gethostname()
+        self.offset = 0  # 메트릭 로그에서 이미 반영한 위치
+        self.days: Dict[str, Dict[str, TDigest]] = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.sketch_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return
+        self.source = data.get("source", self.source)
+        self.offset = data.get("offset", 0)
+        self.days = {
+            day: {metric: TDigest.from_dict(digest) for metric, digest in metrics.items()}
+            for day, metrics in data.get("days", {}).items()
+        }
+
+    def save(self, path: Optional[Path] = None):
+        path = Path(path or self.sketch_file)
+        data = {
+            "source": self.source,
+            "offset": self.offset,
+            "days": {
+                day: {metric: digest.to_dict() for metric, digest in sorted(metrics.items())}
+                for day, metrics in sorted(self.days.items())
+            },
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def add(self, metric: str, day: str, value: float):
+        self.days.setdefault(day, {}).setdefault(metric, TDigest()).add(value)
+
+    def merge(self, other: "SketchStore"):
+        for day, metrics in other.days.items():
+            for metric, digest in metrics.items():
+                self.days.setdefault(day, {}).setdefault(metric, TDigest(digest.compression)).merge(digest)
+
+    def digest(self, metric: str, days: Optional[Iterable[str]] = None) -> TDigest:
+        """여러 일자의 digest 를 합친 digest"""
+        combined = TDigest()
+        for day in (days if days is not None else self.days):
+            digest = self.days.get(day, {}).get(metric)
+            if digest is not None:
+                combined.merge(digest)
+        return combined
+
+    def metrics(self) -> List[str]:
+        return sorted({metric for metrics in self.days.values() for metric in metrics})
+
+    def percentiles(self, percentiles: Iterable[int] = (50, 95, 99),
+                    days: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        """메트릭별 count 와 분위수"""
+        days = list(days) if days is not None else None
+        summary = {}
+        for metric in self.metrics():
+            digest = self.digest(metric, days)
+            summary[metric] = {"count": int(digest.count)}
+            for p in percentiles:
+                summary[metric][f"p{p}"] = digest.quantile(p / 100)
+        return summary
+
+
+def merge_sketch_files(paths: Iterable[str], source: str = "fleet") -> SketchStore:
+    """여러 머신의 스케치 파일을 하나로 병합"""
+    merged = SketchStore(Path(os.devnull), source=source)
+    for path in paths:
+        merged.merge(SketchStore(Path(path)))
+    return merged
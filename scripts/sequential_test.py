@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+A/B 테스트 순차 검정 (mSPRT, 조기 종료)
+
+정규 혼합 사전분포를 쓰는 mixture SPRT (Johari et al., "Always Valid
+Inference") 로 treatment - control 차이를 검정한다. 세션이 완료될 때마다 그룹
+누적 집계로 O(1) 갱신하며, 언제 들여다봐도 유효한 p-value (1/Λ 의 누적 최솟값)
+와 신뢰구간 (매 시점 구간의 교집합) 을 유지한다.
+
+- 유의: 어느 지표든 Λ ≥ 1/α (지표 수만큼 Bonferroni 보정)
+- 무익: 모든 지표의 신뢰구간이 ±최소 관심 효과 안에 들어옴
+"""
+import math
+from typing import Dict, Optional
+
+# 전체 유의수준 (지표 수로 나눠 사용)
+SEQUENTIAL_ALPHA = 0.05
+
+# 그룹별로 이만큼 완료되기 전에는 판정하지 않음 (분산 추정이 불안정)
+SEQUENTIAL_MIN_SAMPLES = 10
+
+# 최소 관심 효과: 성공률은 절대 차이(비율), 완료 시간은 control 평균 대비 비율.
+# 혼합 분포 표준편차 τ 도 이 값으로 둔다.
+MIN_EFFECT = {"success_rate": 0.05, "completion_time": 0.10}
+
+
+class MixtureSPRT:
+    """차이 추정값과 그 분산으로 갱신하는 mSPRT 한 개"""
+
+    def __init__(self, name: str, alpha: float = SEQUENTIAL_ALPHA):
+        self.name = name
+        self.alpha = alpha
+        self.p_value = 1.0
+        self.ci_low = -math.inf
+        self.ci_high = math.inf
+        self.statistic = 0.0
+        self.difference: Optional[float] = None
+        self.updates = 0
+        # 마지막 갱신의 τ (= 최소 관심 효과, 차이와 같은 단위)
+        self.tau = 0.0
+        self.rejected_at: Optional[int] = None
+
+    def update(self, difference: float, variance: float, tau: float, position: int):
+        """position 번째 완료 시점의 차이 추정값 반영 (variance: 추정값의 분산)"""
+        if variance <= 0 or tau <= 0:
+            return
+        tau2 = tau * tau
+        log_ratio = 0.5 * math.log(variance / (variance + tau2)) + \
+            tau2 * difference * difference / (2 * variance * (variance + tau2))
+        self.statistic = log_ratio
+        self.difference = difference
+        self.tau = tau
+        self.updates += 1
+        self.p_value = min(self.p_value, math.exp(-log_ratio) if log_ratio > 0 else 1.0)
+        half_width = math.sqrt(
+            2 * variance * (variance + tau2) / tau2
+            * (math.log(1 / self.alpha) + 0.5 * math.log((variance + tau2) / variance))
+        )
+        self.ci_low = max(self.ci_low, difference - half_width)
+        self.ci_high = min(self.ci_high, difference + half_width)
+        if self.rejected_at is None and self.p_value <= self.alpha:
+            self.rejected_at = position
+
+    def result(self) -> Dict:
+        return {
+            "log_likelihood_ratio": self.statistic,
+            "p_value": self.p_value,
+            "difference": self.difference,
+            "ci_low": self.ci_low if self.updates else None,
+            "ci_high": self.ci_high if self.updates else None,
+            "alpha": self.alpha,
+            "significant_at": self.rejected_at,
+        }
+
+
+class SequentialMonitor:
+    """control/treatment 누적 집계로 성공률과 완료 시간의 mSPRT 를 갱신"""
+
+    def __init__(self, alpha: float = SEQUENTIAL_ALPHA, min_samples: int = SEQUENTIAL_MIN_SAMPLES):
+        self.min_samples = min_samples
+        self.tests = {name: MixtureSPRT(name, alpha / len(MIN_EFFECT)) for name in MIN_EFFECT}
+        self.completions = 0
+        self.decision: Optional[Dict] = None
+
+    def update(self, control, treatment):
+        """완료 하나마다 호출 (control/treatment: 그룹의 metrics_stats.GroupAccumulator)"""
+        self.completions += 1
+        n1, n2 = control.completed, treatment.completed
+        if n1 < self.min_samples or n2 < self.min_samples:
+            return
+
+        p1, p2 = control.successes / n1, treatment.successes / n2
+        self.tests["success_rate"].update(
+            p2 - p1, p1 * (1 - p1) / n1 + p2 * (1 - p2) / n2, MIN_EFFECT["success_rate"], self.completions
+        )
+        _, mean1, var1 = control.mean_variance()
+        _, mean2, var2 = treatment.mean_variance()
+        self.tests["completion_time"].update(
+            mean2 - mean1, var1 / n1 + var2 / n2, MIN_EFFECT["completion_time"] * abs(mean1), self.completions
+        )
+        if self.decision is None:
+            self.decision = self._decide()
+
+    def _decide(self) -> Optional[Dict]:
+        significant = [name for name, test in self.tests.items() if test.rejected_at is not None]
+        if significant:
+            return {"stop": True, "reason": "significant", "metrics": significant, "at_completion": self.completions}
+        futile = all(
+            test.updates and -test.tau < test.ci_low and test.ci_high < test.tau for test in self.tests.values()
+        )
+        if futile:
+            return {"stop": True, "reason": "futility", "metrics": sorted(self.tests), "at_completion": self.completions}
+        return None
+
+    def recommendation(self) -> Dict:
+        """조기 종료 권고 (한 번 종료 조건에 닿으면 유지)"""
+        return self.decision or {"stop": False, "reason": None, "metrics": [], "at_completion": None}
+
+    def result(self) -> Dict:
+        return {
+            "method": "mSPRT",
+            "completions": self.completions,
+            "recommendation": self.recommendation(),
+            "tests": {name: test.result() for name, test in self.tests.items()},
+        }
+
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Spec Search Index - BM25 inverted index over extracted PRD specs
+Used by prd_decomposer.py to answer "which requirements mention X" queries
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+
+# Hangul syllable runs, or ASCII words split on punctuation/underscores
+TOKEN_PATTERN = re.compile(r'[가-힣]+|[a-z0-9]+')
+HANGUL_START = '가'
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: str) -> Iterator[str]:
+    """Split text into index terms
+
+    Hangul has no reliable word boundaries once particles are attached
+    (추적이, 추적을), so Hangul runs are indexed as overlapping syllable
+    bigrams; a query for 추적 then matches every inflected form.
+    """
+    for run in TOKEN_PATTERN.findall(text.lower()):
+        if run[0] >= HANGUL_START:
+            if len(run) == 1:
+                yield run
+            else:
+                for i in range(len(run) - 1):
+                    yield run[i:i + 2]
+        elif len(run) > 1 or run.isdigit():
+            yield run
+
+
+class SpecSearchIndex:
+    """Persistent inverted index: term -> shard -> [(doc, term frequency)]
+
+    A document is one non-empty line of a spec shard. Each shard keeps its
+    own document table and term list, so a changed PRD is re-indexed by
+    dropping and re-adding only its shard.
+    """
+
+    def __init__(self, index_file: Path):
+        self.index_file = Path(index_file)
+        self.shards: Dict[str, Dict] = {}
+        self.postings: Dict[str, Dict[str, List[List[int]]]] = {}
+        self.dirty = False
+        self.load()
+
+    def exists(self) -> bool:
+        return self.index_file.exists()
+
+    def load(self):
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.shards = data.get("shards", {})
+            self.postings = data.get("postings", {})
+        except (json.JSONDecodeError, FileNotFoundError):
+            self.shards, self.postings = {}, {}
+        self.dirty = False
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp_path = self.index_file.with_name(f".{self.index_file.name}.tmp")
+        tmp_path.write_text(
+            json.dumps({"shards": self.shards, "postings": self.postings}, ensure_ascii=False, separators=(",", ":")),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, self.index_file)
+        self.dirty = False
+
+    def remove_shard(self, key: str):
+        """Drop a shard's documents and postings"""
+        shard = self.shards.pop(key, None)
+        if shard is None:
+            return
+        for term in shard["terms"]:
+            by_shard = self.postings.get(term)
+            if by_shard is not None:
+                by_shard.pop(key, None)
+                if not by_shard:
+                    del self.postings[term]
+        self.dirty = True
+
+    def update_shard(self, key: str, version: str, sections: Dict[str, Tuple[int, str]]):
+        """(Re)index a shard from {section: (first line number, text)}"""
+        self.remove_shard(key)
+
+        docs: List[List] = []
+        term_docs: Dict[str, List[List[int]]] = {}
+        total_length = 0
+        for section, (first_line, text) in sections.items():
+            for offset, line in enumerate(text.split("\n")):
+                if not line.strip() or line.startswith("Generated: "):
+                    continue
+                counts = Counter(tokenize(line))
+                if not counts:
+                    continue
+                length = sum(counts.values())
+                doc = len(docs)
+                docs.append([section, first_line + offset, length])
+                total_length += length
+                for term, tf in counts.items():
+                    term_docs.setdefault(term, []).append([doc, tf])
+
+        for term, entries in term_docs.items():
+            self.postings.setdefault(term, {})[key] = entries
+        self.shards[key] = {
+            "version": version,
+            "docs": docs,
+            "length": total_length,
+            "terms": sorted(term_docs),
+        }
+        self.dirty = True
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """Rank spec lines against a query with BM25"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        total_docs = sum(len(shard["docs"]) for shard in self.shards.values())
+        if not terms or not total_docs:
+            return []
+        avg_length = sum(shard["length"] for shard in self.shards.values()) / total_docs
+
+        scores: Dict[Tuple[str, int], float] = {}
+        for term in terms:
+            by_shard = self.postings.get(term)
+            if not by_shard:
+                continue
+            df = sum(len(entries) for entries in by_shard.values())
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            for key, entries in by_shard.items():
+                docs = self.shards[key]["docs"]
+                for doc, tf in entries:
+                    norm = K1 * (1 - B + B * docs[doc][2] / avg_length)
+                    scores[key, doc] = scores.get((key, doc), 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        results = []
+        for (key, doc), score in ranked:
+            section, line, _ = self.shards[key]["docs"][doc]
+            results.append({
+                "shard": key,
+                "version": self.shards[key]["version"],
+                "section": section,
+                "line": line,
+                "score": score,
+            })
+        return results
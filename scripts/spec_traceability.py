@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Spec Traceability - link extracted requirements to the tests that cover them
+TADD depends on every requirement having a test; this index makes the gaps visible
+"""
+
+import ast
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+
+try:
+    from .spec_search import tokenize
+except ImportError:
+    from spec_search import tokenize
+
+
+# Explicit requirement identifiers such as FR-1, NFR-2, REQ-12
+REQUIREMENT_CODE = re.compile(r'\b((?:FR|NFR|REQ)-\d+(?:\.\d+)?)\b', re.IGNORECASE)
+
+# Terms too generic to link a test to a requirement on their own
+STOPWORDS = {
+    "test", "tests", "the", "and", "for", "with", "from", "that", "this", "should",
+    "must", "are", "is", "be", "to", "of", "in", "on", "a", "an", "it", "as", "by",
+}
+
+# A keyword link needs this many shared terms covering this share of the smaller side
+MIN_SHARED_KEYWORDS = 2
+MIN_KEYWORD_OVERLAP = 0.5
+
+
+def keywords(text: str) -> Set[str]:
+    return {term for term in tokenize(text.replace("_", " ")) if term not in STOPWORDS}
+
+
+def natural_key(text: str) -> List:
+    """Sort key that orders v9 before v10"""
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', text)]
+
+
+def requirement_codes(text: str) -> Set[str]:
+    """Normalized requirement codes mentioned in text (fr_1 and FR-1 both count)"""
+    return {code.upper() for code in REQUIREMENT_CODE.findall(text.replace("_", "-"))}
+
+
+def scan_test_file(file_path: Path, rel_path: str) -> Dict[str, Dict]:
+    """Test functions in a file: id -> name, docstring codes and keywords"""
+    try:
+        tree = ast.parse(file_path.read_text(encoding="utf-8"))
+    except (SyntaxError, UnicodeDecodeError):
+        return {}
+
+    tests = {}
+
+    def visit(nodes: Iterable[ast.stmt], prefix: str):
+        for node in nodes:
+            if isinstance(node, ast.ClassDef) and node.name.startswith("Test"):
+                visit(node.body, f"{prefix}{node.name}::")
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith("test"):
+                text = f"{node.name} {ast.get_docstring(node) or ''}"
+                tests[f"{rel_path}::{prefix}{node.name}"] = {
+                    "file": rel_path,
+                    "line": node.lineno,
+                    "codes": sorted(requirement_codes(text)),
+                    "keywords": sorted(keywords(text)),
+                }
+
+    visit(tree.body, "")
+    return tests
+
+
+class TraceabilityIndex:
+    """Persistent two-way map between requirements and tests
+
+    Requirements are added per spec shard and tests per test file, so a
+    changed PRD or test file only re-links its own entries. Both link maps
+    are stored, making requirement -> tests and test -> requirements
+    lookups single dictionary hits.
+    """
+
+    def __init__(self, index_file: Path):
+        self.index_file = Path(index_file)
+        self.requirements: Dict[str, Dict] = {}
+        self.tests: Dict[str, Dict] = {}
+        self.files: Dict[str, Dict] = {}
+        self.req_to_tests: Dict[str, List[str]] = {}
+        self.test_to_reqs: Dict[str, List[str]] = {}
+        self.dirty = False
+        self.load()
+
+    def exists(self) -> bool:
+        return self.index_file.exists()
+
+    def load(self):
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            data = {}
+        self.requirements = data.get("requirements", {})
+        self.tests = data.get("tests", {})
+        self.files = data.get("files", {})
+        self.req_to_tests = data.get("req_to_tests", {})
+        self.test_to_reqs = data.get("test_to_reqs", {})
+        self._build_lookups()
+        self.dirty = False
+
+    def save(self):
+        if not self.dirty:
+            return
+        data = {
+            "requirements": self.requirements,
+            "tests": self.tests,
+            "files": self.files,
+            "req_to_tests": self.req_to_tests,
+            "test_to_reqs": self.test_to_reqs,
+        }
+        tmp_path = self.index_file.with_name(f".{self.index_file.name}.tmp")
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.index_file)
+        self.dirty = False
+
+    def _build_lookups(self):
+        """In-memory keyword/code -> ids maps used for incremental linking"""
+        self._req_keywords: Dict[str, Set[str]] = {}
+        self._req_codes: Dict[str, Set[str]] = {}
+        for rid, requirement in self.requirements.items():
+            self._add_lookup(self._req_keywords, self._req_codes, rid, requirement)
+        self._test_keywords: Dict[str, Set[str]] = {}
+        self._test_codes: Dict[str, Set[str]] = {}
+        # bare test function name -> full test ids, for requirements_for
+        self._test_names: Dict[str, Set[str]] = {}
+        for tid, test in self.tests.items():
+            self._add_lookup(self._test_keywords, self._test_codes, tid, test)
+            self._test_names.setdefault(tid.rsplit("::", 1)[-1], set()).add(tid)
+
+    @staticmethod
+    def _add_lookup(by_keyword: Dict[str, Set[str]], by_code: Dict[str, Set[str]], item_id: str, item: Dict):
+        for keyword in item["keywords"]:
+            by_keyword.setdefault(keyword, set()).add(item_id)
+        for code in item["codes"]:
+            by_code.setdefault(code, set()).add(item_id)
+
+    @staticmethod
+    def _drop_lookup(by_keyword: Dict[str, Set[str]], by_code: Dict[str, Set[str]], item_id: str, item: Dict):
+        for table, terms in ((by_keyword, item["keywords"]), (by_code, item["codes"])):
+            for term in terms:
+                ids = table.get(term)
+                if ids is not None:
+                    ids.discard(item_id)
+                    if not ids:
+                        del table[term]
+
+    @staticmethod
+    def _linked(requirement: Dict, test: Dict) -> bool:
+        if set(requirement["codes"]) & set(test["codes"]):
+            return True
+        shared = len(set(requirement["keywords"]) & set(test["keywords"]))
+        smaller = min(len(requirement["keywords"]), len(test["keywords"])) or 1
+        return shared >= MIN_SHARED_KEYWORDS and shared / smaller >= MIN_KEYWORD_OVERLAP
+
+    def _candidates(self, item: Dict, by_keyword: Dict[str, Set[str]], by_code: Dict[str, Set[str]]) -> Set[str]:
+        candidates: Set[str] = set()
+        for code in item["codes"]:
+            candidates |= by_code.get(code, set())
+        for keyword in item["keywords"]:
+            candidates |= by_keyword.get(keyword, set())
+        return candidates
+
+    def _link(self, rid: str, tid: str):
+        self.req_to_tests.setdefault(rid, []).append(tid)
+        self.test_to_reqs.setdefault(tid, []).append(rid)
+
+    def _unlink(self, item_id: str, links: Dict[str, List[str]], reverse: Dict[str, List[str]]):
+        for other in links.pop(item_id, []):
+            remaining = [linked for linked in reverse.get(other, []) if linked != item_id]
+            if remaining:
+                reverse[other] = remaining
+            else:
+                reverse.pop(other, None)
+
+    def update_requirements(self, shard: str, version: str, lines: List[Tuple[int, str]]):
+        """Replace one shard's requirements, given (line number, text) pairs"""
+        for rid in [rid for rid, requirement in self.requirements.items() if requirement["shard"] == shard]:
+            self._drop_lookup(self._req_keywords, self._req_codes, rid, self.requirements.pop(rid))
+            self._unlink(rid, self.req_to_tests, self.test_to_reqs)
+
+        for line, text in lines:
+            codes = sorted(requirement_codes(text))
+            rid = f"{shard}:{codes[0]}" if codes else f"{shard}:L{line}"
+            if rid in self.requirements:
+                rid = f"{shard}:L{line}"
+            requirement = {
+                "shard": shard,
+                "version": version,
+                "line": line,
+                "text": text,
+                "codes": codes,
+                "keywords": sorted(keywords(text)),
+            }
+            self.requirements[rid] = requirement
+            self._add_lookup(self._req_keywords, self._req_codes, rid, requirement)
+            for tid in sorted(self._candidates(requirement, self._test_keywords, self._test_codes)):
+                if self._linked(requirement, self.tests[tid]):
+                    self._link(rid, tid)
+        self.dirty = True
+
+    def remove_requirements(self, shard: str):
+        self.update_requirements(shard, "", [])
+
+    def _replace_tests(self, rel_path: str, tests: Dict[str, Dict]):
+        for tid in self.files.get(rel_path, {}).get("tests", []):
+            test = self.tests.pop(tid, None)
+            if test is not None:
+                self._drop_lookup(self._test_keywords, self._test_codes, tid, test)
+                name = tid.rsplit("::", 1)[-1]
+                self._test_names[name].discard(tid)
+                if not self._test_names[name]:
+                    del self._test_names[name]
+            self._unlink(tid, self.test_to_reqs, self.req_to_tests)
+
+        for tid, test in tests.items():
+            self.tests[tid] = test
+            self._add_lookup(self._test_keywords, self._test_codes, tid, test)
+            self._test_names.setdefault(tid.rsplit("::", 1)[-1], set()).add(tid)
+            for rid in sorted(self._candidates(test, self._req_keywords, self._req_codes)):
+                if self._linked(self.requirements[rid], test):
+                    self._link(rid, tid)
+        self.dirty = True
+
+    def refresh_tests(self, tests_dir: Path, base_path: Path) -> List[str]:
+        """Rescan test files whose size or mtime changed; returns their paths"""
+        seen = set()
+        changed = []
+        for file_path in sorted(Path(tests_dir).rglob("test_*.py")):
+            rel_path = file_path.relative_to(base_path).as_posix()
+            seen.add(rel_path)
+            stat = file_path.stat()
+            signature = [stat.st_size, stat.st_mtime_ns]
+            if self.files.get(rel_path, {}).get("stat") == signature:
+                continue
+            tests = scan_test_file(file_path, rel_path)
+            self._replace_tests(rel_path, tests)
+            self.files[rel_path] = {"stat": signature, "tests": sorted(tests)}
+            changed.append(rel_path)
+        for rel_path in sorted(set(self.files) - seen):
+            self._replace_tests(rel_path, {})
+            del self.files[rel_path]
+            changed.append(rel_path)
+        return changed
+
+    def tests_for(self, requirement_id: str) -> List[str]:
+        """Tests covering a requirement id, or every requirement with that code"""
+        if requirement_id in self.requirements:
+            return sorted(self.req_to_tests.get(requirement_id, []))
+        tests = set()
+        for rid in self._req_codes.get(requirement_id.upper(), ()):
+            tests.update(self.req_to_tests.get(rid, []))
+        return sorted(tests)
+
+    def requirements_for(self, test_id: str) -> List[str]:
+        """Requirements a test covers, by full id or bare function name"""
+        if test_id in self.tests:
+            return sorted(self.test_to_reqs.get(test_id, []))
+        requirements = set()
+        for tid in self._test_names.get(test_id, ()):
+            requirements.update(self.test_to_reqs.get(tid, []))
+        return sorted(requirements)
+
+    def untested(self) -> List[str]:
+        return sorted(
+            (rid for rid in self.requirements if not self.req_to_tests.get(rid)),
+            key=lambda rid: natural_key(self.requirements[rid]["version"]) + natural_key(rid),
+        )
+
+    def untested_report(self) -> str:
+        """Markdown list of requirements without a linked test, by version"""
+        untested = self.untested()
+        total = len(self.requirements)
+        report = [
+            "# Untested Requirements",
+            "",
+            f"**Coverage**: {total - len(untested)}/{total} requirements linked to tests",
+            "",
+        ]
+        current_version = None
+        for rid in untested:
+            requirement = self.requirements[rid]
+            if requirement["version"] != current_version:
+                current_version = requirement["version"]
+                report.extend([f"## {current_version}", ""])
+            report.append(f"- `{rid}` (line {requirement['line']}): {requirement['text'].lstrip('-* ').strip()}")
+        return "\n".join(report)
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Tests for ab_test_framework.py
+"""
+
+import json
+import multiprocessing
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from scripts.ab_aggregates import SessionAggregates
+from scripts.ab_assignment import AssignmentEngine, Experiment
+from scripts.ab_benchmark import ANALYSIS_BACKENDS, STORAGE_BACKENDS, SyntheticConfig, run_benchmark
+from scripts.ab_session_store import SessionStore, complete_event, start_event
+from scripts.ab_test_framework import ABTestFramework
+from scripts.sequential_test import SequentialMonitor
+
+
+def start_sessions(test_file: str, worker: int, count: int, compact_threshold: int):
+    framework = ABTestFramework(test_file, durability="sync")
+    framework.store.compact_threshold = compact_threshold
+    for i in range(count):
+        session_id = framework.start_test_session(f"{worker:02d}{i:06d}", f"task {i}", "tactical")["session_id"]
+        framework.complete_test_session(session_id, 10.0 + i, i % 2 == 0)
+
+
+def test_sessions_are_appended_as_events(tmp_path):
+    """시작/완료는 이벤트 한 줄씩 추가되고, 압축하면 기존 JSON 형식 스냅샷이 되어야 함"""
+    test_file = tmp_path / "ab_test_results.json"
+    framework = ABTestFramework(str(test_file), durability="sync")
+    started = [framework.start_test_session(f"user{i:04d}", f"task {i}", "strategic") for i in range(5)]
+    framework.complete_test_session(started[0]["session_id"], 12.5, True, user_satisfaction=4)
+    with pytest.raises(ValueError, match="unknown session_id"):
+        framework.complete_test_session("unknown", 1.0, True)
+
+    events_file = tmp_path / "ab_test_results.events.ndjson"
+    assert not test_file.exists()
+    assert len(events_file.read_text(encoding="utf-8").splitlines()) == 6
+    sessions = framework._load_sessions()
+    assert sessions[started[0]["session_id"]]["completion_time_minutes"] == 12.5
+    assert sessions[started[0]["session_id"]]["user_satisfaction"] == 4
+
+    framework.store.compact()
+    assert events_file.read_text(encoding="utf-8") == ""
+    assert json.loads(test_file.read_text(encoding="utf-8")) == sessions
+    # 다른 인스턴스 (대시보드 등) 도 같은 상태를 읽음
+    assert ABTestFramework(str(test_file))._load_sessions() == sessions
+
+
+def test_replay_is_idempotent(tmp_path):
+    """압축 중 이벤트 로그를 비우기 전에 중단되어도 재생 결과가 같아야 함"""
+    store = SessionStore(str(tmp_path / "ab.json"))
+    session = {"session_id": "s1", "group": "control", "completion_time_minutes": None}
+    store.append([start_event(session), complete_event("s1", {"completion_time_minutes": 3.0})])
+    expected = json.loads(json.dumps(store.sessions()))
+
+    # 스냅샷만 쓰고 이벤트는 남은 상태
+    (tmp_path / "ab.json").write_text(json.dumps(expected), encoding="utf-8")
+
+    assert SessionStore(str(tmp_path / "ab.json")).sessions() == expected
+    assert expected["s1"]["completion_time_minutes"] == 3.0
+
+
+def test_concurrent_writers_do_not_lose_sessions(tmp_path):
+    """여러 프로세스가 동시에 기록하고 압축해도 세션이 사라지지 않아야 함"""
+    test_file = str(tmp_path / "ab_test_results.json")
+    workers = [
+        multiprocessing.Process(target=start_sessions, args=(test_file, worker, 40, 4096))
+        for worker in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    sessions = ABTestFramework(test_file)._load_sessions()
+    assert len(sessions) == 160
+    assert all(session["completion_time_minutes"] is not None for session in sessions.values())
+    # 작은 임계값으로 압축이 실제로 일어났어야 함
+    assert Path(test_file).exists()
+
+
+def test_analysis_needs_completed_sessions_in_both_groups(tmp_path):
+    """시작만 한 세션뿐인 그룹이 있으면 KeyError 없이 데이터 부족을 알려야 함"""
+    from scripts.performance_dashboard import PerformanceDashboard
+    test_file = tmp_path / "ab.json"
+    framework = ABTestFramework(str(test_file), durability="sync")
+    started = framework.start_many([{"user_id": str(i), "task_description": "task", "task_type": "tactical"} for i in range(20)])["sessions"]
+
+    assert framework.analyze_results() == {"error": "Insufficient data for comparison"}
+    for session in started:
+        if session["group"] == "control":
+            framework.complete_test_session(session["session_id"], 5.0, True)
+    assert framework.analyze_results() == {"error": "Insufficient data for comparison"}
+    dashboard = PerformanceDashboard(str(tmp_path / "context_metrics.json"), str(test_file))
+    assert dashboard._analyze_ab_test(framework._load_sessions()) == {"error": "Insufficient data for A/B analysis"}
+
+def test_bulk_apis_write_one_batch_and_report_row_errors(tmp_path, monkeypatch):
+    """start_many/complete_many 는 한 번에 기록하고 잘못된 행만 오류로 보고해야 함"""
+    framework = ABTestFramework(str(tmp_path / "ab_test_results.json"))
+    appends = []
+    original_append = framework.store.append
+    monkeypatch.setattr(framework.store, "append", lambda events: appends.append(1) or original_append(events))
+
+    started = framework.start_many(
+        [{"user_id": "same_user", "task_description": f"task {i}", "task_type": "tactical"} for i in range(100)]
+        + [{"user_id": "x", "task_type": "tactical"}]
+    )
+    assert len(started["sessions"]) == 100
+    assert len({s["session_id"] for s in started["sessions"]}) == 100
+    # 같은 초·같은 사용자의 id 는 기준값, _2, _3 ... 순서로 이어짐
+    suffixes = {}
+    for session in started["sessions"]:
+        base, _, suffix = session["session_id"].partition("_same_use")
+        suffixes.setdefault(base, []).append(int(suffix[1:] or 1))
+    assert all(numbers == list(range(1, len(numbers) + 1)) for numbers in suffixes.values())
+    assert started["errors"] == [{"row": 101, "error": "missing task_description"}]
+
+    completed = framework.complete_many(
+        [{"session_id": s["session_id"], "completion_time_minutes": "12.5", "success_achieved": "yes"}
+         for s in started["sessions"][:50]]
+        + [{"session_id": "nope", "completion_time_minutes": 1, "success_achieved": True},
+           {"session_id": started["sessions"][60]["session_id"], "completion_time_minutes": "soon",
+            "success_achieved": True}]
+    )
+    assert completed["completed"] == 50
+    assert [e["row"] for e in completed["errors"]] == [51, 52]
+    assert appends == [1, 1]
+    sessions = framework._load_sessions()
+    assert sum(1 for s in sessions.values() if s["completion_time_minutes"] == 12.5 and s["success_achieved"]) == 50
+
+
+@pytest.mark.parametrize("completion_time", ["nan", "inf", "-inf", "-1.5", float("nan"), float("inf"), -3])
+def test_completion_time_must_be_finite_and_non_negative(tmp_path, completion_time):
+    """nan/inf/음수 완료 시간은 집계를 오염시키지 않도록 행 오류로 보고해야 함"""
+    framework = ABTestFramework(str(tmp_path / "ab_test_results.json"))
+    session_id = framework.start_many([{"user_id": "u", "task_description": "t", "task_type": "tactical"}])[
+        "sessions"][0]["session_id"]
+
+    result = framework.complete_many(
+        [{"session_id": session_id, "completion_time_minutes": completion_time, "success_achieved": True}]
+    )
+
+    assert result["completed"] == 0
+    assert "completion_time_minutes" in result["errors"][0]["error"]
+    assert framework._load_sessions()[session_id]["completion_time_minutes"] is None
+
+
+def test_import_csv_and_ndjson(tmp_path):
+    """CSV/NDJSON 가져오기는 시작과 완료를 함께 기록하고 나쁜 행만 건너뛰어야 함"""
+    framework = ABTestFramework(str(tmp_path / "ab_test_results.json"))
+    csv_file = tmp_path / "sessions.csv"
+    csv_file.write_text(
+        "session_id,user_id,task_description,task_type,start_time,completion_time_minutes,success_achieved,"
+        "user_satisfaction,source\n"
+        "h1,alice,refactor,tactical,2025-01-01T10:00:00,30,true,4,jira\n"
+        "h2,bob,design,strategic,2025-01-02T10:00:00,,,,jira\n"
+        "h3,carol,fix,operational,2025-01-03T10:00:00,abc,true,,jira\n"
+        "h1,dave,dup,tactical,,,,,jira\n",
+        encoding="utf-8",
+    )
+    ndjson_file = tmp_path / "sessions.ndjson"
+    ndjson_file.write_text(
+        '{"session_id": "n1", "user_id": "erin", "task_description": "docs", "task_type": "tactical", '
+        '"completion_time_minutes": 5, "success_achieved": false}\n'
+        "not json\n",
+        encoding="utf-8",
+    )
+
+    csv_result = framework.import_sessions(str(csv_file))
+    ndjson_result = framework.import_sessions(str(ndjson_file))
+
+    assert (csv_result["started"], csv_result["completed"]) == (2, 1)
+    assert [e["row"] for e in csv_result["errors"]] == [3, 4]
+    assert "duplicate session_id" in csv_result["errors"][1]["error"]
+    assert (ndjson_result["started"], ndjson_result["completed"]) == (1, 1)
+    assert ndjson_result["errors"][0]["row"] == 2
+    sessions = framework._load_sessions()
+    assert sessions["h1"]["start_time"] == "2025-01-01T10:00:00"
+    assert sessions["h1"]["user_satisfaction"] == 4 and sessions["h1"]["success_achieved"] is True
+    assert sessions["h2"]["completion_time_minutes"] is None
+    assert sessions["n1"]["success_achieved"] is False
+    assert "source" not in sessions["h1"]
+
+
+def test_aggregates_track_completions_and_match_recompute(tmp_path, monkeypatch):
+    """누적 집계는 완료/재완료마다 갱신되고 분석은 세션을 다시 읽지 않아야 함"""
+    test_file = str(tmp_path / "ab_test_results.json")
+    framework = ABTestFramework(test_file)
+    started = framework.start_many([
+        {"user_id": f"user{i:04d}", "task_description": f"task {i}", "task_type": ("tactical", "strategic")[i % 2]}
+        for i in range(200)
+    ])["sessions"]
+    framework.complete_many([
+        {"session_id": s["session_id"], "completion_time_minutes": 10.0 + i % 7, "success_achieved": i % 3 != 0,
+         "consistency_maintained": i % 2 == 0, "duplicate_work_detected": i % 5 == 0}
+        for i, s in enumerate(started[:150])
+    ])
+    # 같은 세션을 다시 완료하면 이전 기여분을 빼고 새 값으로 반영
+    framework.complete_test_session(started[0]["session_id"], 99.0, True)
+
+    assert framework.verify_aggregates() == {"sessions": 200, "ok": True, "mismatches": []}
+    aggregates = framework.store.aggregates()
+    assert aggregates.accumulator("control").total + aggregates.accumulator("treatment").total == 200
+    assert sum(aggregates.accumulator(g).completed for g in ("control", "treatment")) == 150
+
+    monkeypatch.setattr(framework, "_load_sessions", lambda: pytest.fail("analysis must use aggregates"))
+    results = framework.analyze_results()
+    assert set(results["by_task_type"]) == {"tactical", "strategic"}
+    assert results["statistical_significance"]["completion_time"]["df"] > 0
+    assert "bootstrap" not in results["statistical_significance"]
+    monkeypatch.undo()
+
+    # 다른 인스턴스가 새로 읽어도 같은 집계 (스냅샷 압축 후 포함)
+    framework.store.compact()
+    reloaded = ABTestFramework(test_file)
+    assert reloaded.analyze_results()["control_group"] == pytest.approx(results["control_group"])
+    assert reloaded.verify_aggregates()["ok"]
+
+    # 집계와 어긋난 세션은 검증에서 드러나야 함
+    reloaded._load_sessions()[started[1]["session_id"]]["completion_time_minutes"] = 1000.0
+    mismatches = reloaded.verify_aggregates()["mismatches"]
+    assert {m["field"] for m in mismatches} == {"avg_completion_time", "std_completion_time"}
+
+
+def test_aggregates_keep_precision_for_large_means(tmp_path):
+    """평균이 표준편차보다 훨씬 커도 (N(1e6, 5)) 재완료로 빼고 더한 집계가 재계산과 같아야 함"""
+    import statistics
+    rng = random.Random(8)
+    framework = ABTestFramework(str(tmp_path / "ab_test_results.json"))
+    started = framework.start_many(
+        [{"user_id": f"user{i:04d}", "task_description": f"task {i}", "task_type": "tactical"} for i in range(400)]
+    )["sessions"]
+    for rounds in range(3):
+        framework.complete_many(
+            [{"session_id": s["session_id"], "completion_time_minutes": rng.gauss(1e6, 5), "success_achieved": True}
+             for s in started[rounds * 50:]]
+        )
+
+    assert framework.verify_aggregates()["ok"]
+    sessions = framework._load_sessions().values()
+    for group in ("control", "treatment"):
+        times = [s["completion_time_minutes"] for s in sessions if s["group"] == group]
+        stats = framework.store.aggregates().stats(group)
+        assert stats["std_completion_time"] == pytest.approx(statistics.stdev(times), rel=1e-9)
+
+
+def test_assignment_weights_layers_and_bulk():
+    """가중치대로 나뉘고, 레이어끼리 독립이며, 대량 할당은 단건 할당과 같아야 함"""
+    engine = AssignmentEngine([
+        Experiment("ranking", {"a": 0.2, "b": 0.3, "c": 0.5}),
+        Experiment("prompt", {"old": 1, "new": 1}, layer="prompts", traffic=0.5),
+        Experiment("prompt_v2", {"old": 1, "new": 1}, layer="prompts", traffic=0.5),
+    ])
+    units = [f"user{i}" for i in range(100000)]
+
+    ranking = engine.assign_many("ranking", units)
+    assert ranking[:1000] == [engine.assign("ranking", unit) for unit in units[:1000]]
+    for arm, weight in {"a": 0.2, "b": 0.3, "c": 0.5}.items():
+        assert abs(ranking.count(arm) / len(units) - weight) < 0.01
+
+    # 같은 레이어의 실험은 배타적, 다른 레이어와는 독립
+    prompt = engine.assign_many("prompt", units)
+    prompt_v2 = engine.assign_many("prompt_v2", units)
+    assert all((p is None) != (q is None) for p, q in zip(prompt, prompt_v2))
+    in_prompt = [r for r, p in zip(ranking, prompt) if p == "new"]
+    assert abs(len(in_prompt) / len(units) - 0.25) < 0.01
+    assert abs(in_prompt.count("a") / len(in_prompt) - 0.2) < 0.015
+
+    with pytest.raises(ValueError):
+        engine.add(Experiment("overflow", {"x": 1}, layer="prompts", traffic=0.1))
+    with pytest.raises(ValueError):
+        Experiment("empty", {})
+
+
+def test_framework_assigns_configured_arms(tmp_path):
+    framework = ABTestFramework(str(tmp_path / "ab.json"), arms={"control": 1, "treatment": 3})
+    rows = [{"user_id": f"user{i}", "task_description": "task"} for i in range(20000)]
+    groups = framework.assign_test_groups(rows)
+    assert groups[:50] == [framework.assign_test_group(r["user_id"], r["task_description"]) for r in rows[:50]]
+    assert abs(groups.count("treatment") / len(groups) - 0.75) < 0.015
+
+
+def test_existing_experiment_keeps_md5_assignments(tmp_path):
+    """기본 실험은 md5 할당을 유지해 진행 중인 사용자가 그룹을 옮기지 않아야 함 (고정값)"""
+    pinned = {
+        ("alice", "refactor"): "treatment", ("bob", "design"): "control", ("carol", "fix"): "control",
+        ("dave", "docs"): "control", ("erin", "tests"): "treatment", ("frank", "deploy"): "treatment",
+    }
+    framework = ABTestFramework(str(tmp_path / "ab.json"))
+    rows = [{"user_id": user, "task_description": task} for user, task in pinned]
+    assert [framework.assign_test_group(user, task) for user, task in pinned] == list(pinned.values())
+    assert framework.assign_test_groups(rows) == list(pinned.values())
+
+    # 새 실험은 crc32 (가중치 지원), 고정값으로 방식 변경을 잡아냄
+    engine = AssignmentEngine([Experiment("context_management", {"control": 0.5, "treatment": 0.5})])
+    assert [engine.assign("context_management", f"{user}_{task}") for user, task in pinned] == [
+        "control", "treatment", "treatment", "treatment", "control", "treatment",
+    ]
+    with pytest.raises(ValueError):
+        Experiment("weighted", {"control": 1, "treatment": 3}, hash_scheme="md5")
+
+
+def test_benchmark_runs_every_backend():
+    """합성 세션 벤치마크는 모든 저장/분석 방식의 단계별 처리량/지연/메모리를 기록해야 함"""
+    config = SyntheticConfig(sessions=400, effect_size=0.5, completion_rate=0.8, treatment_share=0.7)
+    for storage in STORAGE_BACKENDS:
+        result = run_benchmark(config, storage, ANALYSIS_BACKENDS)
+        phases = {phase["phase"]: phase for phase in result["phases"]}
+        assert list(phases) == ["start", "complete"] + [f"analyze:{name}" for name in ANALYSIS_BACKENDS]
+        assert phases["start"]["items"] == 400
+        assert 250 < phases["complete"]["items"] < 390
+        assert all(phase["items_per_second"] > 0 and phase["peak_memory_bytes"] > 0 for phase in phases.values())
+        assert phases["start"]["p50_latency_ms"] <= phases["start"]["p99_latency_ms"]
+
+
+def simulate_monitor(seed: int, completions: int, success_lift: float = 0.0) -> SequentialMonitor:
+    rng = random.Random(seed)
+    aggregates, monitor = SessionAggregates(), SequentialMonitor()
+    for _ in range(completions):
+        group = rng.choice(["control", "treatment"])
+        treatment = group == "treatment"
+        aggregates.add({
+            "group": group,
+            "completion_time_minutes": rng.lognormvariate(0, 0.5) * 30,
+            "success_achieved": rng.random() < 0.6 + success_lift * treatment,
+        })
+        monitor.update(aggregates.accumulator("control"), aggregates.accumulator("treatment"))
+    return monitor
+
+
+def test_sequential_test_stops_for_effect_or_futility():
+    """효과가 있으면 유의로, 없으면 충분히 쌓인 뒤 무익으로 조기 종료를 권고해야 함"""
+    effect = simulate_monitor(1, 3000, success_lift=0.15)
+    recommendation = effect.recommendation()
+    assert recommendation["stop"] and recommendation["reason"] == "significant"
+    assert recommendation["metrics"] == ["success_rate"]
+    assert recommendation["at_completion"] < 1500
+    success = effect.result()["tests"]["success_rate"]
+    assert success["p_value"] <= success["alpha"] and success["ci_low"] > 0
+
+    null = simulate_monitor(0, 5000)
+    assert null.recommendation()["reason"] == "futility"
+    for test in null.result()["tests"].values():
+        assert test["significant_at"] is None and test["p_value"] > test["alpha"]
+
+
+def test_sequential_state_follows_completions(tmp_path):
+    """완료할 때마다 권고가 갱신되고, 스냅샷에서 다시 만들어도 같은 결론이어야 함"""
+    test_file = str(tmp_path / "ab_test_results.json")
+    framework = ABTestFramework(test_file)
+    rng = random.Random(2)
+    started = framework.start_many([
+        {"user_id": f"user{i:04d}", "task_description": f"task {i}", "task_type": "tactical",
+         "start_time": f"2025-01-01T{i // 60 % 24:02d}:{i % 60:02d}:00"}
+        for i in range(400)
+    ])["sessions"]
+
+    recommendation = None
+    for session in started:
+        treatment = session["group"] == "treatment"
+        recommendation = framework.complete_test_session(
+            session["session_id"], rng.gauss(20 if treatment else 30, 5), rng.random() < 0.5
+        )
+        if recommendation["stop"]:
+            break
+    assert recommendation["reason"] == "significant"
+    assert "completion_time" in recommendation["metrics"]
+    assert framework.analyze_results()["sequential"]["recommendation"] == recommendation
+
+    framework.store.compact()
+    reloaded = ABTestFramework(test_file).analyze_results()["sequential"]
+    assert reloaded["recommendation"]["reason"] == "significant"
+    assert reloaded["completions"] == recommendation["at_completion"]
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def test_buffered_writer_flushes_on_size_time_and_exit(tmp_path):
+    """buffered 모드는 바로 기록하지 않지만 자기 세션은 보이고, 개수/시간/종료 시 기록해야 함"""
+    test_file = tmp_path / "ab_test_results.json"
+    events_file = tmp_path / "ab_test_results.events.ndjson"
+    event_lines = lambda: len(events_file.read_text(encoding="utf-8").splitlines()) if events_file.exists() else 0
+
+    framework = ABTestFramework(str(test_file), durability="buffered")
+    framework.store.flush_events, framework.store.flush_interval = 50, 60.0
+    started = [framework.start_test_session(f"user{i:04d}", f"task {i}", "tactical") for i in range(49)]
+    assert event_lines() == 0
+    assert framework.complete_test_session(started[0]["session_id"], 5.0, True) is not None
+    assert framework.store.aggregates().accumulator(started[0]["group"]).completed == 1
+    # 50번째 이벤트에서 백그라운드 기록
+    assert wait_for(lambda: event_lines() == 50)
+    assert framework.verify_aggregates()["ok"]
+
+    framework.store.flush_interval = 0.05
+    framework.start_test_session("late_user", "task", "tactical")
+    assert wait_for(lambda: event_lines() == 51)
+    framework.store.close()
+
+    script = f"""
+import sys
+sys.path.insert(0, {str(Path(__file__).parent.parent)!r})
+from scripts.ab_test_framework import ABTestFramework
+framework = ABTestFramework({str(test_file)!r}, durability="buffered")
+framework.store.flush_interval = 60.0
+framework.start_test_session("exit_user", "task", "tactical")
+"""
+    subprocess.run([sys.executable, "-c", script], check=True)
+    assert event_lines() == 52
+    sessions = ABTestFramework(str(test_file), durability="sync")._load_sessions()
+    assert len(sessions) == 51 and sessions[started[0]["session_id"]]["completion_time_minutes"] == 5.0
+
+
+def test_buffered_flush_writes_outside_the_state_lock(tmp_path, monkeypatch):
+    """기록(압축 포함)이 디스크에서 멈춰 있어도 다른 스레드의 append/조회는 기다리지 않아야 함"""
+    import threading
+    store = SessionStore(str(tmp_path / "ab.json"), durability="buffered", flush_interval=60.0)
+    store.append([start_event({"session_id": "s1", "group": "control", "completion_time_minutes": None})])
+    writing, release = threading.Event(), threading.Event()
+    original_write = store._write_events
+    monkeypatch.setattr(store, "_write_events", lambda events: (writing.set(), release.wait(5), original_write(events)))
+
+    flusher = threading.Thread(target=store.flush)
+    flusher.start()
+    assert writing.wait(5)
+    appender = threading.Thread(target=lambda: store.append(
+        [start_event({"session_id": "s2", "group": "treatment", "completion_time_minutes": None})]
+    ))
+    appender.start()
+    appender.join(1)
+    assert not appender.is_alive()
+    assert set(store.sessions(force=True)) == {"s1", "s2"}
+    release.set()
+    flusher.join(5)
+    store.close()
+    assert set(SessionStore(str(tmp_path / "ab.json")).sessions()) == {"s1", "s2"}
+
+
+
+def test_buffered_completion_sees_sessions_started_elsewhere(tmp_path):
+    """buffered 인스턴스가 방금 읽은 뒤 다른 인스턴스가 시작한 세션도 완료할 수 있어야 함"""
+    test_file = str(tmp_path / "ab.json")
+    hook = ABTestFramework(test_file, durability="buffered")
+    assert hook._load_sessions() == {}
+    session_id = ABTestFramework(test_file, durability="sync").start_test_session(
+        "7", "task", "tactical")["session_id"]
+
+    assert "stop" in hook.complete_test_session(session_id, 3.0, True)
+    with pytest.raises(ValueError, match="unknown session_id"):
+        hook.complete_test_session("missing", 3.0, True)
+    hook.store.close()
+    assert ABTestFramework(test_file, durability="sync")._load_sessions()[session_id]["completion_time_minutes"] == 3.0
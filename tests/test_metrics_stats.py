@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for metrics_stats.py
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+import scripts.metrics_stats as metrics_stats
+from scripts.metrics_stats import (
+    GroupAccumulator,
+    bootstrap_mean_difference,
+    group_accumulators,
+    group_stats,
+    mean_variance,
+    t_critical,
+    t_two_sided_p,
+    two_proportion_z_test,
+    welch_t_test,
+)
+
+# Bootstrap over both metrics of 200k sessions per group must fit in this (seconds)
+# when completion times are recorded at minute resolution (exact multinomial path)
+BOOTSTRAP_BUDGET = 1.0
+
+
+def test_t_distribution_matches_tables():
+    """t 분포 p-value/임계값이 t 분포표 값과 일치해야 함"""
+    assert t_two_sided_p(12.706, 1) == pytest.approx(0.05, abs=1e-4)
+    assert t_two_sided_p(2.228, 10) == pytest.approx(0.05, abs=1e-4)
+    assert t_two_sided_p(0.0, 5) == 1.0
+    assert t_critical(10) == pytest.approx(2.2281, abs=1e-4)
+    assert t_critical(1e7) == pytest.approx(1.95996, abs=1e-4)
+
+
+def test_welch_and_z_tests():
+    """Welch t-검정과 두 비율 z-검정 결과가 손 계산과 같아야 함"""
+    # 평균 20/22, 분산 4/9, n=10/10 -> t = 2/sqrt(1.3), df = 1.69/(0.16/9 + 0.81/9)
+    result = welch_t_test([18, 18, 18, 18, 18, 22, 22, 22, 22, 22],
+                          [19, 19, 19, 19, 19, 25, 25, 25, 25, 25])
+    variance1, variance2 = 40 / 9, 90 / 9
+    se = ((variance1 + variance2) / 10) ** 0.5
+    assert result["difference"] == 2.0
+    assert result["statistic"] == pytest.approx(2 / se)
+    assert result["df"] == pytest.approx(se ** 4 / ((variance1 / 10) ** 2 / 9 + (variance2 / 10) ** 2 / 9))
+    assert result["ci_low"] < 2.0 < result["ci_high"]
+    assert 0.1 < result["p_value"] < 0.2
+
+    z_test = two_proportion_z_test(50, 100, 65, 100)
+    assert z_test["statistic"] == pytest.approx(0.15 / (0.575 * 0.425 * 0.02) ** 0.5)
+    assert z_test["p_value"] == pytest.approx(0.0314, abs=1e-3)
+    assert "error" in welch_t_test([1.0], [2.0, 3.0])
+
+
+def test_bootstrap_is_vectorized_and_fast():
+    """대규모 세션의 부트스트랩 신뢰구간이 정규근사와 가깝고 1초 안에 끝나야 함"""
+    pytest.importorskip("numpy")
+    rng = random.Random(5)
+    control_times = [round(rng.gauss(30, 10)) for _ in range(200000)]
+    treatment_times = [round(rng.gauss(29, 10)) for _ in range(200000)]
+    control_success = [1.0 if rng.random() < 0.60 else 0.0 for _ in range(200000)]
+    treatment_success = [1.0 if rng.random() < 0.62 else 0.0 for _ in range(200000)]
+
+    start = time.perf_counter()
+    times = bootstrap_mean_difference(control_times, treatment_times, seed=1)
+    success = bootstrap_mean_difference(control_success, treatment_success, seed=1)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < BOOTSTRAP_BUDGET
+    welch = welch_t_test(control_times, treatment_times)
+    assert times["ci_low"] == pytest.approx(welch["ci_low"], abs=0.01)
+    assert times["ci_high"] == pytest.approx(welch["ci_high"], abs=0.01)
+    z_test = two_proportion_z_test(int(sum(control_success)), 200000, int(sum(treatment_success)), 200000)
+    assert success["ci_low"] == pytest.approx(z_test["ci_low"], abs=0.001)
+    assert success["ci_low"] > 0
+
+
+def test_bootstrap_continuous_skewed_matches_welch_width():
+    """값 종류가 많은 치우친 분포에서도 원본을 그대로 리샘플해 구간이 좁아지지 않아야 함"""
+    pytest.importorskip("numpy")
+    rng = random.Random(0)
+    control = [rng.lognormvariate(0, 2) for _ in range(5000)]
+    treatment = [rng.lognormvariate(0, 2) for _ in range(5000)]
+
+    bootstrap = bootstrap_mean_difference(control, treatment, seed=1)
+    welch = welch_t_test(control, treatment)
+    ratio = (bootstrap["ci_high"] - bootstrap["ci_low"]) / (welch["ci_high"] - welch["ci_low"])
+    assert 0.93 < ratio < 1.07
+
+
+def test_bootstrap_stdlib_fallback(monkeypatch):
+    """NumPy 가 없으면 표준 라이브러리 리샘플로 같은 형태의 결과를 내야 함"""
+    monkeypatch.setattr(metrics_stats, "_numpy", lambda: None)
+    result = bootstrap_mean_difference([1.0, 2.0, 3.0, 4.0] * 10, [3.0, 4.0, 5.0, 6.0] * 10, seed=2)
+
+    assert result["difference"] == 2.0
+    assert result["iterations"] == metrics_stats.STDLIB_BOOTSTRAP_ITERATIONS
+    assert result["ci_low"] < 2.0 < result["ci_high"]
+
+
+def test_group_stats_single_pass_matches_naive():
+    """그룹 통계는 세션을 한 번만 순회하고, 나눠 계산해 합쳐도 같은 값이어야 함"""
+    rng = random.Random(3)
+    sessions = [
+        {
+            "group": rng.choice(["control", "treatment"]),
+            "completion_time_minutes": rng.gauss(1e6, 5) if rng.random() < 0.8 else None,
+            "success_achieved": rng.random() < 0.6,
+            "consistency_maintained": rng.random() < 0.9,
+            "duplicate_work_detected": rng.random() < 0.1,
+        }
+        for _ in range(5000)
+    ]
+    # 제너레이터는 한 번만 순회할 수 있음
+    groups = group_accumulators(session for session in sessions)
+
+    control = [s for s in sessions if s["group"] == "control"]
+    completed = [s["completion_time_minutes"] for s in control if s["completion_time_minutes"] is not None]
+    n, mean, variance = mean_variance(completed)
+    stats = groups["control"].stats()
+    assert stats["total_sessions"] == len(control)
+    assert stats["completed_sessions"] == n
+    assert stats["avg_completion_time"] == pytest.approx(mean, rel=1e-12)
+    assert stats["std_completion_time"] == pytest.approx(variance ** 0.5, rel=1e-9)
+    successes = sum(1 for s in control if s["completion_time_minutes"] is not None and s["success_achieved"])
+    assert stats["success_rate"] == pytest.approx(successes / n * 100)
+    assert group_stats(control) == stats
+
+    merged = GroupAccumulator()
+    merged.merge(groups["control"])
+    merged.merge(groups["treatment"])
+    combined = group_stats(sessions)
+    for field, value in merged.stats().items():
+        assert value == pytest.approx(combined[field], rel=1e-9)
+    assert group_stats([{"completion_time_minutes": None}]) == {"error": "No completed sessions"}
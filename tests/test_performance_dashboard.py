@@ -0,0 +1,549 @@
+#!/usr/bin/env python3
+"""
+Tests for performance_dashboard.py
+"""
+
+import bisect
+import json
+import random
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from scripts.metrics_log import MetricsLog
+from scripts.performance_dashboard import PerformanceDashboard, RollingQuantiles
+
+
+REPO_ROOT = Path(__file__).parent.parent
+
+# Cold import + summary report must stay well under this (seconds)
+STARTUP_BUDGET = 1.0
+
+
+def make_metric(index: int, success: bool = True, response_time_ms: int = 100, **overrides) -> dict:
+    metric = {
+        "timestamp": f"2025-08-20T10:{index // 60:02d}:{index % 60:02d}",
+        "session_id": f"session_{index}",
+        "task_type": "tactical",
+        "token_count_before": 1000,
+        "token_count_after": 700,
+        "response_time_ms": response_time_ms,
+        "first_attempt_success": success,
+        "context_miss_detected": False,
+        "duplicate_work_detected": False,
+        "consistency_violation": False,
+    }
+    metric.update(overrides)
+    return metric
+
+
+def write_metrics(path: Path, metrics: list):
+    path.write_text(json.dumps({m["session_id"]: m for m in metrics}), encoding="utf-8")
+
+
+def test_performance_analysis_values(tmp_path):
+    """성능 분석이 평균/성공률/트렌드를 정확히 계산하는지 검증"""
+    metrics = [make_metric(i, success=i >= 5, response_time_ms=100 + i) for i in range(10)]
+    metrics_file = tmp_path / "context_metrics.json"
+    write_metrics(metrics_file, metrics)
+    dashboard = PerformanceDashboard(str(metrics_file), str(tmp_path / "ab.json"))
+
+    analysis = dashboard._analyze_performance(dashboard._load_performance_data())
+
+    assert analysis["sample_size"] == 10
+    assert analysis["avg_token_improvement"] == 30.0
+    assert analysis["avg_response_time"] == 104.5
+    assert analysis["success_rate"] == 50.0
+    assert analysis["quality_issue_rate"] == 0.0
+    assert analysis["overall_score"] == 30.0 * 0.3 + 50.0 * 0.5 + 100 * 0.2
+    assert analysis["trend"] == "improving"
+
+
+def test_ab_analysis_reports_tests_not_confidence(tmp_path):
+    """A/B 분석은 검정별 p-value/신뢰구간과 Bonferroni 보정 p-value 를 보고해야 함"""
+    sessions = {}
+    for i in range(40):
+        group = "control" if i % 2 else "treatment"
+        sessions[f"s{i}"] = {
+            "group": group,
+            "completion_time_minutes": 10.0 + (i % 5),
+            "success_achieved": i % 4 != 1 if group == "treatment" else i % 4 == 1,
+        }
+    dashboard = PerformanceDashboard(str(tmp_path / "metrics.json"), str(tmp_path / "ab.json"))
+
+    significance = dashboard._analyze_ab_test(sessions)["significance"]
+
+    success, completion = significance["success_rate"], significance["completion_time"]
+    assert success["difference"] == pytest.approx(0.5)
+    assert success["ci_low"] < 0.5 < success["ci_high"]
+    assert significance["adjusted_p_value"] == pytest.approx(
+        min(1.0, 2 * min(success["p_value"], completion["p_value"]))
+    )
+    report = dashboard._format_significance(significance)
+    assert "p=" in report and "Bonferroni" in report
+
+
+def test_report_startup_does_not_import_heavy_libraries(tmp_path):
+    """리포트 생성 경로에서 numpy/pandas/matplotlib를 import 하지 않아야 함 (시작 시간 벤치마크)"""
+    metrics_file = tmp_path / "context_metrics.json"
+    write_metrics(metrics_file, [make_metric(i) for i in range(30)])
+    script = f"""
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {str(REPO_ROOT)!r})
+from scripts.performance_dashboard import PerformanceDashboard, RollingQuantiles
+PerformanceDashboard({str(metrics_file)!r}, {str(tmp_path / 'ab.json')!r}).generate_report({str(tmp_path / 'report.md')!r})
+elapsed = time.perf_counter() - start
+heavy = sorted(name for name in ("numpy", "pandas", "matplotlib") if name in sys.modules)
+print(json.dumps({{"elapsed": elapsed, "heavy": heavy}}))
+"""
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    measured = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert measured["heavy"] == []
+    assert measured["elapsed"] < STARTUP_BUDGET
+    assert "종합 점수" in (tmp_path / "report.md").read_text(encoding="utf-8")
+
+
+def test_metrics_log_tail_reads_only_recent_metrics(tmp_path, monkeypatch):
+    """NDJSON 로그의 tail 이 파일 끝 블록만 읽어 최근 메트릭을 반환해야 함"""
+    import scripts.metrics_log as metrics_log
+    monkeypatch.setattr(metrics_log, "TAIL_BLOCK_SIZE", 64)
+    log = MetricsLog(str(tmp_path / "context_metrics.ndjson"))
+    log.append_many(make_metric(i) for i in range(200))
+    # 작성자는 롤업을 갱신하지 않음 (조회할 때 따라잡음)
+    assert log.rollups.offset() == 0
+    log.append(make_metric(200, notes="한글 메모"))
+
+    recent = log.tail(3)
+
+    assert [m["session_id"] for m in recent] == ["session_198", "session_199", "session_200"]
+    assert recent[-1]["notes"] == "한글 메모"
+    assert len(list(log)) == 201
+    assert log.tail(500)[0]["session_id"] == "session_0"
+
+
+def test_dashboard_prefers_metrics_log_over_legacy_json(tmp_path):
+    """NDJSON 로그가 있으면 최근 20개만 분석하고, 없으면 기존 JSON을 읽어야 함"""
+    metrics_file = tmp_path / "context_metrics.json"
+    write_metrics(metrics_file, [make_metric(i, success=False) for i in range(5)])
+    dashboard = PerformanceDashboard(str(metrics_file), str(tmp_path / "ab.json"))
+    assert len(dashboard._load_performance_data()) == 5
+
+    dashboard.metrics_log.append_many(make_metric(i, success=i >= 30) for i in range(50))
+    recent = dashboard._load_performance_data()
+
+    assert [m["session_id"] for m in recent] == [f"session_{i}" for i in range(30, 50)]
+    assert dashboard._analyze_performance(recent)["success_rate"] == 100.0
+
+
+def test_vectorized_history_matches_stdlib_analysis(tmp_path):
+    """NumPy 벡터 분석 결과가 표준 라이브러리 분석과 같고 새 로그만 이어 읽어야 함"""
+    np = pytest.importorskip("numpy")
+    rng = random.Random(7)
+    metrics = [
+        make_metric(
+            i,
+            success=rng.random() < 0.6,
+            response_time_ms=rng.choice([None, 0, rng.randint(50, 500)]),
+            token_count_before=rng.choice([None, 0, 1000, 1500]),
+            context_miss_detected=rng.random() < 0.1,
+            duplicate_work_detected=rng.random() < 0.1,
+            consistency_violation=rng.random() < 0.05,
+        )
+        for i in range(3000)
+    ]
+    dashboard = PerformanceDashboard(str(tmp_path / "context_metrics.json"), str(tmp_path / "ab.json"))
+    dashboard.metrics_log.append_many(metrics[:2000])
+
+    assert dashboard.analyze_history()["sample_size"] == 2000
+    dashboard.metrics_log.append_many(metrics[2000:])
+    vectorized = dashboard.analyze_history()
+    expected = dashboard._analyze_performance(metrics, window=None)
+
+    assert vectorized["sample_size"] == 3000
+    assert vectorized.keys() == expected.keys()
+    for key, value in expected.items():
+        assert vectorized[key] == (pytest.approx(value) if isinstance(value, float) else value), key
+    assert dashboard.analyze_history(window=20) == pytest.approx(dashboard._analyze_performance(metrics))
+    assert isinstance(dashboard._history, np.ndarray)
+
+
+def test_rolling_quantiles_are_exact_within_window():
+    """롤링 분위수가 시간/개수 윈도우 안의 값으로 정확히 계산되어야 함"""
+    by_count = RollingQuantiles(max_count=100)
+    by_age = RollingQuantiles(max_age=50)
+    values = [random.Random(i).uniform(0, 1000) for i in range(500)]
+    for t, value in enumerate(values):
+        by_count.add(t, value)
+        by_age.add(t, value)
+
+    def linear_quantile(window, q):
+        ordered = sorted(window)
+        position = q * (len(ordered) - 1)
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+    assert len(by_count) == 100
+    assert by_count.quantile(0.95) == pytest.approx(linear_quantile(values[-100:], 0.95))
+    assert len(by_age) == 51  # t = 449..499
+    assert by_age.quantile(0.5) == pytest.approx(linear_quantile(values[449:], 0.5))
+    by_age.evict(1000)
+    assert by_age.quantile(0.99) is None
+
+
+def test_latency_distributions_and_ewma_in_report(tmp_path):
+    """1h/24h/7d 분포와 EWMA 가 계산되어 리포트에 표시되어야 함"""
+    now = datetime(2025, 9, 1, 12, 0, 0)
+    ages = {timedelta(minutes=10): 100, timedelta(minutes=50): 300, timedelta(hours=5): 900, timedelta(days=3): 5000,
+            timedelta(days=30): 99999}
+    dashboard = PerformanceDashboard(str(tmp_path / "context_metrics.json"), str(tmp_path / "ab.json"))
+    dashboard.metrics_log.append_many(
+        make_metric(i, response_time_ms=ms, timestamp=(now - age).isoformat())
+        for i, (age, ms) in enumerate(sorted(ages.items(), reverse=True))
+    )
+
+    latency = dashboard._latency_distributions(now)
+
+    assert latency["1h"] == {"count": 2, "p50": 200.0, "p95": 290.0, "p99": 298.0}
+    assert latency["24h"]["count"] == 3 and latency["24h"]["p50"] == 300
+    assert latency["7d"]["count"] == 4 and latency["7d"]["p99"] == pytest.approx(4877.0)
+
+    analysis = dashboard._analyze_performance(dashboard._load_performance_data())
+    # 응답 시간 순서: 99999, 5000, 900, 300, 100
+    expected = 99999
+    for ms in (5000, 900, 300, 100):
+        expected = 0.3 * ms + 0.7 * expected
+    assert analysis["ewma_response_time"] == pytest.approx(expected)
+
+    dashboard.generate_report(str(tmp_path / "report.md"))
+    report = (tmp_path / "report.md").read_text(encoding="utf-8")
+    assert "| 구간 | 샘플 | p50 | p95 | p99 |" in report
+    assert "EWMA 성공률" in report
+
+
+def test_time_based_window(tmp_path):
+    """window_seconds 설정 시 해당 시간 안의 메트릭만 분석해야 함"""
+    now = datetime.now()
+    dashboard = PerformanceDashboard(
+        str(tmp_path / "context_metrics.json"), str(tmp_path / "ab.json"), window=None, window_seconds=3600
+    )
+    dashboard.metrics_log.append_many(
+        make_metric(i, success=i >= 3, timestamp=(now - timedelta(hours=5 - i)).isoformat()) for i in range(6)
+    )
+
+    recent = dashboard._load_performance_data()
+
+    assert [m["session_id"] for m in recent] == ["session_5"]
+
+
+def test_sketches_merge_across_machines(tmp_path):
+    """머신별 일자 스케치를 병합한 분위수가 전체 원본 분위수와 근사해야 함"""
+    rng = random.Random(3)
+    all_times = []
+    sketch_files = []
+    for machine in ("laptop", "ci"):
+        directory = tmp_path / machine
+        directory.mkdir()
+        dashboard = PerformanceDashboard(str(directory / "context_metrics.json"), str(directory / "ab.json"))
+        for day in (1, 2):
+            times = [rng.lognormvariate(5, 1) for _ in range(5000)]
+            all_times.extend(times)
+            dashboard.metrics_log.append_many(
+                make_metric(i, response_time_ms=ms, timestamp=f"2025-09-0{day}T10:00:00")
+                for i, ms in enumerate(times)
+            )
+            # 증분 갱신: 이미 반영한 로그는 다시 읽지 않음
+            store = dashboard.update_sketches()
+            assert store.digest("response_time_ms").count == 5000 * day
+        assert sorted(store.days) == ["2025-09-01", "2025-09-02"]
+        sketch_files.append(str(dashboard.sketch_file))
+
+    from scripts.quantile_sketch import merge_sketch_files
+    merged = merge_sketch_files(sketch_files)
+    summary = merged.percentiles()
+    ordered = sorted(all_times)
+
+    assert summary["response_time_ms"]["count"] == 20000
+    for p in (50, 95, 99):
+        # 순위 오차: 추정값 이하 샘플 비율이 목표 분위수와 0.5%p 이내
+        rank = bisect.bisect(ordered, summary["response_time_ms"][f"p{p}"]) / len(ordered)
+        assert rank == pytest.approx(p / 100, abs=0.005), p
+    assert summary["token_improvement"]["p50"] == pytest.approx(30.0)
+    assert merged.digest("response_time_ms", ["2025-09-01"]).count == 10000
+
+
+def test_live_server_streams_incremental_updates(tmp_path):
+    """serve 모드가 로그 증가분만 읽어 집계하고 SSE 로 갱신을 보내야 함"""
+    import http.client
+    import threading
+    from scripts.dashboard_server import DashboardServer
+
+    dashboard = PerformanceDashboard(str(tmp_path / "context_metrics.json"), str(tmp_path / "ab.json"))
+    dashboard.metrics_log.append_many(make_metric(i, success=i % 2 == 0) for i in range(10))
+    (tmp_path / "ab.json").write_text(json.dumps({
+        "a": {"group": "control", "completion_time_minutes": 10, "success_achieved": True},
+        "b": {"group": "treatment", "completion_time_minutes": None},
+    }), encoding="utf-8")
+    server = DashboardServer(dashboard, port=0, poll_interval=0.05, heartbeat=0.2)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        connection = http.client.HTTPConnection(*server.server_address, timeout=5)
+        connection.request("GET", "/events")
+        stream = connection.getresponse()
+        assert stream.getheader("Content-Type") == "text/event-stream"
+
+        def next_event():
+            while True:
+                line = stream.readline().decode("utf-8")
+                if line.startswith("data: "):
+                    return json.loads(line[len("data: "):])
+
+        first = next_event()
+        assert first["performance"]["sample_size"] == 10
+        assert first["performance"]["success_rate"] == 50.0
+        assert first["ab_test"]["control"]["avg_completion_time"] == 10
+        assert first["ab_test"]["treatment"]["completed_sessions"] == 0
+        assert first["ab_test"]["control"] == {
+            "total_sessions": 1, **dashboard.ab_store.aggregates().stats("control")
+        }
+
+        dashboard.metrics_log.append_many(make_metric(i, success=True) for i in range(10, 20))
+        second = next_event()
+        expected = dashboard._analyze_performance(list(dashboard.metrics_log), window=None)
+        assert second["version"] > first["version"]
+        assert second["performance"]["sample_size"] == 20
+        for key in ("success_rate", "avg_response_time", "avg_token_improvement", "ewma_success_rate"):
+            assert second["performance"][key] == pytest.approx(expected[key]), key
+
+        summary = http.client.HTTPConnection(*server.server_address, timeout=5)
+        summary.request("GET", "/api/summary")
+        assert json.loads(summary.getresponse().read())["version"] == second["version"]
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_live_server_close_ends_streams_without_waiting_for_heartbeat(tmp_path):
+    """서버를 닫으면 열린 SSE 스트림이 heartbeat 를 기다리지 않고 바로 끝나야 함"""
+    import http.client
+    import threading
+    import time
+    from scripts.dashboard_server import DASHBOARD_HTML, DashboardServer
+
+    # 그룹 이름·작업 유형 같은 값이 HTML 로 해석되지 않도록 innerHTML 을 쓰지 않음
+    assert "innerHTML" not in DASHBOARD_HTML
+    dashboard = PerformanceDashboard(str(tmp_path / "context_metrics.json"), str(tmp_path / "ab.json"))
+    dashboard.metrics_log.append(make_metric(0))
+    server = DashboardServer(dashboard, port=0, poll_interval=0.05, heartbeat=30)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    connection.request("GET", "/events")
+    stream = connection.getresponse()
+    assert stream.readline().startswith(b"data: ")
+
+    started = time.monotonic()
+    server.shutdown()
+    server.server_close()
+    while stream.readline():
+        pass
+    assert time.monotonic() - started < 2
+    connection.close()
+
+
+def test_live_server_keeps_polling_after_an_error(tmp_path, capsys):
+    """집계 갱신이 한 번 실패해도 오류를 남기고 다음 갱신을 계속 보내야 함"""
+    import http.client
+    import threading
+    import time
+    from scripts.dashboard_server import DashboardServer
+
+    dashboard = PerformanceDashboard(str(tmp_path / "context_metrics.json"), str(tmp_path / "ab.json"))
+    dashboard.metrics_log.append(make_metric(0))
+    server = DashboardServer(dashboard, port=0, poll_interval=0.05, heartbeat=0.2)
+    poll, failed = server.state.poll, threading.Event()
+
+    def flaky_poll():
+        if not failed.is_set():
+            failed.set()
+            raise OSError("transient read error")
+        return poll()
+
+    server.state.poll = flaky_poll
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        connection = http.client.HTTPConnection(*server.server_address, timeout=5)
+        connection.request("GET", "/events")
+        stream = connection.getresponse()
+        assert stream.readline().startswith(b"data: ")
+        assert failed.wait(5)
+        dashboard.metrics_log.append(make_metric(1))
+        deadline = time.monotonic() + 5
+        sizes = []
+        while 2 not in sizes and time.monotonic() < deadline:
+            line = stream.readline().decode("utf-8")
+            if line.startswith("data: "):
+                sizes.append(json.loads(line[len("data: "):])["performance"]["sample_size"])
+        assert 2 in sizes
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert "transient read error" in capsys.readouterr().err
+
+
+def test_change_points_detected_within_few_sessions(tmp_path):
+    """토큰 효율이 떨어지면 CUSUM 이 변화 시점을 몇 세션 안에 보고해야 함"""
+    rng = random.Random(11)
+    dashboard = PerformanceDashboard(str(tmp_path / "context_metrics.json"), str(tmp_path / "ab.json"))
+    dashboard.metrics_log.append_many(
+        make_metric(i, token_count_after=round(1000 - 10 * rng.gauss(30, 3))) for i in range(100)
+    )
+    assert dashboard.detect_changes() == []
+
+    dashboard.metrics_log.append_many(
+        make_metric(i, token_count_after=round(1000 - 10 * rng.gauss(20, 3))) for i in range(100, 130)
+    )
+    changes = dashboard.detect_changes()
+
+    assert len(changes) == 1
+    change = changes[0]
+    assert change["metric"] == "token_improvement" and change["direction"] == "decrease"
+    assert 100 <= change["index"] <= change["detected_index"] <= 105
+    assert change["timestamp"] == make_metric(change["index"])["timestamp"]
+    assert change["before_mean"] == pytest.approx(30, abs=1.5)
+
+    dashboard.generate_report(str(tmp_path / "report.md"))
+    assert "토큰 효율성 하락" in (tmp_path / "report.md").read_text(encoding="utf-8")
+
+
+def test_single_failure_after_all_success_warmup_is_not_a_change(tmp_path):
+    """기준 구간이 모두 성공이어도 실패 한 번은 변화가 아니고, 지속된 하락은 탐지해야 함"""
+    rng = random.Random(4)
+    dashboard = PerformanceDashboard(str(tmp_path / "context_metrics.json"), str(tmp_path / "ab.json"))
+    dashboard.metrics_log.append_many(make_metric(i) for i in range(30))
+    dashboard.metrics_log.append_many([make_metric(30, success=False)] + [make_metric(i) for i in range(31, 60)])
+    assert dashboard.detect_changes() == []
+
+    dashboard.metrics_log.append_many(make_metric(i, success=rng.random() < 0.5) for i in range(60, 120))
+    changes = dashboard.detect_changes()
+
+    assert [(c["metric"], c["direction"]) for c in changes] == [("first_attempt_success", "decrease")]
+    assert 60 <= changes[0]["index"] <= changes[0]["detected_index"] <= 80
+    assert changes[0]["before_mean"] == 1.0
+
+
+def test_rollups_answer_long_horizons(tmp_path):
+    """롤업 요약이 원본 통계와 같고, 롤업에 없는 로그 끝부분만 원본으로 더해야 함"""
+    rng = random.Random(9)
+    start = datetime(2025, 9, 1, 0, 0, 0)
+    metrics = [
+        make_metric(
+            i,
+            success=rng.random() < 0.7,
+            response_time_ms=rng.randint(50, 500),
+            timestamp=(start + timedelta(minutes=37 * i)).isoformat(),
+        )
+        for i in range(300)
+    ]
+    dashboard = PerformanceDashboard(str(tmp_path / "context_metrics.json"), str(tmp_path / "ab.json"))
+    for batch in range(0, 250, 50):
+        dashboard.metrics_log.append_many(metrics[batch:batch + 50])
+    # 기록만으로는 롤업 파일을 만들지 않음
+    assert not dashboard.rollups.rollup_dir.exists()
+    dashboard.summarize_period(start, start + timedelta(hours=1))
+    MetricsLog(str(dashboard.metrics_log.log_file), rollups=False).append_many(metrics[250:])
+
+    assert dashboard.rollups.offset() < dashboard.metrics_log.log_file.stat().st_size
+    end = start + timedelta(days=30)
+    summary = dashboard.summarize_period(start, end)
+    # 조회하면서 로그 끝까지 따라잡음
+    assert dashboard.rollups.offset() == dashboard.metrics_log.log_file.stat().st_size
+    expected = dashboard._analyze_performance(metrics, window=None)
+    times = [m["response_time_ms"] for m in metrics]
+
+    assert summary["sample_size"] == 300
+    assert summary["success_rate"] == pytest.approx(expected["success_rate"])
+    assert summary["token_improvement"]["mean"] == pytest.approx(30.0)
+    assert summary["response_time_ms"]["mean"] == pytest.approx(expected["avg_response_time"])
+    mean = sum(times) / len(times)
+    assert summary["response_time_ms"]["std"] == pytest.approx(
+        (sum((t - mean) ** 2 for t in times) / (len(times) - 1)) ** 0.5
+    )
+
+    # 일부 날짜/시간 구간은 시간 버킷으로 계산
+    window_start, window_end = start + timedelta(hours=30), start + timedelta(days=3, hours=5)
+    partial = dashboard.summarize_period(window_start, window_end)
+    in_window = [m for m in metrics if window_start <= datetime.fromisoformat(m["timestamp"]) < window_end]
+    assert partial["sample_size"] == len(in_window)
+    assert sorted(p.name for p in dashboard.rollups.rollup_dir.glob("*.json"))[:2] == ["2025-09-01.json", "2025-09-02.json"]
+
+
+def test_rollup_period_counts_partial_hours_exactly(tmp_path):
+    """정시가 아닌 시작/끝 조각은 원본으로 세고, 숫자/시간대 timestamp 에도 실패하지 않아야 함"""
+    start = datetime(2025, 9, 1, 0, 0, 0)
+    metrics = [
+        make_metric(i, success=i % 3 == 0, timestamp=(start + timedelta(minutes=7 * i)).isoformat())
+        for i in range(1000)
+    ]
+    dashboard = PerformanceDashboard(str(tmp_path / "context_metrics.json"), str(tmp_path / "ab.json"))
+    dashboard.metrics_log.append_many(metrics[:800])
+    dashboard.metrics_log.append_many([
+        make_metric(2000, timestamp=1756684800),
+        make_metric(2001, timestamp=(start + timedelta(days=9)).isoformat() + "+00:00"),
+    ])
+    MetricsLog(str(dashboard.metrics_log.log_file), rollups=False).append_many(metrics[800:])
+
+    for window_start, window_end in (
+        (start + timedelta(hours=5, minutes=17), start + timedelta(days=3, hours=2, minutes=41)),
+        (start + timedelta(hours=2, minutes=10), start + timedelta(hours=2, minutes=50)),
+        (start + timedelta(days=4, minutes=59), start + timedelta(days=4, hours=20, minutes=1)),
+    ):
+        in_window = [m for m in metrics if window_start <= datetime.fromisoformat(m["timestamp"]) < window_end]
+        summary = dashboard.summarize_period(window_start, window_end)
+        assert summary["sample_size"] == len(in_window)
+        assert summary["success_rate"] == pytest.approx(
+            sum(m["first_attempt_success"] for m in in_window) / len(in_window) * 100
+        )
+
+    recent = [m["session_id"] for m in dashboard.metrics_log.since(start + timedelta(days=3))]
+    assert recent[0] == "session_618" and "session_2001" in recent and "session_2000" not in recent
+    assert dashboard.metrics_log.between(start, start + timedelta(minutes=20)) == metrics[:3]
+
+
+def test_charts_render_once_per_input(tmp_path, monkeypatch):
+    """차트는 입력 데이터가 바뀔 때만 다시 그리고, matplotlib 이 없으면 건너뛰어야 함"""
+    pytest.importorskip("matplotlib")
+    import scripts.dashboard_charts as dashboard_charts
+    dashboard = PerformanceDashboard(str(tmp_path / "context_metrics.json"), str(tmp_path / "ab.json"))
+    dashboard.metrics_log.append_many(make_metric(i, response_time_ms=100 + i) for i in range(30))
+    (tmp_path / "ab.json").write_text(json.dumps({
+        f"s{i}": {"group": "control" if i % 2 else "treatment", "completion_time_minutes": 10 + i,
+                  "success_achieved": i % 3 == 0}
+        for i in range(20)
+    }), encoding="utf-8")
+    report_file = tmp_path / "report.md"
+
+    first = dashboard.generate_report(str(report_file), charts=True)["charts"]
+    assert first["rendered"] == ["ab_comparison", "distribution", "trend"]
+    for name in first["rendered"]:
+        assert (tmp_path / "charts" / f"{name}.png").read_bytes().startswith(b"\x89PNG")
+        assert b"<svg" in (tmp_path / "charts" / f"{name}.svg").read_bytes()
+    assert "![trend](charts/trend.svg)" in report_file.read_text(encoding="utf-8")
+
+    assert dashboard.generate_report(str(report_file), charts=True)["charts"]["rendered"] == []
+    dashboard.metrics_log.append(make_metric(30, response_time_ms=900))
+    third = dashboard.generate_report(str(report_file), charts=True)["charts"]
+    assert third["rendered"] == ["distribution", "trend"]
+    assert third["unchanged"] == ["ab_comparison"]
+
+    monkeypatch.setattr(dashboard_charts, "matplotlib_available", lambda: False)
+    skipped = dashboard.generate_report(str(report_file), charts=True)["charts"]
+    assert skipped["rendered"] == [] and skipped["skipped"] == ["ab_comparison", "distribution", "trend"]
+    assert "## 📉 차트" not in report_file.read_text(encoding="utf-8")
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Tests for prd_decomposer.py
+"""
+
+import mmap
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import scripts.prd_decomposer as prd_decomposer
+from scripts.prd_decomposer import InotifyWatcher, PollingWatcher, PRDDecomposer, PRDDocument
+from scripts.spec_search import tokenize
+
+
+SAMPLE_PRD = """# PRD: Sample (v42.0)
+
+## 1. Overview
+Intro text
+
+## 2. Requirements
+### Functional
+- FR-1: Track every change
+
+## 3. Success Metrics
+- Response under 100ms
+
+## 4. Implementation
+### Phase 1
+- Build `tracker.py`
+
+## 5. Timeline
+- Week 1
+"""
+
+
+def write_prd(specs_dir: Path, name: str, content: str = SAMPLE_PRD) -> Path:
+    specs_dir.mkdir(parents=True, exist_ok=True)
+    path = specs_dir / name
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def test_heading_index_section_extraction():
+    """헤딩 인덱스가 시작/끝 마커 사이 내용을 정확히 추출하는지 검증"""
+    document = PRDDocument.from_text(SAMPLE_PRD)
+
+    assert document.extract("Requirements", "Implementation") == (
+        "### Functional\n- FR-1: Track every change\n\n## 3. Success Metrics\n- Response under 100ms"
+    )
+    assert document.extract("Success Metrics", "Timeline") == (
+        "- Response under 100ms\n\n## 4. Implementation\n### Phase 1\n- Build `tracker.py`"
+    )
+    assert document.extract("Technical Design", "Implementation") is None
+    # No end marker: section runs to end of document
+    assert document.extract("Timeline", "Appendix") == "- Week 1"
+
+
+def test_heading_tree_outline_and_parents():
+    """헤딩 트리가 레벨과 부모 관계를 유지하는지 검증"""
+    document = PRDDocument.from_text(SAMPLE_PRD)
+
+    assert document.outline()[:3] == [(2, "1. Overview"), (2, "2. Requirements"), (3, "Functional")]
+    functional = document.headings[2]
+    assert document.headings[functional.parent].title == b"## 2. requirements"
+
+
+def test_large_prd_is_memory_mapped(tmp_path, monkeypatch):
+    """임계값 이상의 PRD는 mmap으로 읽히고 결과는 동일해야 함"""
+    prd_file = write_prd(tmp_path, "PRD-v42-sample.md")
+    monkeypatch.setattr(prd_decomposer, "MMAP_THRESHOLD", 1)
+
+    decomposer = PRDDecomposer(str(tmp_path))
+    with PRDDocument.open(prd_file) as document:
+        assert isinstance(document.data, mmap.mmap)
+        mapped = decomposer._extract_section(document, "Requirements", "Implementation")
+        assert decomposer._extract_components(document) == decomposer._extract_components(SAMPLE_PRD)
+
+    assert mapped == decomposer._extract_section(SAMPLE_PRD, "Requirements", "Implementation")
+
+
+def test_rerun_on_unchanged_tree_is_noop(tmp_path):
+    """변경 없는 재실행은 출력 파일을 다시 쓰지 않아야 함"""
+    specs_dir = tmp_path / "docs" / "specs"
+    write_prd(specs_dir, "PRD-v42-sample.md")
+    write_prd(specs_dir, "PRD-v43-next.md", SAMPLE_PRD.replace("FR-1", "FR-2"))
+    decomposer = PRDDecomposer(str(tmp_path))
+
+    decomposer.decompose_all_prds()
+    requirements_file = specs_dir / "requirements.md"
+    first = requirements_file.read_text()
+    first_mtime = requirements_file.stat().st_mtime_ns
+
+    results = decomposer.decompose_all_prds()
+
+    assert results["PRD-v42-sample.md"] is True
+    assert requirements_file.read_text() == first
+    assert requirements_file.stat().st_mtime_ns == first_mtime
+    assert first.count("# Requirements Specification") == 2
+
+
+def test_changed_prd_replaces_only_its_section(tmp_path):
+    """변경된 PRD는 자신의 섹션만 교체하고 삭제된 PRD 섹션은 제거되어야 함"""
+    specs_dir = tmp_path / "docs" / "specs"
+    write_prd(specs_dir, "PRD-v42-sample.md")
+    changed = write_prd(specs_dir, "PRD-v43-next.md")
+    decomposer = PRDDecomposer(str(tmp_path))
+    decomposer.decompose_all_prds()
+
+    changed.write_text(SAMPLE_PRD.replace("FR-1: Track every change", "FR-9: Compact context"))
+    decomposer.decompose_all_prds()
+    requirements = (specs_dir / "requirements.md").read_text()
+
+    assert requirements.count("FR-9: Compact context") == 1
+    assert requirements.count("FR-1: Track every change") == 1
+    assert requirements.index("Extracted from v42") < requirements.index("Extracted from v43")
+
+    changed.unlink()
+    decomposer.decompose_all_prds()
+    requirements = (specs_dir / "requirements.md").read_text()
+
+    assert "FR-9" not in requirements
+    assert "Extracted from v43" not in requirements
+
+
+def test_parallel_run_matches_serial_output(tmp_path):
+    """--jobs 병렬 실행 결과가 직렬 실행과 바이트 단위로 동일해야 함"""
+    outputs = []
+    for mode, jobs in (("serial", 1), ("parallel", 3)):
+        specs_dir = tmp_path / mode / "docs" / "specs"
+        for minor in (10, 2, 9, 1):
+            write_prd(specs_dir, f"PRD-v42.{minor}-sample.md", SAMPLE_PRD.replace("FR-1", f"FR-{minor}"))
+        decomposer = PRDDecomposer(str(tmp_path / mode))
+        decomposer.generated_at = "2025-01-01 00:00:00"
+
+        results = decomposer.decompose_all_prds(jobs=jobs)
+
+        assert all(results[f"PRD-v42.{minor}-sample.md"] for minor in (10, 2, 9, 1))
+        outputs.append(((specs_dir / "requirements.md").read_bytes(), (specs_dir / "architecture.md").read_bytes()))
+
+    assert outputs[0] == outputs[1]
+    requirements = outputs[0][0].decode()
+    versions = [requirements.index(f"Extracted from v42.{minor})") for minor in (1, 2, 9, 10)]
+    assert versions == sorted(versions)
+
+
+def test_per_version_shards_and_index(tmp_path):
+    """버전별 샤드와 인덱스로 필요한 섹션만 읽을 수 있어야 함"""
+    specs_dir = tmp_path / "docs" / "specs"
+    write_prd(specs_dir, "PRD-v42-sample.md")
+    write_prd(specs_dir, "PRD-v43-next.md", SAMPLE_PRD.replace("FR-1", "FR-2"))
+    decomposer = PRDDecomposer(str(tmp_path))
+    decomposer.decompose_all_prds()
+
+    index = decomposer.load_index()
+    assert sorted(index) == ["v42-sample", "v43-next"]
+    assert index["v43-next"]["version"] == "v43"
+    assert index["v43-next"]["file"] == "versions/v43-next.md"
+    assert decomposer.find_shards("v43") == ["v43-next"]
+
+    requirements = decomposer.load_spec("v43-next", "requirements")
+    architecture = decomposer.load_spec("v43-next", "architecture")
+    assert requirements.startswith("# Requirements Specification (Extracted from v43)")
+    assert "FR-2" in requirements and "FR-1" not in requirements
+    assert architecture.startswith("# Architecture Specification (Extracted from v43)")
+    assert architecture.endswith("See full PRD for implementation details.*")
+
+    consolidated = (specs_dir / "requirements.md").read_text()
+    assert requirements in consolidated
+    assert decomposer.load_spec("v42-sample", "requirements") in consolidated
+
+
+def test_hangul_aware_tokenization():
+    """한글은 음절 바이그램으로, 영문은 소문자 단어로 토큰화되어야 함"""
+    assert list(tokenize("Context_Metrics 추적이")) == ["context", "metrics", "추적", "적이"]
+    assert list(tokenize("문서 v2")) == ["문서", "v2"]
+
+
+def test_search_ranks_and_updates_incrementally(tmp_path):
+    """검색 인덱스가 BM25 순위를 반환하고 PRD 변경 시 증분 갱신되어야 함"""
+    specs_dir = tmp_path / "docs" / "specs"
+    write_prd(specs_dir, "PRD-v42-sample.md", SAMPLE_PRD.replace(
+        "- FR-1: Track every change", "- FR-1: 변경 추적을 자동화\n- FR-2: Compact context after deploy"))
+    changed = write_prd(specs_dir, "PRD-v43-next.md")
+    decomposer = PRDDecomposer(str(tmp_path))
+    decomposer.decompose_all_prds()
+
+    results = decomposer.search("추적")
+    assert [(r["version"], r["section"], r["text"]) for r in results] == [
+        ("v42", "requirements", "- FR-1: 변경 추적을 자동화")
+    ]
+    top = decomposer.search("compact context")[0]
+    assert top["text"] == "- FR-2: Compact context after deploy"
+    assert decomposer.load_spec(top["shard"], top["section"]).count("Compact context") == 1
+
+    changed.write_text(SAMPLE_PRD.replace("FR-1: Track every change", "FR-7: 추적 대시보드"))
+    decomposer.decompose_all_prds()
+
+    fresh = PRDDecomposer(str(tmp_path))
+    assert [r["version"] for r in fresh.search("추적")] == ["v43", "v42"]
+    assert fresh.search("track") == []
+
+
+def _watch_until_updated(decomposer, watcher, prd_file, new_content, shard_key):
+    """watch 루프를 스레드로 실행하고 PRD를 수정한 뒤 샤드 갱신을 기다림"""
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=decomposer.watch,
+        kwargs={"debounce": 0.05, "poll_interval": 0.05, "stop": stop, "watcher": watcher},
+    )
+    thread.start()
+    try:
+        deadline = time.monotonic() + 5
+        while decomposer._index is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        prd_file.write_text(new_content)
+        while time.monotonic() < deadline:
+            if "FR-5" in decomposer.load_spec(shard_key):
+                return True
+            time.sleep(0.02)
+        return False
+    finally:
+        stop.set()
+        thread.join(timeout=5)
+
+
+def test_watch_mode_redecomposes_changed_prd_with_polling(tmp_path):
+    """폴링 감시자가 PRD 변경을 감지해 해당 샤드를 다시 생성해야 함"""
+    specs_dir = tmp_path / "docs" / "specs"
+    prd_file = write_prd(specs_dir, "PRD-v42-sample.md")
+    decomposer = PRDDecomposer(str(tmp_path))
+
+    updated = _watch_until_updated(
+        decomposer, PollingWatcher(specs_dir, interval=0.02), prd_file,
+        SAMPLE_PRD.replace("FR-1", "FR-5"), "v42-sample",
+    )
+
+    assert updated
+    assert "FR-5" in (specs_dir / "requirements.md").read_text()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_watch_mode_with_inotify(tmp_path):
+    """inotify 감시자는 PRD 파일 이벤트만 보고해야 함"""
+    specs_dir = tmp_path / "docs" / "specs"
+    prd_file = write_prd(specs_dir, "PRD-v42-sample.md")
+    watcher = InotifyWatcher(specs_dir)
+
+    (specs_dir / "requirements.md").write_text("generated output")
+    assert watcher.changes(0.05) == set()
+    prd_file.write_text(SAMPLE_PRD)
+    assert watcher.changes(1.0) == {"PRD-v42-sample.md"}
+
+    decomposer = PRDDecomposer(str(tmp_path))
+    assert _watch_until_updated(
+        decomposer, watcher, prd_file, SAMPLE_PRD.replace("FR-1", "FR-5"), "v42-sample",
+    )
+
+
+def test_traceability_links_requirements_and_tests(tmp_path):
+    """요구사항 ID/키워드로 테스트와 양방향 연결되고 미검증 요구사항이 보고되어야 함"""
+    specs_dir = tmp_path / "docs" / "specs"
+    write_prd(specs_dir, "PRD-v42-sample.md", SAMPLE_PRD.replace(
+        "- FR-1: Track every change", "- FR-1: Track every change\n- Export timeline report as markdown"))
+    tests_dir = tmp_path / "tests"
+    tests_dir.mkdir()
+    test_file = tests_dir / "test_tracking.py"
+    test_file.write_text(
+        'def test_fr_1_changes_are_recorded():\n'
+        '    """FR-1 coverage"""\n'
+        '\n'
+        'def test_unrelated():\n'
+        '    pass\n'
+    )
+    decomposer = PRDDecomposer(str(tmp_path))
+    decomposer.decompose_all_prds()
+
+    traceability = decomposer.refresh_traceability()
+    test_id = "tests/test_tracking.py::test_fr_1_changes_are_recorded"
+    assert traceability.tests_for("FR-1") == [test_id]
+    assert traceability.requirements_for("test_fr_1_changes_are_recorded") == ["v42-sample:FR-1"]
+    untested = traceability.untested()
+    assert [traceability.requirements[rid]["text"] for rid in untested] == [
+        "- Export timeline report as markdown",
+        "- Response under 100ms",  # inside the Requirements section
+        "- Response under 100ms",  # again as a non-functional requirement
+        "- Build `tracker.py`",
+    ]
+    assert "Export timeline report as markdown" in traceability.untested_report()
+
+    # A new test covering the export requirement by keywords is picked up incrementally
+    test_file.write_text(test_file.read_text() + '\ndef test_timeline_report_export():\n    """Export as markdown"""\n')
+    traceability = PRDDecomposer(str(tmp_path)).refresh_traceability()
+    assert traceability.requirements_for("test_timeline_report_export") == [untested[0]]
+    assert traceability.untested() == untested[1:]
+
+    # A removed test no longer resolves by its bare name
+    test_file.write_text(test_file.read_text().split("\ndef test_timeline_report_export")[0])
+    traceability = PRDDecomposer(str(tmp_path)).refresh_traceability()
+    assert traceability.requirements_for("test_timeline_report_export") == []
+    assert traceability.requirements_for("test_fr_1_changes_are_recorded") == ["v42-sample:FR-1"]